@@ -0,0 +1,87 @@
+"""
+Import-time budget for the entry points
+
+Imports each entry point in a fresh interpreter with -X importtime and
+checks how long its imports take and which heavy dependencies they pull
+in. pandas, BeautifulSoup and friends are only meant to load when an
+export, a parse or a snapshot needs them, so their showing up at start-up
+fails the check regardless of the machine's speed.
+
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --budget-scale 2    # slower kiosk hardware
+
+Exits with status 1 when an entry point is over budget or imports a
+deferred dependency.
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Entry point -> (import budget in ms, modules it must not import at start-up)
+BUDGETS = {
+    'fide_gui': (150, ('pandas', 'numpy', 'bs4', 'requests')),
+    'extract_from_file': (400, ('pandas', 'numpy', 'bs4')),
+    'fide_extractor': (400, ('pandas', 'numpy', 'bs4')),
+    'fide_api_extractor': (400, ('pandas', 'numpy', 'bs4')),
+}
+
+IMPORTTIME_LINE = re.compile(r'import time:\s+\d+ \|\s+(\d+) \| ( *)(\S+)')
+
+
+def measure(module):
+    """Cumulative import time of module in ms and the top-level packages it loaded"""
+    output = subprocess.run([sys.executable, '-X', 'importtime', '-c', f"import {module}"],
+                            cwd=ROOT_DIR, capture_output=True, text=True, check=True).stderr
+    total = None
+    loaded = set()
+    for line in output.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        cumulative, indent, name = match.groups()
+        loaded.add(name.split('.')[0])
+        if name == module and not indent:
+            total = int(cumulative) / 1000
+    return total, loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the start-up import time of the entry points")
+    parser.add_argument('--modules', default=','.join(BUDGETS),
+                        help=f"Comma-separated entry points (default: {','.join(BUDGETS)})")
+    parser.add_argument('--runs', type=int, default=5,
+                        help="Fresh interpreters per entry point; the fastest counts (default: 5)")
+    parser.add_argument('--budget-scale', type=float, default=1.0,
+                        help="Multiply every budget, e.g. 2 for slower machines (default: 1)")
+    args = parser.parse_args()
+
+    failures = []
+    print(f"{'entry point':<22}{'ms':>8}{'budget':>8}  deferred imports")
+    for module in args.modules.split(','):
+        budget, deferred = BUDGETS.get(module, (None, ()))
+        runs = [measure(module) for _ in range(args.runs)]
+        best = min(total for total, _ in runs)
+        loaded = sorted(set(deferred) & runs[0][1])
+
+        limit = budget * args.budget_scale if budget else None
+        print(f"{module:<22}{best:>8.1f}{limit or 0:>8.0f}  {', '.join(loaded) or '-'}")
+        if limit and best > limit:
+            failures.append(f"{module}: {best:.0f} ms, budget {limit:.0f} ms")
+        if loaded:
+            failures.append(f"{module}: imports {', '.join(loaded)} at start-up")
+
+    if failures:
+        print("\nOver budget:")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+    print("\nAll entry points within budget")
+
+
+if __name__ == "__main__":
+    main()
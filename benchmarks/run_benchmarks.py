@@ -0,0 +1,259 @@
+"""
+Offline extraction benchmarks
+
+Drives FIDEDataExtractor, FIDEAPIExtractor and the exporters against the
+local stub server (see stub_server.py) at several roster sizes and
+reports throughput, per-player latency percentiles and peak memory.
+Each scenario runs in its own process so its peak RSS is its own.
+
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --sizes 100,10000 --latency 20 --output bench.json
+    python benchmarks/run_benchmarks.py --baseline bench.json    # exit 1 on regressions
+
+Scenarios:
+    scrape        FIDEDataExtractor (profile pages; every 100th entry is a name)
+    api           FIDEAPIExtractor (fide-api JSON)
+    export-<fmt>  Streaming export of synthetic players (csv, jsonl, json, xlsx, parquet)
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+from stub_server import LAST_NAMES, FIRST_NAMES, StubServer, player_fields  # noqa: E402
+
+
+DEFAULT_SIZES = '100,10000,100000'
+DEFAULT_SCENARIOS = 'scrape,api,export-csv,export-jsonl,export-xlsx'
+
+
+def peak_rss_mb():
+    """Peak resident memory of this process in MB (None where unavailable)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def timed(function, samples):
+    """Wrap function so each call's duration is appended to samples"""
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            samples.append(time.perf_counter() - start)
+    return wrapper
+
+
+def roster(size):
+    """FIDE IDs 1..size, with every 100th entry given as a name instead"""
+    return [f"{LAST_NAMES[i % 8]}{i}, {FIRST_NAMES[i // 8 % 8]}" if i % 100 == 0 else str(i)
+            for i in range(1, size + 1)]
+
+
+def run_scrape(size, args, samples):
+    from fide_extractor import FIDEDataExtractor
+
+    extractor = FIDEDataExtractor(max_workers=args.workers, requests_per_second=0,
+                                  parser=args.parser, parse_workers=args.parse_workers)
+    extractor.BASE_URL = args.url
+    extractor.SEARCH_URL = f"{args.url}/profile"
+    # The per-player call: a full lookup, or just the download when parsing runs in processes
+    if args.parse_workers:
+        extractor._fetch_player = timed(extractor._fetch_player, samples)
+    else:
+        extractor.get_player_by_id = timed(extractor.get_player_by_id, samples)
+    return sum(1 for _, player in extractor.iter_multiple_players(roster(size)) if player)
+
+
+def run_api(size, args, samples):
+    from fide_api_extractor import FIDEAPIExtractor
+
+    extractor = FIDEAPIExtractor(api_url=args.url, requests_per_second=0)
+    extractor.get_player_by_id = timed(extractor.get_player_by_id, samples)
+    return len(extractor.extract_multiple_players([str(i) for i in range(1, size + 1)]))
+
+
+def run_export(size, args, samples, fmt):
+    from fide_export import open_writer
+    from fide_player import Player
+
+    players = (Player.from_dict({
+        'FIDE ID': fields['fide_id'],
+        'Name': fields['name'],
+        'Federation': fields['code'],
+        'Title': fields['title_code'],
+        'B-Year': fields['birth_year'],
+        'Rating std': fields['rating_std'],
+        'Rating rapid': fields['rating_rapid'],
+        'Rating blitz': fields['rating_blitz'],
+        'World Rank': fields['world_rank'],
+    }) for fields in map(player_fields, range(1, size + 1)))
+
+    with tempfile.TemporaryDirectory() as directory:
+        with open_writer(os.path.join(directory, f"players.{fmt}")) as writer:
+            write = timed(writer.write, samples)
+            for player in players:
+                write(player)
+        return writer.count
+
+
+def run_child(args):
+    """Run one scenario and write its measurements as JSON"""
+    # Imported before the clock starts
+    import fide_api_extractor, fide_export, fide_extractor  # noqa: F401
+    import numpy as np
+
+    samples = []
+    started = time.perf_counter()
+    try:
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            if args.scenario == 'scrape':
+                players = run_scrape(args.size, args, samples)
+            elif args.scenario == 'api':
+                players = run_api(args.size, args, samples)
+            else:
+                players = run_export(args.size, args, samples, args.scenario.split('-', 1)[1])
+    except ImportError as e:
+        # Optional dependency (e.g. pyarrow for parquet) not installed
+        with open(args.result_file, 'w') as f:
+            json.dump({'skipped': str(e)}, f)
+        return
+    elapsed = time.perf_counter() - started
+
+    latencies = np.array(samples) * 1000 if samples else np.zeros(1)
+    peak = peak_rss_mb()
+    result = {
+        'players': players,
+        'seconds': round(elapsed, 3),
+        'players_per_sec': round(players / elapsed, 1) if elapsed else None,
+        'p50_ms': round(float(np.percentile(latencies, 50)), 3),
+        'p99_ms': round(float(np.percentile(latencies, 99)), 3),
+        'peak_rss_mb': round(peak, 1) if peak else None,
+    }
+    with open(args.result_file, 'w') as f:
+        json.dump(result, f)
+
+
+def run_scenario(scenario, size, args, server):
+    """Run a scenario in a child process and return its results"""
+    with tempfile.NamedTemporaryFile(suffix='.json', delete=False) as f:
+        result_file = f.name
+    command = [sys.executable, os.path.abspath(__file__), '--child', scenario,
+               '--size', str(size), '--url', server.url, '--result-file', result_file,
+               '--workers', str(args.workers), '--parser', args.parser,
+               '--parse-workers', str(args.parse_workers)]
+    requests_before = server.requests
+    try:
+        completed = subprocess.run(command)
+        if completed.returncode:
+            return None
+        with open(result_file) as f:
+            result = json.load(f)
+    finally:
+        os.remove(result_file)
+    result['requests'] = server.requests - requests_before
+    return result
+
+
+def compare(results, baseline, tolerance):
+    """Regressions against a baseline report: slower, higher p99 or more memory"""
+    regressions = []
+    for key, result in results.items():
+        before = baseline.get(key)
+        if not before:
+            continue
+        if before['players_per_sec'] and result['players_per_sec'] < before['players_per_sec'] * (1 - tolerance):
+            regressions.append(f"{key}: {before['players_per_sec']} -> {result['players_per_sec']} players/s")
+        if before['p99_ms'] and result['p99_ms'] > before['p99_ms'] * (1 + tolerance):
+            regressions.append(f"{key}: p99 {before['p99_ms']} -> {result['p99_ms']} ms")
+        if before['peak_rss_mb'] and result['peak_rss_mb'] and \
+                result['peak_rss_mb'] > before['peak_rss_mb'] * (1 + tolerance):
+            regressions.append(f"{key}: peak RSS {before['peak_rss_mb']} -> {result['peak_rss_mb']} MB")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark extraction and export against a local FIDE stub")
+    parser.add_argument('--sizes', default=DEFAULT_SIZES,
+                        help=f"Comma-separated player counts (default: {DEFAULT_SIZES})")
+    parser.add_argument('--scenarios', default=DEFAULT_SCENARIOS,
+                        help=f"Comma-separated scenarios (default: {DEFAULT_SCENARIOS})")
+    parser.add_argument('--workers', type=int, default=8,
+                        help="FIDEDataExtractor worker threads (default: 8)")
+    parser.add_argument('--parser', default='bs4', help="Profile parser backend (default: bs4)")
+    parser.add_argument('--parse-workers', type=int, default=0,
+                        help="FIDEDataExtractor parse processes (default: 0)")
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help="Stub server delay per response in milliseconds (default: 0)")
+    parser.add_argument('--error-rate', type=float, default=0.0,
+                        help="Fraction of stub responses answered with 429/503 (default: 0)")
+    parser.add_argument('--output', help="Write the results as JSON")
+    parser.add_argument('--baseline', help="Earlier --output file to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help="Allowed relative regression against the baseline (default: 0.2)")
+    # Internal: run a single scenario in this process
+    parser.add_argument('--child', dest='scenario', help=argparse.SUPPRESS)
+    parser.add_argument('--size', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('--url', help=argparse.SUPPRESS)
+    parser.add_argument('--result-file', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.scenario:
+        run_child(args)
+        return
+
+    server = StubServer(latency=args.latency / 1000, error_rate=args.error_rate).start()
+    sizes = [int(size) for size in args.sizes.split(',')]
+    scenarios = args.scenarios.split(',')
+
+    print(f"{'scenario':<14}{'players':>9}{'seconds':>10}{'players/s':>11}"
+          f"{'p50 ms':>9}{'p99 ms':>9}{'peak MB':>9}{'requests':>10}")
+    results = {}
+    for scenario in scenarios:
+        for size in sizes:
+            result = run_scenario(scenario, size, args, server)
+            if result is None:
+                print(f"{scenario:<14}{size:>9}  failed")
+                continue
+            if 'skipped' in result:
+                print(f"{scenario:<14}{size:>9}  skipped: {result['skipped']}")
+                continue
+            results[f"{scenario}/{size}"] = result
+            print(f"{scenario:<14}{result['players']:>9}{result['seconds']:>10.2f}"
+                  f"{result['players_per_sec']:>11.1f}{result['p50_ms']:>9.2f}{result['p99_ms']:>9.2f}"
+                  f"{result['peak_rss_mb'] or 0:>9.1f}{result['requests']:>10}", flush=True)
+
+    server.shutdown()
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print("\nRegressions:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print("\nNo regressions against the baseline")
+
+
+if __name__ == "__main__":
+    main()
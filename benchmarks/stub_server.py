@@ -0,0 +1,194 @@
+"""
+Local stand-in for ratings.fide.com and the fide-api
+
+Serves the response templates in fixtures/ for any FIDE ID, with
+deterministic player data derived from the ID, an optional delay per
+response and optional injected 429/503 errors, so extraction can be
+measured without touching the real sites.
+
+    python benchmarks/stub_server.py --port 8765 --latency 20 --error-rate 0.01
+
+Endpoints:
+    /profile/<id>           profile page (ratings.fide.com)
+    /search.php?search=...  search results (ratings.fide.com)
+    /player/<id>            player JSON (fide-api)
+    /top?limit=&offset=     top list JSON (fide-api)
+"""
+
+import argparse
+import os
+import random
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from string import Template
+from urllib.parse import parse_qs, urlparse
+
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+FEDERATIONS = [('IND', 'India'), ('NOR', 'Norway'), ('USA', 'United States of America'),
+               ('GER', 'Germany'), ('ESP', 'Spain'), ('RUS', 'Russia'), ('CHN', 'China')]
+TITLES = [('Grandmaster', 'GM'), ('International Master', 'IM'), ('FIDE Master', 'FM'),
+          ('None', None), ('None', None), ('None', None)]
+LAST_NAMES = ['Carlsen', 'Nakamura', 'Caruana', 'Gukesh', 'Firouzja', 'Anand', 'Giri', 'Aronian']
+FIRST_NAMES = ['Magnus', 'Hikaru', 'Fabiano', 'D', 'Alireza', 'Viswanathan', 'Anish', 'Levon']
+
+# Size of the simulated top list
+TOP_LIST_SIZE = 10_000
+
+
+def load_fixture(name: str) -> Template:
+    """A response template from fixtures/"""
+    with open(os.path.join(FIXTURES_DIR, name), 'r', encoding='utf-8') as f:
+        return Template(f.read())
+
+
+def player_fields(fide_id: int) -> dict:
+    """Deterministic player data for a FIDE ID"""
+    code, federation = FEDERATIONS[fide_id % len(FEDERATIONS)]
+    title, title_code = TITLES[fide_id % len(TITLES)]
+    return {
+        'fide_id': fide_id,
+        'name': f"{LAST_NAMES[fide_id % 8]}{fide_id}, {FIRST_NAMES[fide_id // 8 % 8]}",
+        'code': code,
+        'federation': federation,
+        'title': title,
+        'title_code': title_code,
+        'sex': 'Female' if fide_id % 5 == 0 else 'Male',
+        'birth_year': 1950 + fide_id % 60,
+        'rating_std': 1400 + fide_id % 1400,
+        'rating_rapid': 1400 + fide_id % 1200 if fide_id % 3 else None,
+        'rating_blitz': 1400 + fide_id % 1300 if fide_id % 4 else None,
+        'world_rank': fide_id % 10_000 + 1 if fide_id % 7 == 0 else None,
+    }
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are separate writes; without this each keep-alive
+    # response stalls ~40 ms on delayed ACKs and the stub, not the client, is measured
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        server.count()
+        if server.latency:
+            time.sleep(max(0.0, random.gauss(server.latency, server.latency * server.jitter)))
+        if server.error_rate and random.random() < server.error_rate:
+            return self._send('Service busy', status=random.choice((429, 503)))
+
+        url = urlparse(self.path)
+        parts = url.path.strip('/').split('/')
+        query = parse_qs(url.query)
+
+        if parts[0] == 'profile' and len(parts) == 2 and parts[1].isdigit():
+            fields = player_fields(int(parts[1]))
+            for rating in ('rating_std', 'rating_rapid', 'rating_blitz'):
+                fields[rating] = fields[rating] or 'Not rated'
+            return self._send(server.profile.substitute(fields))
+
+        if parts[0] == 'search.php':
+            name = query.get('search', [''])[0]
+            # Three candidates whose names contain the query, the first an exact match
+            rows = []
+            for k in range(3):
+                fields = player_fields(10_000_000 + zlib.crc32(name.encode()) % 1_000_000 * 4 + k)
+                fields['name'] = name if k == 0 else f"{name} {k}"
+                rows.append(server.search_row.substitute(fields))
+            return self._send(server.search.substitute(rows='\n'.join(rows)))
+
+        if parts[0] == 'player' and len(parts) == 2 and parts[1].isdigit():
+            return self._send(server.api_player.substitute(self._json_fields(int(parts[1]))),
+                              content_type='application/json')
+
+        if parts[0] == 'top':
+            limit = int(query.get('limit', [100])[0])
+            offset = int(query.get('offset', [0])[0])
+            ids = range(offset + 1, min(offset + limit, TOP_LIST_SIZE) + 1)
+            body = '[' + ','.join(server.api_player.substitute(self._json_fields(i)) for i in ids) + ']'
+            return self._send(body, content_type='application/json')
+
+        self._send('Not found', status=404)
+
+    @staticmethod
+    def _json_fields(fide_id: int) -> dict:
+        """Template fields for the JSON fixtures: missing numbers are null, a missing title empty"""
+        fields = player_fields(fide_id)
+        for key in ('rating_rapid', 'rating_blitz', 'world_rank'):
+            fields[key] = 'null' if fields[key] is None else fields[key]
+        fields['title_code'] = fields['title_code'] or ''
+        return fields
+
+    def _send(self, body: str, status: int = 200, content_type: str = 'text/html; charset=utf-8'):
+        data = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class StubServer(ThreadingHTTPServer):
+    """
+    Threaded stub server
+
+    Args:
+        port: Port to listen on (0 picks a free one)
+        latency: Mean delay per response in seconds
+        jitter: Standard deviation of the delay, relative to latency
+        error_rate: Fraction of responses replaced by a 429 or 503
+    """
+
+    daemon_threads = True
+
+    def __init__(self, port: int = 0, latency: float = 0.0, jitter: float = 0.2,
+                 error_rate: float = 0.0):
+        super().__init__(('127.0.0.1', port), StubHandler)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.requests = 0
+        self._lock = threading.Lock()
+        self.profile = load_fixture('profile.html')
+        self.search = load_fixture('search.html')
+        self.search_row = load_fixture('search_row.html')
+        self.api_player = load_fixture('api_player.json')
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def count(self):
+        with self._lock:
+            self.requests += 1
+
+    def start(self) -> 'StubServer':
+        """Serve on a background thread"""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve recorded FIDE responses locally")
+    parser.add_argument('--port', type=int, default=8765, help="Port (default: 8765)")
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help="Mean delay per response in milliseconds (default: 0)")
+    parser.add_argument('--error-rate', type=float, default=0.0,
+                        help="Fraction of responses answered with 429/503 (default: 0)")
+    args = parser.parse_args()
+
+    server = StubServer(args.port, latency=args.latency / 1000, error_rate=args.error_rate)
+    print(f"Serving FIDE stub on {server.url} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -2,12 +2,14 @@
 Example script showing how to use the FIDE extractor in batch mode
 """
 
+from fide_events import ConsoleReporter
 from fide_extractor import FIDEDataExtractor
 
 
 def main():
     # Create extractor instance
     extractor = FIDEDataExtractor()
+    extractor.events.subscribe(ConsoleReporter())
     
     # Define players to extract (can mix FIDE IDs and names)
     players_to_extract = [
@@ -2,58 +2,224 @@
 Extract FIDE player data from a text file containing IDs/names
 """
 
+import argparse
+import json
+import os
 import sys
+from typing import Dict, Iterator, Set
+
+from fide_archive import ResponseArchive
+from fide_cache import ProfileCache
+from fide_events import ConsoleReporter
+from fide_export import open_writer
 from fide_extractor import FIDEDataExtractor
+from fide_metrics import serve_metrics
+from fide_store import PlayerStore
+
+
+def parse_args():
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(
+        description="Extract FIDE player data from a text file of IDs/names",
+        epilog="Example: python extract_from_file.py players_input.txt players_output.xlsx"
+    )
+    parser.add_argument('input_file', help="Text file with one FIDE ID or name per line")
+    parser.add_argument('output_file', nargs='?', default="fide_players_output.xlsx",
+                        help="File to write: .xlsx, .csv, .json, .jsonl, .parquet or .feather "
+                             "(default: fide_players_output.xlsx)")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Number of players fetched concurrently (default: 1)")
+    parser.add_argument('--rps', type=float, default=1.0,
+                        help="Maximum requests per second to FIDE (default: 1.0)")
+    parser.add_argument('--retries', type=int, default=3,
+                        help="Retries for throttled or failed requests (default: 3)")
+    parser.add_argument('--parser', choices=['bs4', 'lxml'], default='bs4',
+                        help="Profile parser backend; lxml is faster (default: bs4)")
+    parser.add_argument('--parse-workers', type=int, default=0,
+                        help="Processes that parse downloaded pages, for large "
+                             "multi-core batch runs (default: 0, parse in the fetching threads)")
+    parser.add_argument('--cache', default=ProfileCache.DEFAULT_PATH,
+                        help=f"Profile cache database (default: {ProfileCache.DEFAULT_PATH})")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Disable the profile cache")
+    parser.add_argument('--cache-ttl', type=float, default=7,
+                        help="Days before a cached profile is re-downloaded (default: 7)")
+    parser.add_argument('--cache-size', type=int, default=100_000,
+                        help="Maximum number of cached profiles (default: 100000)")
+    parser.add_argument('--refresh', action='store_true',
+                        help="Re-download every profile, ignoring the cache")
+    parser.add_argument('--store',
+                        help="Local player store built by fide_rating_lists.py; "
+                             "players found there are not fetched")
+    parser.add_argument('--archive', metavar='DIR',
+                        help="Keep every downloaded response in this archive directory, "
+                             "so players can be re-parsed offline with fide_archive.py")
+    parser.add_argument('--checkpoint',
+                        help="JSONL file each result is appended to as it completes "
+                             "(default: <output_file>.checkpoint.jsonl)")
+    parser.add_argument('--resume', action='store_true',
+                        help="Skip identifiers already extracted in the checkpoint")
+    parser.add_argument('--snapshot',
+                        help="Snapshot CSV of the previous run; only new or changed "
+                             "players are exported, and the snapshot is updated")
+    parser.add_argument('--quiet', action='store_true',
+                        help="Print nothing per player, only the summary")
+    parser.add_argument('--progress', type=float, metavar='SECONDS',
+                        help="Print a progress line every SECONDS instead of a line per player")
+    parser.add_argument('--metrics-report',
+                        help="Write counters and per-stage latencies of the run as JSON")
+    parser.add_argument('--metrics-port', type=int,
+                        help="Serve Prometheus metrics on http://127.0.0.1:PORT/metrics during the run")
+    return parser.parse_args()
+
+
+def read_identifiers(input_file: str) -> Iterator[str]:
+    """Yield non-empty lines of the input file without loading it into memory"""
+    with open(input_file, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield line
+
+
+def iter_checkpoint(checkpoint_file: str) -> Iterator[Dict]:
+    """Yield checkpoint records, ignoring a truncated last line left by a crash"""
+    if not os.path.exists(checkpoint_file):
+        return
+    with open(checkpoint_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+
+def load_completed(checkpoint_file: str) -> Set[str]:
+    """Identifiers that were successfully extracted in a previous run"""
+    return {record['identifier'] for record in iter_checkpoint(checkpoint_file)
+            if record.get('player')}
 
 
 def main():
-    # Check if input file is provided
-    if len(sys.argv) < 2:
-        print("Usage: python extract_from_file.py <input_file> [output_file]")
-        print("\nExample: python extract_from_file.py players_input.txt players_output.xlsx")
+    args = parse_args()
+    input_file = args.input_file
+    output_file = args.output_file
+    
+    # Reject unsupported output types before a long extraction
+    try:
+        writer = open_writer(output_file)
+    except (ValueError, ImportError) as e:
+        print(f"Error: {e}")
         sys.exit(1)
     
-    input_file = sys.argv[1]
-    output_file = sys.argv[2] if len(sys.argv) > 2 else "fide_players_output.xlsx"
+    checkpoint_file = args.checkpoint or f"{os.path.splitext(output_file)[0]}.checkpoint.jsonl"
     
-    # Read identifiers from file
+    # Count identifiers without keeping them in memory
     try:
-        with open(input_file, 'r') as f:
-            identifiers = [line.strip() for line in f if line.strip()]
+        total = sum(1 for _ in read_identifiers(input_file))
     except FileNotFoundError:
         print(f"Error: File '{input_file}' not found!")
         sys.exit(1)
     
-    if not identifiers:
+    if not total:
         print("No player identifiers found in the file!")
         sys.exit(1)
     
+    completed = load_completed(checkpoint_file) if args.resume else set()
+    
     print("=" * 60)
     print("FIDE Data Extractor - File Input Mode")
     print("=" * 60)
     print(f"\nInput file: {input_file}")
     print(f"Output file: {output_file}")
-    print(f"Players to process: {len(identifiers)}")
+    print(f"Checkpoint file: {checkpoint_file}")
+    print(f"Players to process: {total}")
+    if completed:
+        print(f"Already extracted (resumed): {len(completed)}")
+    print(f"Workers: {args.workers} ({args.rps:g} requests/sec)")
     print("\n" + "=" * 60 + "\n")
     
     # Create extractor and process
-    extractor = FIDEDataExtractor()
-    players_data = extractor.extract_multiple_players(identifiers)
+    cache = None
+    if not args.no_cache:
+        cache = ProfileCache(args.cache, ttl=args.cache_ttl * 24 * 3600,
+                             max_entries=args.cache_size)
+    store = PlayerStore(args.store) if args.store else None
+    archive = ResponseArchive(args.archive) if args.archive else None
+    extractor = FIDEDataExtractor(max_workers=args.workers, requests_per_second=args.rps,
+                                  cache=cache, refresh=args.refresh, parser=args.parser,
+                                  store=store, max_retries=args.retries,
+                                  parse_workers=args.parse_workers, archive=archive)
+    # Per-player output is rendered from the extractor's events
+    reporter = None
+    if args.progress:
+        reporter = ConsoleReporter(interval=args.progress, total=None if completed else total)
+        extractor.events.subscribe(reporter)
+    elif not args.quiet:
+        extractor.events.subscribe(ConsoleReporter())
+    if args.metrics_port:
+        serve_metrics(extractor.stats, port=args.metrics_port)
+        print(f"Metrics: http://127.0.0.1:{args.metrics_port}/metrics\n")
     
-    if not players_data:
+    # Append every result to the checkpoint as soon as it completes
+    remaining = (identifier for identifier in read_identifiers(input_file)
+                 if identifier not in completed)
+    with open(checkpoint_file, 'a' if args.resume else 'w', encoding='utf-8') as checkpoint:
+        for identifier, player_data in extractor.iter_multiple_players(remaining):
+            record = player_data.to_record() if player_data else None
+            checkpoint.write(json.dumps({'identifier': identifier, 'player': record},
+                                        ensure_ascii=False) + "\n")
+            checkpoint.flush()
+    if reporter:
+        reporter.close()
+    
+    # Stream the checkpoint into the output file; in incremental mode only
+    # the changes since the last snapshot are written
+    players = (record['player'] for record in iter_checkpoint(checkpoint_file)
+               if record.get('player'))
+    if args.snapshot:
+        # Only snapshot runs need pandas
+        from fide_delta import compute_deltas, export_deltas, load_snapshot, players_to_frame, save_snapshot
+        
+        current = players_to_frame(players)
+        extracted = len(current)
+        if extracted:
+            previous = load_snapshot(args.snapshot)
+            deltas = compute_deltas(previous, current)
+            with extractor.stats.timer('export'):
+                export_deltas(deltas, output_file)
+            save_snapshot(previous, current, args.snapshot)
+    else:
+        with extractor.stats.timer('export'), writer:
+            extracted = writer.write_all(players)
+        if extracted:
+            print(f"\n✓ Data exported successfully to {output_file}")
+    
+    if not extracted:
         print("\nNo data could be extracted!")
         sys.exit(1)
     
-    # Export to Excel
-    extractor.export_to_excel(players_data, output_file)
-    
     # Show summary
     print("\n" + "=" * 60)
     print("Extraction Summary:")
     print("=" * 60)
-    print(f"Total identifiers: {len(identifiers)}")
-    print(f"Successfully extracted: {len(players_data)}")
-    print(f"Failed: {len(identifiers) - len(players_data)}")
+    print(f"Total identifiers: {total}")
+    print(f"Successfully extracted: {extracted}")
+    print(f"Failed: {total - extracted}")
+    if args.snapshot:
+        print(f"Changed since last snapshot: {len(deltas)}")
+    counts = extractor.stats.as_dict()
+    print(f"HTTP requests this run: {counts.get('requests', 0)} "
+          f"(retries: {counts.get('retries', 0)}, throttled: {counts.get('throttled', 0)}, "
+          f"errors: {counts.get('network_errors', 0) + counts.get('server_errors', 0)})")
+    if counts.get('coalesced'):
+        print(f"Duplicate entries served without a request: {counts['coalesced']}")
+    hit_ratio = extractor.stats.cache_hit_ratio()
+    if hit_ratio is not None:
+        print(f"Cache hit ratio: {hit_ratio:.1%}")
+    if args.metrics_report:
+        extractor.stats.write_report(args.metrics_report)
+        print(f"Metrics report: {args.metrics_report}")
     print("=" * 60)
 
 
@@ -3,10 +3,33 @@ Alternative FIDE data extractor using the fide-api REST API
 This is faster and more reliable than web scraping
 """
 
-import requests
-import pandas as pd
-from typing import List, Dict, Optional
 import time
+import requests
+from typing import Iterable, List, Dict, Optional, Union
+
+from fide_archive import ResponseArchive
+from fide_cache import ProfileCache
+from fide_events import (FAILED, FETCHED, FINISHED, PARSED, STARTED,
+                         ConsoleReporter, EventHooks)
+from fide_export import COLUMN_ORDER, export_players
+from fide_metrics import RunMetrics, TimedHTTPAdapter
+from fide_player import Player
+from fide_rate_limiter import RateController
+
+
+def normalize_api_player(data: Dict, fide_id: str) -> Player:
+    """Convert a fide-api /player response to a Player"""
+    return Player.from_dict({
+        'FIDE ID': data.get('fide_id', fide_id),
+        'Name': data.get('name'),
+        'Federation': data.get('federation'),
+        'Title': data.get('title'),
+        'B-Year': data.get('birth_year'),
+        'Rating std': data.get('standard_rating'),
+        'Rating rapid': data.get('rapid_rating'),
+        'Rating blitz': data.get('blitz_rating'),
+        'World Rank': data.get('world_rank'),
+    })
 
 
 class FIDEAPIExtractor:
@@ -16,119 +39,152 @@ class FIDEAPIExtractor:
     API_BASE_URL = "https://fide-api.vercel.app"
     # If running locally with Docker: API_BASE_URL = "http://localhost:8000"
     
-    def __init__(self, api_url: str = None):
+    CACHE_SOURCE = "api"
+    
+    def __init__(self, api_url: str = None, cache: Optional[ProfileCache] = None,
+                 refresh: bool = False, requests_per_second: float = 2.0,
+                 max_retries: int = 3, archive: Optional[ResponseArchive] = None):
         """
         Initialize the API extractor
         
         Args:
             api_url: Optional custom API URL (default: public hosted API)
+            requests_per_second: Maximum request rate sent to the API; the rate
+                                 backs off automatically when the API throttles
+            max_retries: Retries for throttled, failed or timed-out requests
+            cache: Optional persistent profile cache
+            refresh: Ignore cached profiles and re-download them (the cache is still updated)
+            archive: Optional raw response archive (see fide_archive) that keeps
+                     every API response for offline re-parsing
         """
         self.api_url = api_url or self.API_BASE_URL
+        self.cache = cache
+        self.archive = archive
+        self.refresh = refresh
+        self.rate_controller = RateController(requests_per_second, max_retries=max_retries)
         self.session = requests.Session()
+        adapter = TimedHTTPAdapter(self.stats)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        
+        # Progress of each FIDE ID; nothing is printed unless someone subscribes
+        self.events = EventHooks()
+    
+    @property
+    def stats(self) -> RunMetrics:
+        """Request counts and stage timings of the current run (see fide_metrics)"""
+        return self.rate_controller.stats
     
-    def get_player_by_id(self, fide_id: str) -> Optional[Dict]:
-        """Get player data by FIDE ID"""
+    def get_player_by_id(self, fide_id: str) -> Optional[Player]:
+        """Get player data by FIDE ID as a Player (see fide_player)"""
+        start = time.perf_counter()
+        if self.cache and not self.refresh:
+            cached = self.cache.get(self.CACHE_SOURCE, fide_id)
+            if cached:
+                self.stats.add('cache_hits')
+                self.events.emit(FETCHED, fide_id, fide_id=fide_id, source='cache',
+                                 seconds=time.perf_counter() - start, player=cached)
+                return cached
+            self.stats.add('cache_misses')
+        
         try:
             url = f"{self.api_url}/player/{fide_id}"
-            response = self.session.get(url, timeout=10)
+            response = self.rate_controller.request(self.session, url)
             response.raise_for_status()
-            
+            if self.archive is not None:
+                self.archive.add(self.CACHE_SOURCE, fide_id, response)
             data = response.json()
+            self.events.emit(FETCHED, fide_id, fide_id=fide_id, source='network',
+                             seconds=time.perf_counter() - start)
             
-            # Normalize the data structure
-            player_data = {
-                'FIDE ID': str(data.get('fide_id', fide_id)),
-                'Name': data.get('name', 'N/A'),
-                'Federation': data.get('federation', 'N/A'),
-                'Title': data.get('title', 'N/A'),
-                'B-Year': data.get('birth_year', 'N/A'),
-                'Age': 'N/A',
-                'Rating std': data.get('standard_rating', 'N/A'),
-                'Rating rapid': data.get('rapid_rating', 'N/A'),
-                'Rating blitz': data.get('blitz_rating', 'N/A'),
-                'World Rank': data.get('world_rank', 'N/A'),
-            }
-            
-            # Calculate age
-            if player_data['B-Year'] != 'N/A':
-                try:
-                    birth_year = int(player_data['B-Year'])
-                    player_data['Age'] = str(2025 - birth_year)
-                except:
-                    player_data['Age'] = 'N/A'
+            start = time.perf_counter()
+            player_data = normalize_api_player(data, fide_id)
+            self.events.emit(PARSED, fide_id, fide_id=fide_id, seconds=time.perf_counter() - start,
+                             player=player_data)
             
+            if self.cache:
+                self.cache.put(self.CACHE_SOURCE, fide_id, player_data)
             return player_data
         except requests.exceptions.RequestException as e:
-            print(f"Error fetching FIDE ID {fide_id}: {str(e)}")
+            self.events.emit(FAILED, fide_id, fide_id=fide_id, stage='fetch',
+                             message=f"Error fetching FIDE ID {fide_id}: {str(e)}")
             return None
         except Exception as e:
-            print(f"Unexpected error for FIDE ID {fide_id}: {str(e)}")
+            self.events.emit(FAILED, fide_id, fide_id=fide_id, stage='parse',
+                             message=f"Unexpected error for FIDE ID {fide_id}: {str(e)}")
             return None
     
-    def get_top_players(self, limit: int = 100) -> List[Dict]:
-        """Get top players from the API"""
+    def get_top_players(self, limit: int = 100, offset: int = 0) -> List[Dict]:
+        """
+        Get one page of the top list from the API
+        
+        Args:
+            limit: Number of players
+            offset: Players to skip (0 starts at rank 1)
+        """
         try:
             url = f"{self.api_url}/top"
-            response = self.session.get(url, timeout=10)
+            response = self.rate_controller.request(self.session, url,
+                                                    params={'limit': limit, 'offset': offset})
             response.raise_for_status()
+            if self.archive is not None:
+                self.archive.add('top', f"{offset}:{limit}", response)
             
             data = response.json()
+            if not isinstance(data, list):
+                return []
             
-            # Return the requested number of players
-            return data[:limit] if isinstance(data, list) else []
+            # An API that ignores the paging parameters returns the whole list
+            if len(data) > limit:
+                data = data[offset:offset + limit]
+            return data
         except Exception as e:
-            print(f"Error fetching top players: {str(e)}")
+            self.events.emit(FAILED, 'top', stage='top',
+                             message=f"Error fetching top players {offset + 1}-{offset + limit}: {str(e)}")
             return []
     
-    def extract_multiple_players(self, fide_ids: List[str]) -> List[Dict]:
+    def extract_multiple_players(self, fide_ids: List[str]) -> List[Player]:
         """
         Extract data for multiple players by FIDE ID
         
         Note: This API doesn't support name search, only FIDE IDs
         """
+        self.stats.reset()
         all_players = []
         
         for fide_id in fide_ids:
             fide_id = fide_id.strip()
             
             if not fide_id.isdigit():
-                print(f"Warning: '{fide_id}' is not a valid FIDE ID (must be numeric)")
+                self.events.emit(FAILED, fide_id, stage='input',
+                                 message=f"Warning: '{fide_id}' is not a valid FIDE ID (must be numeric)")
                 continue
             
-            print(f"Fetching FIDE ID: {fide_id}")
+            started = time.perf_counter()
+            self.events.emit(STARTED, fide_id)
             player_data = self.get_player_by_id(fide_id)
             
             if player_data:
                 all_players.append(player_data)
-            
-            # Be polite to the API
-            time.sleep(0.5)
+                self.stats.add('players_extracted')
+            else:
+                self.stats.add('players_failed')
+            self.events.emit(FINISHED, fide_id, player=player_data,
+                             seconds=time.perf_counter() - started)
         
         return all_players
     
-    def export_to_excel(self, players_data: List[Dict], filename: str = "fide_players.xlsx"):
-        """Export player data to Excel file"""
-        if not players_data:
+    def export_to_excel(self, players_data: Iterable[Union[Player, Dict]], filename: str = "fide_players.xlsx"):
+        """Export player data to Excel file, streaming rows as they arrive (see fide_export)"""
+        # World Rank is always a column here, even if the first player has none
+        with self.stats.timer('export'):
+            count = export_players(players_data, filename, fmt='xlsx', columns=COLUMN_ORDER)
+        if not count:
             print("No data to export!")
             return
         
-        df = pd.DataFrame(players_data)
-        
-        # Replace N/A with empty strings
-        df = df.replace('N/A', '')
-        
-        # Reorder columns for better readability
-        column_order = ['FIDE ID', 'Name', 'Federation', 'Title', 'B-Year', 'Age',
-                       'Rating std', 'Rating rapid', 'Rating blitz', 'World Rank']
-        
-        # Only include columns that exist in the dataframe
-        column_order = [col for col in column_order if col in df.columns]
-        df = df[column_order]
-        
-        # Export to Excel
-        df.to_excel(filename, index=False, engine='openpyxl')
         print(f"\n✓ Data exported successfully to {filename}")
-        print(f"  Total players: {len(players_data)}")
+        print(f"  Total players: {count}")
 
 
 def main():
@@ -139,6 +195,7 @@ def main():
     
     # Create extractor instance
     extractor = FIDEAPIExtractor()
+    extractor.events.subscribe(ConsoleReporter())
     
     # Test API connectivity
     print("\nTesting API connectivity...")
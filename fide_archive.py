@@ -0,0 +1,436 @@
+"""
+Append-only archive of raw FIDE responses, with offline re-parsing
+
+Every response the extractors download can be kept as a WARC response
+record, so that when FIDE changes its HTML the players can be rebuilt
+from the archived pages instead of being downloaded again:
+
+    python extract_from_file.py roster.txt players.xlsx --archive fide_archive
+    python fide_archive.py reparse players.xlsx --parser lxml --workers 8
+
+Each record is compressed on its own, as a zstd frame when zstandard is
+installed (pip install zstandard) or else as a gzip member, which makes
+the segments valid .warc.zst / .warc.gz files. Segments are only ever
+appended to; a SQLite index maps every record to its segment, offset and
+length, so a record is read by slicing a memory-mapped segment.
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import mmap
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+from fide_player import Player
+
+
+# Sources whose records can be rebuilt into players
+REPARSE_SOURCES = ('profile', 'api')
+
+# Headers describing the transfer, which no longer apply to the decoded body
+TRANSFER_HEADERS = {'content-encoding', 'transfer-encoding', 'content-length'}
+
+SEGMENT_PATTERN = re.compile(r'responses-(\d+)\.warc\.(zst|gz)$')
+EXTENSIONS = {'zstd': 'zst', 'gzip': 'gz'}
+
+
+class RecordLocation(NamedTuple):
+    """Where an archived record lives"""
+    source: str
+    key: str
+    segment: str
+    offset: int
+    length: int
+
+
+class ArchiveRecord(NamedTuple):
+    """An archived response"""
+    source: str
+    key: str
+    url: str
+    date: str
+    status: int
+    headers: Dict[str, str]
+    body: bytes
+
+
+def zstd_available() -> bool:
+    try:
+        import zstandard  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def compress(data: bytes, codec: str) -> bytes:
+    """One self-contained zstd frame or gzip member"""
+    if codec == 'zstd':
+        import zstandard
+        return zstandard.ZstdCompressor(level=3).compress(data)
+    return gzip.compress(data, compresslevel=6, mtime=0)
+
+
+def decompress(data: bytes, codec: str) -> bytes:
+    if codec == 'zstd':
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError("This archive segment is zstd-compressed: pip install zstandard")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+def segment_codec(segment: str) -> str:
+    return 'zstd' if segment.endswith('.zst') else 'gzip'
+
+
+def build_record(source: str, key: str, response) -> bytes:
+    """A WARC/1.1 response record for a requests response"""
+    status_line = f"HTTP/1.1 {response.status_code} {response.reason or ''}".rstrip()
+    header_lines = [f"{name}: {value}" for name, value in response.headers.items()
+                    if name.lower() not in TRANSFER_HEADERS]
+    block = ('\r\n'.join([status_line] + header_lines) + '\r\n\r\n').encode('latin-1', 'replace')
+    block += response.content
+
+    warc_headers = [
+        "WARC/1.1",
+        "WARC-Type: response",
+        f"WARC-Record-ID: <urn:uuid:{uuid.uuid4()}>",
+        f"WARC-Date: {datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')}",
+        f"WARC-Target-URI: {response.url}",
+        f"WARC-Payload-Digest: sha256:{hashlib.sha256(response.content).hexdigest()}",
+        "Content-Type: application/http;msgtype=response",
+        f"X-FIDE-Source: {source}",
+        f"X-FIDE-Key: {key}",
+        f"Content-Length: {len(block)}",
+    ]
+    return ('\r\n'.join(warc_headers) + '\r\n\r\n').encode('utf-8') + block + b'\r\n\r\n'
+
+
+def _parse_headers(lines: List[bytes], encoding: str) -> Dict[str, str]:
+    headers = {}
+    for line in lines:
+        name, _, value = line.decode(encoding, 'replace').partition(':')
+        headers[name.strip()] = value.strip()
+    return headers
+
+
+def parse_record(data: bytes) -> ArchiveRecord:
+    """Split a decompressed WARC record into its response parts"""
+    head, _, rest = data.partition(b'\r\n\r\n')
+    warc = _parse_headers(head.split(b'\r\n')[1:], 'utf-8')
+    block = rest[:int(warc['Content-Length'])]
+
+    http_head, _, body = block.partition(b'\r\n\r\n')
+    http_lines = http_head.split(b'\r\n')
+    status = int(http_lines[0].split()[1])
+    return ArchiveRecord(
+        source=warc.get('X-FIDE-Source', ''),
+        key=warc.get('X-FIDE-Key', ''),
+        url=warc.get('WARC-Target-URI', ''),
+        date=warc.get('WARC-Date', ''),
+        status=status,
+        headers=_parse_headers(http_lines[1:], 'latin-1'),
+        body=body,
+    )
+
+
+class ResponseArchive:
+    """Append-only WARC segments plus a SQLite offset index, in one directory"""
+
+    DEFAULT_PATH = "fide_archive"
+    SEGMENT_SIZE = 1 << 30
+
+    def __init__(self, path: str = DEFAULT_PATH, compression: Optional[str] = None,
+                 segment_size: int = SEGMENT_SIZE):
+        """
+        Open (or create) an archive
+
+        Args:
+            path: Archive directory
+            compression: 'zstd' or 'gzip' for new records (default: zstd when
+                         zstandard is installed, else gzip)
+            segment_size: Bytes after which a new segment file is started
+        """
+        if compression not in (None, 'zstd', 'gzip'):
+            raise ValueError(f"Unknown compression '{compression}' (expected zstd or gzip)")
+        if compression == 'zstd' and not zstd_available():
+            raise ImportError("zstd compression requires zstandard: pip install zstandard")
+        self.path = path
+        self.codec = compression or ('zstd' if zstd_available() else 'gzip')
+        self.segment_size = segment_size
+        self._lock = threading.Lock()
+        self._maps = {}
+        self._file = None
+        os.makedirs(path, exist_ok=True)
+
+        self._conn = sqlite3.connect(os.path.join(path, 'index.sqlite'), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS records (
+                id INTEGER PRIMARY KEY,
+                source TEXT NOT NULL,
+                key TEXT NOT NULL,
+                segment TEXT NOT NULL,
+                offset INTEGER NOT NULL,
+                length INTEGER NOT NULL,
+                fetched_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_records_key ON records (source, key)")
+        self._conn.commit()
+
+    def segments(self) -> List[str]:
+        """Segment file names, oldest first"""
+        names = [name for name in os.listdir(self.path) if SEGMENT_PATTERN.match(name)]
+        return sorted(names, key=lambda name: int(SEGMENT_PATTERN.match(name).group(1)))
+
+    def _open_segment(self):
+        """Append to the last segment, or start a new one when it is full or uses another codec"""
+        segments = self.segments()
+        if segments:
+            last = segments[-1]
+            number = int(SEGMENT_PATTERN.match(last).group(1))
+            if segment_codec(last) == self.codec and \
+                    os.path.getsize(os.path.join(self.path, last)) < self.segment_size:
+                name = last
+            else:
+                name = f"responses-{number + 1:05d}.warc.{EXTENSIONS[self.codec]}"
+        else:
+            name = f"responses-00001.warc.{EXTENSIONS[self.codec]}"
+        self._segment = name
+        self._file = open(os.path.join(self.path, name), 'ab')
+
+    def add(self, source: str, key: str, response):
+        """
+        Append a response
+
+        Args:
+            source: What was fetched: 'profile', 'api', 'search', 'history', ...
+            key: FIDE ID (or search text) the response belongs to
+            response: requests.Response with the body already read
+        """
+        data = compress(build_record(source, key, response), self.codec)
+        with self._lock:
+            if self._file is None or self._file.tell() >= self.segment_size:
+                if self._file:
+                    self._file.close()
+                self._open_segment()
+            offset = self._file.tell()
+            self._file.write(data)
+            # The segment is flushed before the index points at it
+            self._file.flush()
+            self._conn.execute(
+                "INSERT INTO records (source, key, segment, offset, length, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (source, str(key), self._segment, offset, len(data), time.time())
+            )
+            self._conn.commit()
+
+    def locations(self, sources: Optional[Iterable[str]] = None,
+                  latest: bool = True) -> List[RecordLocation]:
+        """
+        Records in the order they were archived
+
+        Args:
+            sources: Only these sources (default: all)
+            latest: Only the newest record per source and key
+        """
+        where, params = "", ()
+        if sources is not None:
+            params = tuple(sources)
+            where = f"WHERE source IN ({', '.join('?' * len(params))})"
+        if latest:
+            where = f"WHERE id IN (SELECT MAX(id) FROM records {where} GROUP BY source, key)"
+        query = f"SELECT source, key, segment, offset, length FROM records {where} ORDER BY id"
+        with self._lock:
+            return [RecordLocation(*row) for row in self._conn.execute(query, params)]
+
+    def read(self, location: RecordLocation) -> ArchiveRecord:
+        """Read one record through a memory map of its segment"""
+        return read_location(self.path, location, self._maps)
+
+    def counts(self) -> Dict[str, int]:
+        """Number of records per source"""
+        with self._lock:
+            return dict(self._conn.execute("SELECT source, COUNT(*) FROM records GROUP BY source"))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM records").fetchone()[0]
+
+    def close(self):
+        """Close the open segment and the index"""
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+            for segment_map in self._maps.values():
+                segment_map.close()
+            self._maps.clear()
+            self._conn.close()
+
+
+def read_location(directory: str, location: RecordLocation, maps: Dict) -> ArchiveRecord:
+    """
+    Read a record by slicing its memory-mapped segment
+
+    Args:
+        directory: Archive directory
+        location: The record's index entry
+        maps: Segment name -> mmap, reused across calls
+    """
+    end = location.offset + location.length
+    segment_map = maps.get(location.segment)
+    if segment_map is None or len(segment_map) < end:
+        # Not mapped yet, or the segment grew since it was mapped
+        if segment_map is not None:
+            segment_map.close()
+        with open(os.path.join(directory, location.segment), 'rb') as f:
+            segment_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        maps[location.segment] = segment_map
+    data = decompress(segment_map[location.offset:end], segment_codec(location.segment))
+    return parse_record(data)
+
+
+def record_to_player(record: ArchiveRecord, parse) -> Optional[Player]:
+    """Rebuild a player from an archived profile page or API response"""
+    if record.status != 200:
+        return None
+    if record.source == 'api':
+        from fide_api_extractor import normalize_api_player
+        return normalize_api_player(json.loads(record.body), record.key)
+    charset = re.search(r'charset=([\w-]+)', record.headers.get('Content-Type', ''))
+    html = record.body.decode(charset.group(1) if charset else 'utf-8', 'replace')
+    return parse(html, record.key)
+
+
+# Segment maps of a reparse worker process, kept between batches
+_worker_maps = {}
+
+
+def _reparse_batch(directory: str, parser: str, locations: List[RecordLocation]) -> List[Optional[Player]]:
+    """Parse a batch of records in a worker process; unparseable records give None"""
+    from fide_parsers import get_parser
+
+    parse = get_parser(parser)
+    players = []
+    for location in locations:
+        try:
+            players.append(record_to_player(read_location(directory, location, _worker_maps), parse))
+        except Exception:
+            players.append(None)
+    return players
+
+
+def reparse(archive: ResponseArchive, parser: str = 'bs4', workers: Optional[int] = None,
+            latest: bool = True, batch_size: int = 200) -> Iterator[Optional[Player]]:
+    """
+    Rebuild players from archived profile pages and API responses, without network access
+
+    Batches of records are parsed by a pool of processes, each reading the
+    segments through its own memory maps; at most two batches per process
+    are queued. Players are yielded in archive order; records that no
+    longer parse yield None.
+
+    Args:
+        archive: Archive to read
+        parser: Profile parser backend, 'bs4' or 'lxml' (see fide_parsers)
+        workers: Parse processes (default: one per CPU; 0 parses in this process)
+        latest: Only the newest response per player
+        batch_size: Records sent to a worker at a time
+    """
+    locations = archive.locations(REPARSE_SOURCES, latest=latest)
+    batches = [locations[start:start + batch_size] for start in range(0, len(locations), batch_size)]
+
+    if workers == 0:
+        for batch in batches:
+            yield from _reparse_batch(archive.path, parser, batch)
+        return
+
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        try:
+            for batch in batches:
+                pending.append(pool.submit(_reparse_batch, archive.path, parser, batch))
+                if len(pending) >= 2 * workers:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def main():
+    """Inspect an archive or rebuild players from it"""
+    parser = argparse.ArgumentParser(description="Archived FIDE responses: inspect or re-parse offline")
+    parser.add_argument('--archive', default=ResponseArchive.DEFAULT_PATH,
+                        help=f"Archive directory (default: {ResponseArchive.DEFAULT_PATH})")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    commands.add_parser('info', help="Show what the archive holds")
+
+    rebuild = commands.add_parser('reparse', help="Rebuild players from the archived responses")
+    rebuild.add_argument('output_file', help="Output file (.xlsx, .csv, .json, .jsonl, .parquet, .feather)")
+    rebuild.add_argument('--parser', choices=['bs4', 'lxml'], default='bs4',
+                         help="Profile parser backend (default: bs4)")
+    rebuild.add_argument('--workers', type=int, default=None,
+                         help="Parse processes (default: one per CPU)")
+    rebuild.add_argument('--all-versions', action='store_true',
+                         help="Every archived response, not just the newest per player")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.archive):
+        print(f"Error: no archive at '{args.archive}'")
+        sys.exit(1)
+    archive = ResponseArchive(args.archive)
+
+    if args.command == 'info':
+        total_size = sum(os.path.getsize(os.path.join(archive.path, name)) for name in archive.segments())
+        print(f"{len(archive)} record(s) in {len(archive.segments())} segment(s), "
+              f"{total_size / (1024 * 1024):.1f} MB")
+        for source, count in sorted(archive.counts().items()):
+            print(f"  {source}: {count}")
+        return
+
+    from fide_export import open_writer
+
+    try:
+        writer = open_writer(args.output_file)
+    except (ValueError, ImportError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    started = time.time()
+    failed = 0
+    with writer:
+        for player in reparse(archive, parser=args.parser, workers=args.workers,
+                              latest=not args.all_versions):
+            if player:
+                writer.write(player)
+            else:
+                failed += 1
+    elapsed = time.time() - started
+
+    print(f"✓ {writer.count} player(s) rebuilt into {args.output_file} "
+          f"in {elapsed:.1f}s ({writer.count / max(elapsed, 1e-9):.0f}/s)")
+    if failed:
+        print(f"  {failed} archived response(s) could not be parsed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+Persistent on-disk cache of FIDE player profiles
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from typing import Dict, NamedTuple, Optional, Union
+
+from fide_player import Player, as_player
+
+
+class CacheEntry(NamedTuple):
+    """A cached profile together with its HTTP validators"""
+    data: Player
+    fetched_at: float
+    etag: Optional[str]
+    last_modified: Optional[str]
+    content_hash: Optional[str]
+
+
+class ProfileCache:
+    """SQLite-backed profile cache keyed by FIDE ID, with TTL and size-bounded eviction"""
+
+    DEFAULT_PATH = "fide_cache.sqlite"
+    DEFAULT_TTL = 7 * 24 * 3600  # FIDE publishes ratings monthly
+    SCHEMA_VERSION = 2
+
+    def __init__(self, path: str = DEFAULT_PATH, ttl: float = DEFAULT_TTL,
+                 max_entries: int = 100_000):
+        """
+        Open (or create) the cache database
+
+        Args:
+            path: SQLite database file
+            ttl: Seconds before a cached profile is considered stale
+            max_entries: Maximum number of profiles kept; the oldest are evicted first
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+
+        # The cache is disposable, so an outdated schema is simply rebuilt
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != self.SCHEMA_VERSION:
+            self._conn.execute("DROP TABLE IF EXISTS profiles")
+            self._conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS profiles (
+                source TEXT NOT NULL,
+                fide_id TEXT NOT NULL,
+                data TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                content_hash TEXT,
+                PRIMARY KEY (source, fide_id)
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_profiles_fetched ON profiles (fetched_at)")
+        self._conn.commit()
+        self._size = self._conn.execute("SELECT COUNT(*) FROM profiles").fetchone()[0]
+
+    def get(self, source: str, fide_id: str) -> Optional[Player]:
+        """Return the cached profile, or None if missing or older than the TTL"""
+        entry = self.get_entry(source, fide_id)
+        if entry is None or not self.is_fresh(entry):
+            return None
+        return entry.data
+
+    def get_entry(self, source: str, fide_id: str) -> Optional[CacheEntry]:
+        """Return the cached entry with its validators, even if it is stale"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data, fetched_at, etag, last_modified, content_hash FROM profiles "
+                "WHERE source = ? AND fide_id = ?",
+                (source, fide_id)
+            ).fetchone()
+
+        if row is None:
+            return None
+        # Entries written before typed players held 'N/A' strings; from_dict reads both
+        return CacheEntry(Player.from_dict(json.loads(row[0])), *row[1:])
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        """Check whether an entry is still within the TTL"""
+        return time.time() - entry.fetched_at <= self.ttl
+
+    def put(self, source: str, fide_id: str, data: Union[Player, Dict], etag: Optional[str] = None,
+            last_modified: Optional[str] = None, content_hash: Optional[str] = None):
+        """Store a profile, evicting the oldest entries when the cache is full"""
+        payload = json.dumps(as_player(data).to_record(), ensure_ascii=False)
+        now = time.time()
+
+        with self._lock:
+            updated = self._conn.execute(
+                "UPDATE profiles SET data = ?, fetched_at = ?, etag = ?, last_modified = ?, "
+                "content_hash = ? WHERE source = ? AND fide_id = ?",
+                (payload, now, etag, last_modified, content_hash, source, fide_id)
+            ).rowcount
+            if not updated:
+                self._conn.execute(
+                    "INSERT INTO profiles (source, fide_id, data, fetched_at, etag, "
+                    "last_modified, content_hash) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (source, fide_id, payload, now, etag, last_modified, content_hash)
+                )
+                self._size += 1
+                if self._size > self.max_entries:
+                    self._evict()
+            self._conn.commit()
+
+    def revalidate(self, source: str, fide_id: str, etag: Optional[str] = None,
+                   last_modified: Optional[str] = None):
+        """Mark an entry as fresh again after the server confirmed it is unchanged"""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE profiles SET fetched_at = ?, etag = COALESCE(?, etag), "
+                "last_modified = COALESCE(?, last_modified) WHERE source = ? AND fide_id = ?",
+                (time.time(), etag, last_modified, source, fide_id)
+            )
+            self._conn.commit()
+
+    def _evict(self):
+        """Drop the oldest tenth of the cache (caller holds the lock)"""
+        excess = self._size - self.max_entries + max(1, self.max_entries // 10)
+        self._conn.execute(
+            "DELETE FROM profiles WHERE rowid IN "
+            "(SELECT rowid FROM profiles ORDER BY fetched_at LIMIT ?)",
+            (excess,)
+        )
+        self._size = self._conn.execute("SELECT COUNT(*) FROM profiles").fetchone()[0]
+
+    def clear(self):
+        """Remove every cached profile"""
+        with self._lock:
+            self._conn.execute("DELETE FROM profiles")
+            self._conn.commit()
+            self._size = 0
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,81 @@
+"""
+In-flight request coalescing
+
+Rosters list the same player several times (by ID, by name, in several
+sections). A Coalescer runs a call once per key: threads asking for a key
+that is already being fetched wait on the same future, and later callers
+get the finished result, so each unique player costs one round trip.
+"""
+
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Hashable, Tuple
+
+
+class Coalescer:
+    """Share one call per key between threads, remembering results until cleared"""
+
+    def __init__(self):
+        self._futures = {}
+        self._lock = threading.Lock()
+
+    def run(self, key: Hashable, function: Callable, *args) -> Tuple[Any, bool]:
+        """
+        Call function(*args) unless a call for key is running or finished
+
+        Returns:
+            (result, shared) where shared is True when the result came from
+            another caller's call. A call that raises is not remembered; the
+            callers waiting on it get the exception.
+        """
+        with self._lock:
+            future = self._futures.get(key)
+            owner = future is None
+            if owner:
+                future = self._futures[key] = Future()
+
+        if not owner:
+            return future.result(), True
+
+        try:
+            result = function(*args)
+        except BaseException as e:
+            with self._lock:
+                if self._futures.get(key) is future:
+                    del self._futures[key]
+            future.set_exception(e)
+            raise
+        future.set_result(result)
+        return result, False
+
+    def replace(self, key: Hashable, result: Any):
+        """
+        Remember a different result for a finished key
+
+        Lets a caller swap a bulky intermediate result (a downloaded page)
+        for its final, smaller form once that is known. Keys that are
+        unknown or still running are left alone.
+        """
+        with self._lock:
+            future = self._futures.get(key)
+            if future is None or not future.done():
+                return
+            done = Future()
+            done.set_result(result)
+            self._futures[key] = done
+
+    def forget(self, key: Hashable):
+        """Drop a finished key so the next caller runs the call again"""
+        with self._lock:
+            future = self._futures.get(key)
+            if future is not None and future.done():
+                del self._futures[key]
+
+    def clear(self):
+        """Forget finished calls (calls still running complete normally)"""
+        with self._lock:
+            self._futures = {}
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._futures)
@@ -0,0 +1,251 @@
+"""
+Bulk crawler for top lists and whole federations
+
+Pages through the API top list, or through every player of a federation
+in the local player store (filled from the rating lists, see
+fide_rating_lists), and fetches each profile with concurrent,
+rate-limited requests. Players are written to the store in batches, and
+a small state file records how far each crawl got, so an interrupted
+crawl picks up where it stopped:
+
+    python fide_crawler.py federation IND --workers 4 --rps 4
+    python fide_crawler.py top --limit 5000
+"""
+
+import argparse
+import json
+import os
+import signal
+import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+from fide_api_extractor import FIDEAPIExtractor
+from fide_archive import ResponseArchive
+from fide_events import FAILED, ConsoleReporter
+from fide_store import PlayerStore
+
+
+class CrawlState:
+    """Resume cursors of crawl jobs, kept in a JSON file"""
+
+    DEFAULT_PATH = "fide_crawl_state.json"
+
+    def __init__(self, path: str = DEFAULT_PATH):
+        """
+        Load the state file, if any
+
+        Args:
+            path: JSON state file
+        """
+        self.path = path
+        self.jobs = {}
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self.jobs = json.load(f)
+
+    def get(self, job: str) -> Dict:
+        """State of a job: cursor, stored and failed counts, failed IDs"""
+        return self.jobs.setdefault(job, {'cursor': None, 'stored': 0, 'failed': []})
+
+    def reset(self, job: str):
+        """Start a job over"""
+        self.jobs.pop(job, None)
+
+    def save(self):
+        """Write the state atomically, so a crash never leaves a truncated file"""
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.jobs, f, indent=2)
+        os.replace(temp_path, self.path)
+
+
+def iter_top_ids(api: FIDEAPIExtractor, start: int = 0, limit: Optional[int] = None,
+                 page_size: int = 100) -> Iterator[Tuple[int, str]]:
+    """
+    Yield (position, FIDE ID) down the API top list, one page at a time
+
+    Args:
+        api: API extractor
+        start: Positions to skip (a resume cursor)
+        limit: Stop after this position (default: the whole list)
+        page_size: Players requested per page
+    """
+    seen = set()
+    position = start
+    while limit is None or position < limit:
+        size = page_size if limit is None else min(page_size, limit - position)
+        page = api.get_top_players(limit=size, offset=position)
+        new = 0
+        for entry in page:
+            fide_id = str(entry.get('fide_id') or entry.get('id') or '')
+            if fide_id.isdigit() and fide_id not in seen:
+                seen.add(fide_id)
+                new += 1
+                yield position, fide_id
+            position += 1
+        # A short page, or one with nothing new, is the end of the list
+        if len(page) < size or not new:
+            return
+
+
+def iter_federation_ids(store: PlayerStore, federation: str,
+                        after: Optional[int] = None) -> Iterator[Tuple[int, str]]:
+    """Yield (FIDE ID, FIDE ID) for every stored player of a federation, in ID order"""
+    for fide_id in store.iter_fide_ids(federation, after=after or 0):
+        yield fide_id, str(fide_id)
+
+
+def crawl(api: FIDEAPIExtractor, ids: Iterable[Tuple[int, str]], store: PlayerStore,
+          state: CrawlState, job: str, workers: int = 4, flush_every: int = 500) -> Dict:
+    """
+    Fetch players and write them to the store, saving progress as it goes
+
+    Profiles are fetched by a pool of threads, all sharing the API
+    extractor's rate limit; results are taken in input order, so after
+    each batch is written the cursor of its last player is a safe place
+    to resume from.
+
+    Args:
+        api: API extractor used for the profile requests
+        ids: (cursor, FIDE ID) pairs, e.g. from iter_top_ids or iter_federation_ids
+        store: Store the players are written to
+        state: Crawl state the job's progress is saved in
+        job: Name of the job in the state file
+        workers: Profiles fetched concurrently
+        flush_every: Players written to the store per batch
+
+    Returns:
+        The job's state
+    """
+    progress = state.get(job)
+    failed = set(progress['failed'])
+    batch = []
+    started = time.time()
+    fetched = 0
+    cursor = progress['cursor']
+
+    def flush():
+        # The store turns the API's country names back into codes
+        store.index_players(batch)
+        progress['stored'] += len(batch)
+        progress['cursor'] = cursor
+        progress['failed'] = sorted(failed)
+        state.save()
+        batch.clear()
+
+        rate = fetched / max(time.time() - started, 1e-9)
+        print(f"  {progress['stored']} stored, {len(failed)} failed ({rate:.1f} players/s)")
+
+    def finish(pending: deque):
+        nonlocal cursor, fetched
+        position, fide_id, future = pending.popleft()
+        player = future.result()
+        fetched += 1
+        cursor = position
+        if player:
+            batch.append(player)
+            failed.discard(fide_id)
+        else:
+            failed.add(fide_id)
+        if len(batch) >= flush_every:
+            flush()
+
+    api.stats.reset()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        try:
+            for position, fide_id in ids:
+                pending.append((position, fide_id, executor.submit(api.get_player_by_id, fide_id)))
+                if len(pending) >= 2 * workers:
+                    finish(pending)
+            while pending:
+                finish(pending)
+        finally:
+            # Keep what was fetched when interrupted; queued requests are dropped
+            for _, _, future in pending:
+                future.cancel()
+            flush()
+    return progress
+
+
+def main():
+    """Crawl top lists or federations from the command line"""
+    parser = argparse.ArgumentParser(description="Mirror FIDE top lists or whole federations into the player store")
+    parser.add_argument('--db', default=PlayerStore.DEFAULT_PATH,
+                        help=f"Player store database (default: {PlayerStore.DEFAULT_PATH})")
+    parser.add_argument('--state', default=CrawlState.DEFAULT_PATH,
+                        help=f"Crawl state file used to resume (default: {CrawlState.DEFAULT_PATH})")
+    parser.add_argument('--api-url', help="fide-api base URL (default: public hosted API)")
+    parser.add_argument('--workers', type=int, default=4,
+                        help="Profiles fetched concurrently (default: 4)")
+    parser.add_argument('--rps', type=float, default=2.0,
+                        help="Maximum requests per second to the API (default: 2.0)")
+    parser.add_argument('--flush-every', type=int, default=500,
+                        help="Players written to the store per batch (default: 500)")
+    parser.add_argument('--restart', action='store_true',
+                        help="Ignore saved progress and start the crawl over")
+    parser.add_argument('--retry-failed', action='store_true',
+                        help="Only retry the players that failed in earlier runs")
+    parser.add_argument('--archive', metavar='DIR',
+                        help="Keep every API response in this archive directory (see fide_archive.py)")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    top = commands.add_parser('top', help="Crawl the API top list")
+    top.add_argument('--limit', type=int, help="Number of players (default: the whole list)")
+    top.add_argument('--page-size', type=int, default=100,
+                     help="Players requested per page (default: 100)")
+
+    federation = commands.add_parser('federation', help="Crawl every stored player of a federation")
+    federation.add_argument('federation', help="Federation code as in the rating lists, e.g. IND")
+    args = parser.parse_args()
+
+    store = PlayerStore(args.db)
+    state = CrawlState(args.state)
+    archive = ResponseArchive(args.archive) if args.archive else None
+    api = FIDEAPIExtractor(api_url=args.api_url, requests_per_second=args.rps, archive=archive)
+    # Progress is printed per batch; only errors are reported per player
+    api.events.subscribe(ConsoleReporter(), kinds=[FAILED])
+
+    job = "top" if args.command == 'top' else f"federation:{args.federation}"
+    if args.restart:
+        state.reset(job)
+    progress = state.get(job)
+
+    if args.retry_failed:
+        ids = [(progress['cursor'], fide_id) for fide_id in progress['failed']]
+        print(f"Retrying {len(ids)} failed player(s) of {job}")
+    elif args.command == 'top':
+        start = 0 if progress['cursor'] is None else progress['cursor'] + 1
+        ids = iter_top_ids(api, start=start, limit=args.limit, page_size=args.page_size)
+        print(f"Crawling the top list from position {start + 1}")
+    else:
+        total = store.count(args.federation)
+        if not total:
+            print(f"Error: no players of federation '{args.federation}' in {args.db} "
+                  f"(import a rating list first, see fide_rating_lists.py)")
+            sys.exit(1)
+        ids = iter_federation_ids(store, args.federation, after=progress['cursor'])
+        print(f"Crawling {total} player(s) of {args.federation}"
+              + (f", resuming after FIDE ID {progress['cursor']}" if progress['cursor'] else ""))
+
+    # Let kill / service stops save progress like Ctrl+C does
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    try:
+        progress = crawl(api, ids, store, state, job, workers=args.workers,
+                         flush_every=args.flush_every)
+    except KeyboardInterrupt:
+        print("\nInterrupted; progress saved. Run the same command again to resume.")
+        sys.exit(1)
+
+    counts = api.stats.as_dict()
+    print(f"\n✓ {job}: {progress['stored']} player(s) stored, {len(progress['failed'])} failed "
+          f"({counts.get('requests', 0)} requests this run)")
+    if progress['failed']:
+        print("  Retry the failures with --retry-failed")
+
+
+if __name__ == "__main__":
+    main()
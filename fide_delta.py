@@ -0,0 +1,133 @@
+"""
+Incremental rating-change detection between two extraction runs
+
+A snapshot of the last run's players is kept on disk. The next run is
+compared with it in one vectorized pass (an index alignment plus column-wise
+comparisons, no per-player Python loop), and only players whose ratings,
+title or federation changed, or who are new, are exported.
+"""
+
+import os
+from typing import Dict, Iterable, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from fide_export import export_players
+from fide_player import Player, as_player
+
+
+PLAYER_COLUMNS = ['FIDE ID', 'Name', 'Federation', 'Title', 'B-Year', 'Age',
+                  'Rating std', 'Rating rapid', 'Rating blitz']
+
+RATING_COLUMNS = ['Rating std', 'Rating rapid', 'Rating blitz']
+
+DELTA_COLUMNS = ['Change', 'Rating std change', 'Rating rapid change', 'Rating blitz change',
+                 'Previous title', 'Previous federation']
+
+
+def players_to_frame(players: Iterable[Union[Player, Dict]]) -> pd.DataFrame:
+    """Build a string DataFrame ('N/A' for missing values) of players, one row per FIDE ID"""
+    rows = [as_player(player).to_dict() for player in players]
+    df = pd.DataFrame(rows, columns=PLAYER_COLUMNS, dtype=str).fillna('N/A')
+    return df.drop_duplicates('FIDE ID', keep='last').reset_index(drop=True)
+
+
+def load_snapshot(path: str) -> pd.DataFrame:
+    """Load the previous run's players, or an empty frame if there is none yet"""
+    if not os.path.exists(path):
+        return players_to_frame([])
+    df = pd.read_csv(path, dtype=str, keep_default_na=False)
+    return df.reindex(columns=PLAYER_COLUMNS, fill_value='N/A')
+
+
+def save_snapshot(previous: pd.DataFrame, current: pd.DataFrame, path: str):
+    """
+    Write the new snapshot
+
+    Players missing from the current run (e.g. a failed fetch) keep their
+    previous row, so they are not reported as changed next time.
+    """
+    kept = previous[~previous['FIDE ID'].isin(current['FIDE ID'])]
+    snapshot = pd.concat([current, kept], ignore_index=True)
+    tmp_path = f"{path}.tmp"
+    snapshot.to_csv(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+
+def _ratings(column: pd.Series) -> np.ndarray:
+    """Ratings as floats, NaN for unrated ('N/A') players"""
+    return column.where(column.str.isdigit()).astype(float).to_numpy()
+
+
+def compute_deltas(previous: pd.DataFrame, current: pd.DataFrame) -> pd.DataFrame:
+    """
+    Compare two runs and return only new or changed players
+
+    Returns:
+        The current rows of changed players with DELTA_COLUMNS added:
+        'Change' is 'new' or 'updated', rating changes are numeric (empty
+        when either side is unrated) and the previous title and federation
+        are filled in only when they changed.
+    """
+    # Align the previous rows to the current ones by FIDE ID
+    before_rows = previous.drop_duplicates('FIDE ID', keep='last').set_index('FIDE ID')
+    before_rows = before_rows.reindex(current['FIDE ID'])
+    is_new = before_rows['Name'].isna().to_numpy()
+
+    deltas = current.copy()
+    changed = is_new.copy()
+    for column in RATING_COLUMNS:
+        now = _ratings(current[column])
+        before = _ratings(before_rows[column])
+        deltas[f'{column} change'] = now - before
+        # Rated <-> unrated also counts as a change
+        changed |= (now != before) & ~(np.isnan(now) & np.isnan(before))
+
+    for column, label in (('Title', 'Previous title'), ('Federation', 'Previous federation')):
+        old = before_rows[column].to_numpy()
+        differs = (current[column].to_numpy() != old) & ~is_new
+        deltas[label] = np.where(differs, old, '')
+        changed |= differs
+
+    deltas['Change'] = np.where(is_new, 'new', 'updated')
+    return deltas.loc[changed, PLAYER_COLUMNS + DELTA_COLUMNS].reset_index(drop=True)
+
+
+def export_deltas(deltas: pd.DataFrame, filename: str):
+    """Export changed players (any format supported by fide_export)"""
+    if deltas.empty:
+        print("No rating changes since the last snapshot.")
+        return
+
+    df = deltas.astype({f'{column} change': 'Int64' for column in RATING_COLUMNS}).astype(object)
+    export_players(df.where(df.notna(), None).to_dict('records'), filename)
+    print(f"\n✓ Changes exported successfully to {filename}")
+    print(f"  New players: {(deltas['Change'] == 'new').sum()}")
+    print(f"  Updated players: {(deltas['Change'] == 'updated').sum()}")
+
+
+def extract_changes(extractor, identifiers: Iterable[str], snapshot_file: str,
+                    filename: Optional[str] = None) -> pd.DataFrame:
+    """
+    Incremental mode of extract_multiple_players
+
+    Extracts the players, compares them with the snapshot from the last
+    run, updates the snapshot and optionally exports only the changes.
+
+    Args:
+        extractor: FIDEDataExtractor or FIDEAPIExtractor
+        identifiers: FIDE IDs or names
+        snapshot_file: CSV snapshot of the previous run (created if missing)
+        filename: Excel file for the changed players
+
+    Returns:
+        DataFrame of changed players (see compute_deltas)
+    """
+    current = players_to_frame(extractor.extract_multiple_players(identifiers))
+    previous = load_snapshot(snapshot_file)
+    deltas = compute_deltas(previous, current)
+    save_snapshot(previous, current, snapshot_file)
+    if filename:
+        export_deltas(deltas, filename)
+    return deltas
@@ -0,0 +1,186 @@
+"""
+Progress events of extraction runs
+
+The extractors report what happens to each identifier as events instead
+of printing: callers subscribe to the kinds they care about and render
+them however they like. With no subscribers an event costs one dict
+lookup, so quiet runs pay nothing for it.
+
+    extractor = FIDEDataExtractor()
+    extractor.events.subscribe(ConsoleReporter())          # the classic per-player lines
+    extractor.events.subscribe(on_failure, kinds=[FAILED]) # or just the failures
+
+Kinds, in the order an identifier goes through them:
+    started    work on an identifier began
+    resolved   a name was matched to a FIDE ID (message set when the match is uncertain)
+    fetched    player data obtained; source is 'network', 'cache', 'revalidated' or 'store'
+    parsed     a downloaded profile was parsed
+    failed     a stage failed; stage is 'input', 'search', 'fetch' or 'parse'
+               ('history' and 'top' for rating-history and top-list requests)
+    finished   the identifier's result is ready (player is None when it failed)
+
+fetched, parsed and finished carry their duration in seconds; finished
+counts from when the identifier was taken from the input.
+"""
+
+import threading
+import time
+from typing import Callable, Iterable, NamedTuple, Optional, TextIO
+
+from fide_player import Player
+
+
+STARTED = 'started'
+RESOLVED = 'resolved'
+FETCHED = 'fetched'
+PARSED = 'parsed'
+FAILED = 'failed'
+FINISHED = 'finished'
+
+KINDS = (STARTED, RESOLVED, FETCHED, PARSED, FAILED, FINISHED)
+
+
+class ExtractionEvent(NamedTuple):
+    """Something that happened to one identifier"""
+    kind: str
+    identifier: str
+    fide_id: Optional[str] = None
+    seconds: Optional[float] = None
+    player: Optional[Player] = None
+    source: Optional[str] = None
+    stage: Optional[str] = None
+    message: Optional[str] = None
+
+
+class EventHooks:
+    """
+    Subscribers of an extractor's events
+
+    Callbacks run on the thread that emitted the event (often a worker
+    thread), so they should be quick and thread-safe; a GUI should hand
+    events to its main loop, e.g. through a queue.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # kind -> tuple of callbacks, replaced (never mutated) on changes
+        self._subscribers = {}
+
+    def subscribe(self, callback: Callable[[ExtractionEvent], None],
+                  kinds: Optional[Iterable[str]] = None):
+        """
+        Call callback with every event of the given kinds
+
+        Args:
+            callback: Function taking an ExtractionEvent
+            kinds: Event kinds to receive (default: the callback's own
+                   kinds attribute if it has one, else all kinds)
+        """
+        if kinds is None:
+            kinds = getattr(callback, 'kinds', KINDS)
+        with self._lock:
+            for kind in kinds:
+                if kind not in KINDS:
+                    raise ValueError(f"Unknown event kind '{kind}' (expected one of {', '.join(KINDS)})")
+                self._subscribers[kind] = self._subscribers.get(kind, ()) + (callback,)
+
+    def unsubscribe(self, callback: Callable[[ExtractionEvent], None]):
+        """Stop calling callback"""
+        with self._lock:
+            self._subscribers = {kind: tuple(c for c in callbacks if c != callback)
+                                 for kind, callbacks in self._subscribers.items()}
+
+    def wants(self, kind: str) -> bool:
+        """Whether anyone listens to a kind of event"""
+        return bool(self._subscribers.get(kind))
+
+    def emit(self, kind: str, identifier: str, **fields):
+        """Send an event to the subscribers of its kind"""
+        callbacks = self._subscribers.get(kind)
+        if not callbacks:
+            return
+        event = ExtractionEvent(kind, identifier, **fields)
+        for callback in callbacks:
+            callback(event)
+
+
+class ConsoleReporter:
+    """
+    Renders events as text for the command line
+
+    In the default mode every identifier gets a line as it starts, and
+    errors and uncertain name matches are printed as they happen. With an
+    interval, only per-player failures and a progress line are printed, the
+    latter at most once per interval, which keeps large batches from being
+    slowed down by terminal output. The closing progress line is printed
+    when the last of `total` identifiers finishes, or by close().
+
+    Args:
+        interval: Seconds between progress lines (None prints every identifier)
+        total: Number of identifiers in the run, shown in progress lines
+        stream: Where to write (default: stdout)
+    """
+
+    def __init__(self, interval: Optional[float] = None, total: Optional[int] = None,
+                 stream: Optional[TextIO] = None):
+        self.interval = interval
+        self.total = total
+        self.stream = stream
+        self.done = 0
+        self.failed = 0
+        self._started = time.monotonic()
+        self._last = self._started
+        self._closed = False
+        self._lock = threading.Lock()
+        self.kinds = (FINISHED, FAILED) if interval else (STARTED, RESOLVED, FAILED)
+
+    def __call__(self, event: ExtractionEvent):
+        if event.kind == FINISHED:
+            self._progress(event)
+        elif event.kind == STARTED:
+            if event.identifier.isdigit():
+                self._print(f"Fetching FIDE ID: {event.identifier}")
+            else:
+                self._print(f"Searching for name: {event.identifier}")
+        elif event.message and event.kind in (RESOLVED, FAILED):
+            self._print(f"  {event.message}" if event.kind == RESOLVED else event.message)
+
+    def _progress(self, event: ExtractionEvent):
+        """Count a finished identifier and print a progress line when one is due"""
+        with self._lock:
+            self.done += 1
+            if event.player is None:
+                self.failed += 1
+            now = time.monotonic()
+            last = bool(self.total) and self.done >= self.total
+            if last:
+                self._closed = True
+            elif now - self._last < self.interval:
+                return
+            self._last = now
+            done, failed = self.done, self.failed
+
+        self._print_progress(done, failed, now, last)
+
+    def close(self):
+        """Print the closing progress line, unless the last identifier already did"""
+        with self._lock:
+            if self._closed or not self.interval:
+                return
+            self._closed = True
+            done, failed = self.done, self.failed
+        self._print_progress(done, failed, time.monotonic(), True)
+
+    def _print_progress(self, done: int, failed: int, now: float, last: bool):
+        elapsed = max(now - self._started, 1e-9)
+        total = f"/{self.total}" if self.total else ""
+        rate = f"{done / elapsed:.1f} players/s"
+        if last:
+            rate = f"{elapsed:.1f}s, {rate}"
+        prefix = "Finished: " if last else "  "
+        self._print(f"{prefix}{done}{total} processed, {failed} failed ({rate})")
+
+    def _print(self, text: str):
+        # Worker threads report concurrently; one write per line keeps lines whole
+        with self._lock:
+            print(text, file=self.stream)
@@ -0,0 +1,295 @@
+"""
+Streaming export of player records
+
+Writers take one player at a time and keep memory flat however many rows
+are written: Excel through openpyxl's write-only mode (or xlsxwriter's
+constant-memory mode when installed), CSV, JSON and JSON Lines with the
+standard library, and Parquet / Feather (Arrow IPC) in record batches
+through pyarrow (requires: pip install pyarrow). 'N/A' placeholders are
+written as empty cells.
+
+    with open_writer("players.xlsx") as writer:
+        for player in players:
+            writer.write(player)
+"""
+
+import csv
+import json
+import os
+from typing import Dict, Iterable, List, Optional, Union
+
+from fide_player import Player
+
+
+# Preferred column order; other fields follow in the order of the first row
+COLUMN_ORDER = ['FIDE ID', 'Name', 'Federation', 'Title', 'B-Year', 'Age',
+                'Rating std', 'Rating rapid', 'Rating blitz', 'World Rank']
+
+FORMATS = {
+    '.xlsx': 'xlsx',
+    '.csv': 'csv',
+    '.json': 'json',
+    '.jsonl': 'jsonl',
+    '.parquet': 'parquet',
+    '.feather': 'feather',
+    '.arrow': 'feather',
+}
+
+
+def detect_format(filename: str) -> str:
+    """Pick the export format from a file extension"""
+    extension = os.path.splitext(filename)[1].lower()
+    if extension not in FORMATS:
+        raise ValueError(f"Unsupported export file type '{extension}' "
+                         f"(choose from: {', '.join(FORMATS)})")
+    return FORMATS[extension]
+
+
+def clean_value(value):
+    """Export value of a field: 'N/A' placeholders become empty"""
+    return None if value == 'N/A' else value
+
+
+def order_columns(fields: Iterable[str]) -> List[str]:
+    """COLUMN_ORDER columns present in fields, then any other fields"""
+    fields = list(fields)
+    return ([column for column in COLUMN_ORDER if column in fields]
+            + [field for field in fields if field not in COLUMN_ORDER])
+
+
+class PlayerWriter:
+    """
+    Base class of the streaming writers
+
+    The file is opened on the first row, whose fields fix the columns
+    unless columns are given, so an empty export creates no file.
+    """
+
+    def __init__(self, filename: str, columns: Optional[List[str]] = None):
+        """
+        Initialize the writer
+
+        Args:
+            filename: Output file
+            columns: Columns to write (default: taken from the first row)
+        """
+        self.filename = filename
+        self.columns = columns
+        self.count = 0
+        self._opened = False
+
+    def write(self, player: Union[Player, Dict]):
+        """Append one player (a Player or a player dict)"""
+        if isinstance(player, Player):
+            player = player.to_record()
+        if not self._opened:
+            if self.columns is None:
+                self.columns = order_columns(player)
+            self._open()
+            self._opened = True
+        self._write_row([clean_value(player.get(column)) for column in self.columns])
+        self.count += 1
+
+    def write_all(self, players: Iterable[Union[Player, Dict]]) -> int:
+        """Append players as they arrive; returns the number written"""
+        for player in players:
+            self.write(player)
+        return self.count
+
+    def close(self):
+        """Finish the file"""
+        if self._opened:
+            self._close()
+            self._opened = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _open(self):
+        raise NotImplementedError
+
+    def _write_row(self, row: list):
+        raise NotImplementedError
+
+    def _close(self):
+        raise NotImplementedError
+
+
+class ExcelWriter(PlayerWriter):
+    """Constant-memory .xlsx writer"""
+
+    def _open(self):
+        try:
+            import xlsxwriter
+        except ImportError:
+            xlsxwriter = None
+
+        if xlsxwriter:
+            self._workbook = xlsxwriter.Workbook(self.filename, {'constant_memory': True})
+            self._sheet = self._workbook.add_worksheet()
+            self._row = 0
+            self._write_row(self.columns)
+            return
+
+        from openpyxl import Workbook
+        self._workbook = Workbook(write_only=True)
+        self._sheet = self._workbook.create_sheet()
+        self._sheet.append(self.columns)
+        self._row = None
+
+    def _write_row(self, row: list):
+        if self._row is None:
+            self._sheet.append(row)
+            return
+        self._sheet.write_row(self._row, 0, row)
+        self._row += 1
+
+    def _close(self):
+        if self._row is None:
+            self._workbook.save(self.filename)
+        else:
+            self._workbook.close()
+
+
+class CSVWriter(PlayerWriter):
+    """Streaming CSV writer"""
+
+    def _open(self):
+        self._file = open(self.filename, 'w', newline='', encoding='utf-8')
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(self.columns)
+
+    def _write_row(self, row: list):
+        self._writer.writerow(['' if value is None else value for value in row])
+
+    def _close(self):
+        self._file.close()
+
+
+class JSONWriter(PlayerWriter):
+    """Streaming writer of a JSON array, laid out like json.dump(indent=2)"""
+
+    def _open(self):
+        self._file = open(self.filename, 'w', encoding='utf-8')
+        self._file.write('[')
+
+    def _write_row(self, row: list):
+        record = {column: '' if value is None else value for column, value in zip(self.columns, row)}
+        text = json.dumps(record, indent=2, ensure_ascii=False).replace('\n', '\n  ')
+        self._file.write(('\n  ' if not self.count else ',\n  ') + text)
+
+    def _close(self):
+        self._file.write('\n]' if self.count else ']')
+        self._file.close()
+
+
+class JSONLinesWriter(PlayerWriter):
+    """One JSON object per line"""
+
+    def _open(self):
+        self._file = open(self.filename, 'w', encoding='utf-8')
+
+    def _write_row(self, row: list):
+        self._file.write(json.dumps(dict(zip(self.columns, row)), ensure_ascii=False) + '\n')
+
+    def _close(self):
+        self._file.close()
+
+
+class ArrowWriter(PlayerWriter):
+    """Parquet or Feather (Arrow IPC) writer that buffers one record batch at a time"""
+
+    def __init__(self, filename: str, columns: Optional[List[str]] = None,
+                 fmt: str = 'parquet', batch_size: int = 10_000):
+        """
+        Initialize the writer
+
+        Args:
+            filename: Output file
+            columns: Columns to write (default: taken from the first row)
+            fmt: 'parquet' or 'feather'
+            batch_size: Rows buffered per record batch
+        """
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise ImportError(f"{fmt.capitalize()} export requires pyarrow: pip install pyarrow")
+
+        super().__init__(filename, columns)
+        self.fmt = fmt
+        self.batch_size = batch_size
+        self._batch = []
+        self._writer = None
+
+    def _open(self):
+        pass
+
+    def _write_row(self, row: list):
+        self._batch.append(row)
+        if len(self._batch) >= self.batch_size:
+            self._flush()
+
+    def _flush(self):
+        """Write the buffered rows as one record batch"""
+        import pyarrow as pa
+
+        table = pa.Table.from_pylist([dict(zip(self.columns, row)) for row in self._batch])
+        self._batch = []
+
+        if self._writer is None:
+            # Columns that are empty in the first batch are typed as strings
+            self._schema = pa.schema([pa.field(field.name, pa.string()) if pa.types.is_null(field.type)
+                                      else field for field in table.schema])
+            if self.fmt == 'parquet':
+                import pyarrow.parquet as pq
+                self._writer = pq.ParquetWriter(self.filename, self._schema)
+            else:
+                # Feather v2 is the Arrow IPC file format
+                self._writer = pa.ipc.new_file(self.filename, self._schema)
+
+        self._writer.write_table(table.cast(self._schema))
+
+    def _close(self):
+        if self._batch:
+            self._flush()
+        self._writer.close()
+
+
+def open_writer(filename: str, fmt: Optional[str] = None,
+                columns: Optional[List[str]] = None) -> PlayerWriter:
+    """
+    Create a streaming writer
+
+    Args:
+        filename: Output file
+        fmt: 'xlsx', 'csv', 'json', 'jsonl', 'parquet' or 'feather'
+             (default: from the file extension)
+        columns: Columns to write (default: taken from the first row)
+    """
+    fmt = fmt or detect_format(filename)
+    if fmt in ('parquet', 'feather'):
+        return ArrowWriter(filename, columns, fmt=fmt)
+    writers = {
+        'xlsx': ExcelWriter,
+        'csv': CSVWriter,
+        'json': JSONWriter,
+        'jsonl': JSONLinesWriter,
+    }
+    if fmt not in writers:
+        raise ValueError(f"Unknown export format '{fmt}'")
+    return writers[fmt](filename, columns)
+
+
+def export_players(players: Iterable[Union[Player, Dict]], filename: str, fmt: Optional[str] = None,
+                   columns: Optional[List[str]] = None) -> int:
+    """
+    Stream players to a file, writing each row as it arrives
+
+    Returns:
+        Number of players written (no file is created for zero)
+    """
+    with open_writer(filename, fmt, columns) as writer:
+        return writer.write_all(players)
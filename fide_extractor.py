@@ -1,169 +1,330 @@
 import requests
-from bs4 import BeautifulSoup
-import pandas as pd
-from typing import List, Dict, Optional
-import re
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Iterable, Iterator, List, Dict, NamedTuple, Optional, Tuple, Union
+import hashlib
+import threading
 import time
 
+from fide_archive import ResponseArchive
+from fide_cache import ProfileCache
+from fide_coalesce import Coalescer
+from fide_events import (FAILED, FETCHED, FINISHED, PARSED, RESOLVED, STARTED,
+                         ConsoleReporter, EventHooks)
+from fide_export import export_players
+from fide_metrics import RunMetrics, TimedHTTPAdapter
+from fide_name_resolver import NameResolver, Resolution
+from fide_parsers import abbreviate_title, get_parser
+from fide_player import Player
+from fide_rate_limiter import RateController
+from fide_store import PlayerStore
+
+
+class RawProfile(NamedTuple):
+    """A downloaded profile page waiting to be parsed"""
+    fide_id: str
+    html: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    content_hash: str
+
+
+def _timed_parse(parse, html: str, fide_id: str) -> Tuple[Optional[Player], float]:
+    """Run a parser in a worker process and return its result with the time it took"""
+    start = time.perf_counter()
+    player_data = parse(html, fide_id)
+    return player_data, time.perf_counter() - start
+
+
+class RunControl:
+    """
+    Pause and cancel switch for iter_multiple_players, usable from any thread
+
+    Workers check it before each identifier: while paused they wait, and
+    once cancelled they skip the rest and queued work is dropped.
+    """
+    
+    def __init__(self):
+        self._cancelled = threading.Event()
+        self._running = threading.Event()
+        self._running.set()
+    
+    def pause(self):
+        """Hold workers before their next identifier"""
+        if not self._cancelled.is_set():
+            self._running.clear()
+    
+    def resume(self):
+        """Let paused workers continue"""
+        self._running.set()
+    
+    def cancel(self):
+        """Stop the run; also releases paused workers"""
+        self._cancelled.set()
+        self._running.set()
+    
+    @property
+    def paused(self) -> bool:
+        return not self._running.is_set()
+    
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+    
+    def wait(self) -> bool:
+        """Block while paused; returns False if the run was cancelled"""
+        self._running.wait()
+        return not self._cancelled.is_set()
+
 
 class FIDEDataExtractor:
     """Extract FIDE player data and export to Excel"""
     
     BASE_URL = "https://ratings.fide.com"
     SEARCH_URL = f"{BASE_URL}/profile"
+    HISTORY_URL = f"{BASE_URL}/a_chart_data.phtml"
     
-    def __init__(self):
+    CACHE_SOURCE = "profile"
+    
+    # Minimum local name-index score accepted without asking search.php
+    LOCAL_MATCH_SCORE = 0.85
+    
+    # Name matches below this confidence are reported as uncertain
+    LOW_CONFIDENCE = 0.6
+    
+    # Identifiers whose names are resolved together before they are fetched
+    RESOLVE_BATCH = 100
+    
+    def __init__(self, max_workers: int = 1, requests_per_second: float = 1.0,
+                 cache: Optional[ProfileCache] = None, refresh: bool = False,
+                 parser: str = 'bs4', store: Optional[PlayerStore] = None,
+                 max_retries: int = 3, parse_workers: int = 0,
+                 archive: Optional[ResponseArchive] = None):
+        """
+        Initialize the extractor
+        
+        Args:
+            max_workers: Number of identifiers fetched concurrently
+            requests_per_second: Global request budget shared by all workers; the
+                                 rate backs off automatically when FIDE throttles
+            cache: Optional persistent profile cache
+            refresh: Ignore cached profiles and re-download them (the cache is still updated)
+            parser: Profile parser backend, 'bs4' or 'lxml' (see fide_parsers)
+            store: Optional local player store (see fide_rating_lists) that
+                   answers ID lookups before the cache or network
+            max_retries: Retries for throttled, failed or timed-out requests
+            parse_workers: Processes that parse downloaded pages in batch runs,
+                           so parsing is not limited to one core by the GIL
+                           (0 parses in the fetching threads)
+            archive: Optional raw response archive (see fide_archive) that keeps
+                     every downloaded page for offline re-parsing
+        """
+        self.max_workers = max(1, max_workers)
+        self.parse_workers = max(0, parse_workers)
+        self.rate_controller = RateController(requests_per_second, max_retries=max_retries)
+        self.cache = cache
+        self.refresh = refresh
+        self.store = store
+        self.archive = archive
+        self.parser = parser
+        self.parse_player_page = get_parser(parser)
+        self.name_resolver = NameResolver(store=store, extractor=self)
+        
+        # Players fetched in the current run, shared by repeated identifiers
+        self.coalescer = Coalescer()
+        
+        # Progress of each identifier; nothing is printed unless someone subscribes
+        self.events = EventHooks()
+        
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
+        
+        # One pooled connection per worker so threads don't queue on the pool
+        adapter = TimedHTTPAdapter(self.stats, pool_connections=1, pool_maxsize=self.max_workers)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
     
-    def get_player_by_id(self, fide_id: str) -> Optional[Dict]:
-        """Get player data by FIDE ID"""
+    @property
+    def stats(self) -> RunMetrics:
+        """Request counts and stage timings of the current run (see fide_metrics)"""
+        return self.rate_controller.stats
+    
+    def _get(self, url: str, **kwargs) -> requests.Response:
+        """Send a GET request within the rate limit, retrying transient failures"""
+        return self.rate_controller.request(self.session, url, **kwargs)
+    
+    def get_player_by_id(self, fide_id: str) -> Optional[Player]:
+        """
+        Get player data by FIDE ID as a Player (see fide_player)
+        
+        Players in the local store are returned without a request. Stale
+        cache entries are revalidated with a conditional request; a 304 or an
+        unchanged page reuses the cached data without re-parsing.
+        """
+        player_data, page = self._fetch_player(fide_id)
+        if page is None:
+            return player_data
+        return self._store_parsed(page, self._parse_player_page(page.html, fide_id))
+    
+    def _fetch_player(self, fide_id: str) -> Tuple[Optional[Player], Optional[RawProfile]]:
+        """
+        Network stage of get_player_by_id
+        
+        Returns (player data, None) when the store or cache answers, or
+        (None, page) when a downloaded page still has to be parsed.
+        """
+        start = time.perf_counter()
+        if self.store and not self.refresh:
+            stored = self.store.get_player(fide_id)
+            if stored:
+                self.stats.add('store_hits')
+                return self._fetched(fide_id, 'store', start, stored), None
+        
+        entry = self.cache.get_entry(self.CACHE_SOURCE, fide_id) if self.cache else None
+        if entry and not self.refresh and self.cache.is_fresh(entry):
+            self.stats.add('cache_hits')
+            return self._fetched(fide_id, 'cache', start, entry.data), None
+        
         try:
             url = f"{self.SEARCH_URL}/{fide_id}"
-            response = self.session.get(url, timeout=10)
+            headers = {}
+            if entry and not self.refresh:
+                if entry.etag:
+                    headers['If-None-Match'] = entry.etag
+                if entry.last_modified:
+                    headers['If-Modified-Since'] = entry.last_modified
+            
+            response = self._get(url, headers=headers)
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+            
+            if response.status_code == 304 and entry:
+                self.cache.revalidate(self.CACHE_SOURCE, fide_id, etag, last_modified)
+                self.stats.add('cache_revalidated')
+                return self._fetched(fide_id, 'revalidated', start, entry.data), None
             response.raise_for_status()
+            if self.archive is not None:
+                self.archive.add(self.CACHE_SOURCE, fide_id, response)
+            
+            content_hash = hashlib.sha256(response.content).hexdigest()
+            if entry and entry.content_hash == content_hash:
+                self.cache.revalidate(self.CACHE_SOURCE, fide_id, etag, last_modified)
+                self.stats.add('cache_revalidated')
+                return self._fetched(fide_id, 'revalidated', start, entry.data), None
             
-            return self._parse_player_page(response.text, fide_id)
+            if self.cache:
+                self.stats.add('cache_misses')
+            self._fetched(fide_id, 'network', start)
+            return None, RawProfile(fide_id, response.text, etag, last_modified, content_hash)
         except Exception as e:
-            print(f"Error fetching FIDE ID {fide_id}: {str(e)}")
+            self.events.emit(FAILED, fide_id, fide_id=fide_id, stage='fetch',
+                             message=f"Error fetching FIDE ID {fide_id}: {str(e)}")
+            return None, None
+    
+    def _fetched(self, fide_id: str, source: str, start: float,
+                 player_data: Optional[Player] = None) -> Optional[Player]:
+        """Report where a player's data came from and how long it took"""
+        self.events.emit(FETCHED, fide_id, fide_id=fide_id, source=source,
+                         seconds=time.perf_counter() - start, player=player_data)
+        return player_data
+    
+    def _store_parsed(self, page: RawProfile, player_data: Optional[Player]) -> Optional[Player]:
+        """Cache a freshly parsed profile with its validators"""
+        if player_data and self.cache:
+            self.cache.put(self.CACHE_SOURCE, page.fide_id, player_data,
+                           etag=page.etag, last_modified=page.last_modified,
+                           content_hash=page.content_hash)
+        return player_data
+    
+    def get_rating_history(self, fide_id: str) -> Optional[List[Dict]]:
+        """
+        Get the monthly rating history behind a profile's rating chart
+        
+        Returns:
+            One dict per month with 'month' (YYYYMM) and 'std', 'rapid' and
+            'blitz' ratings (0 when unrated), or None on error
+        """
+        # fide_history brings in pandas, which ordinary lookups never need
+        from fide_history import parse_rating_history
+        
+        try:
+            response = self._get(self.HISTORY_URL, params={'event': fide_id, 'period': 0})
+            response.raise_for_status()
+            if self.archive is not None:
+                self.archive.add('history', fide_id, response)
+            return parse_rating_history(response.json())
+        except Exception as e:
+            self.events.emit(FAILED, fide_id, fide_id=fide_id, stage='history',
+                             message=f"Error fetching rating history for FIDE ID {fide_id}: {str(e)}")
             return None
     
-    def search_player_by_name(self, name: str) -> List[Dict]:
-        """Search players by name"""
+    def search_player_by_name(self, name: str, local: bool = True) -> List[Dict]:
+        """
+        Search players by name
+        
+        Confident matches in the local player store are returned without a
+        request; otherwise FIDE's search.php is queried.
+        
+        Args:
+            name: Name to search for
+            local: Try the local player store first (False always asks FIDE)
+        """
+        if self.store and local:
+            matches = [match for match in self.store.search_by_name(name)
+                       if match['score'] >= self.LOCAL_MATCH_SCORE]
+            if matches:
+                return [{
+                    'FIDE ID': str(match['fide_id']),
+                    'Name': match['name'],
+                    'Federation': match['federation']
+                } for match in matches]
+        
         try:
             search_url = f"{self.BASE_URL}/search.php"
             params = {
                 'search': name
             }
-            response = self.session.get(search_url, params=params, timeout=10)
+            response = self._get(search_url, params=params)
             response.raise_for_status()
+            if self.archive is not None:
+                self.archive.add('search', name, response)
             
-            return self._parse_search_results(response.text)
+            return self._parse_search_results(response.text, name)
         except Exception as e:
-            print(f"Error searching for name '{name}': {str(e)}")
+            self.events.emit(FAILED, name, stage='search',
+                             message=f"Error searching for name '{name}': {str(e)}")
             return []
     
-    def _parse_player_page(self, html: str, fide_id: str) -> Optional[Dict]:
-        """Parse player profile page"""
-        soup = BeautifulSoup(html, 'html.parser')
-        
+    def _parse_player_page(self, html: str, fide_id: str) -> Optional[Player]:
+        """Parse player profile page with the configured parser backend"""
+        start = time.perf_counter()
         try:
-            # Extract player name from title or profile-title-container
-            name = "N/A"
-            title_tag = soup.find('title')
-            if title_tag:
-                # Title format: "Last, First FIDE Profile"
-                name_text = title_tag.text.replace(' FIDE Profile', '').strip()
-                if name_text:
-                    name = name_text
-            
-            # If not in title, try profile-title-container
-            if name == "N/A":
-                name_elem = soup.find('div', class_='profile-title-container')
-                if name_elem:
-                    name = name_elem.text.strip()
-            
-            # Initialize data structure
-            data = {
-                'FIDE ID': fide_id,
-                'Name': name,
-                'Federation': 'N/A',
-                'B-Year': 'N/A',
-                'Age': 'N/A',
-                'Rating std': 'N/A',
-                'Rating rapid': 'N/A',
-                'Rating blitz': 'N/A',
-                'Title': 'N/A'
-            }
-            
-            # Extract ratings from profile-game divs
-            std_game = soup.find('div', class_='profile-standart')
-            if std_game:
-                rating_text = std_game.text.strip()
-                # Extract numbers from text like "1525STANDARD inactive"
-                rating_match = re.search(r'(\d+)', rating_text)
-                if rating_match:
-                    data['Rating std'] = rating_match.group(1)
-            
-            rapid_game = soup.find('div', class_='profile-rapid')
-            if rapid_game:
-                rating_text = rapid_game.text.strip()
-                rating_match = re.search(r'(\d+)', rating_text)
-                if rating_match:
-                    data['Rating rapid'] = rating_match.group(1)
-            
-            blitz_game = soup.find('div', class_='profile-blitz')
-            if blitz_game:
-                rating_text = blitz_game.text.strip()
-                rating_match = re.search(r'(\d+)', rating_text)
-                if rating_match:
-                    data['Rating blitz'] = rating_match.group(1)
-            
-            # Extract country from profile-info-country
-            country_elem = soup.find('div', class_='profile-info-country')
-            if country_elem:
-                country = country_elem.text.strip()
-                if country:
-                    data['Federation'] = country
-            
-            # Extract birth year and title from profile-info-row divs
-            info_rows = soup.find_all('div', class_='profile-info-row')
-            for row in info_rows:
-                text = row.text.strip()
-                if 'B-Year' in text:
-                    # Extract the year
-                    year_match = re.search(r'(\d{4})', text)
-                    if year_match:
-                        data['B-Year'] = year_match.group(1)
-                elif 'FIDE title' in text:
-                    # Extract title
-                    title_div = row.find('div', class_='profile-info-title')
-                    if title_div:
-                        title = title_div.text.strip()
-                        if title and title.lower() != 'none':
-                            # Abbreviate titles
-                            title = self._abbreviate_title(title)
-                            data['Title'] = title
-            
-            # Calculate age
-            if data['B-Year'] != 'N/A':
-                try:
-                    birth_year = int(data['B-Year'])
-                    data['Age'] = str(2025 - birth_year)
-                except:
-                    data['Age'] = 'N/A'
-            else:
-                data['Age'] = 'N/A'
-            
-            return data
-            
+            player_data = self.parse_player_page(html, fide_id)
         except Exception as e:
-            print(f"Error parsing player page: {str(e)}")
+            self._parse_failed(fide_id, e)
             return None
+        return self._parsed(fide_id, time.perf_counter() - start, player_data)
+    
+    def _parsed(self, fide_id: str, seconds: float, player_data: Optional[Player]) -> Optional[Player]:
+        """Record a parse time"""
+        self.stats.observe('parse', seconds)
+        self.events.emit(PARSED, fide_id, fide_id=fide_id, seconds=seconds, player=player_data)
+        return player_data
+    
+    def _parse_failed(self, fide_id: str, error: Exception):
+        self.events.emit(FAILED, fide_id, fide_id=fide_id, stage='parse',
+                         message=f"Error parsing player page: {str(error)}")
     
     def _abbreviate_title(self, title: str) -> str:
         """Abbreviate chess titles"""
-        title_map = {
-            'Grandmaster': 'GM',
-            'International Master': 'IM',
-            'FIDE Master': 'FM',
-            'Candidate Master': 'CM',
-            'Woman Grandmaster': 'WGM',
-            'Women Grandmaster': 'WGM',
-            'Woman International Master': 'WIM',
-            'Women International Master': 'WIM',
-            'Women Intl. Master': 'WIM',
-            'Woman FIDE Master': 'WFM',
-            'Women FIDE Master': 'WFM',
-            'Woman Candidate Master': 'WCM',
-            'Women Candidate Master': 'WCM',
-        }
-        return title_map.get(title, title)
-    
-    def _parse_search_results(self, html: str) -> List[Dict]:
+        return abbreviate_title(title)
+    
+    def _parse_search_results(self, html: str, name: str = '') -> List[Dict]:
         """Parse search results page"""
+        from bs4 import BeautifulSoup
+        
         soup = BeautifulSoup(html, 'html.parser')
         results = []
         
@@ -184,66 +345,258 @@ class FIDEDataExtractor:
                         'Federation': federation
                     })
         except Exception as e:
-            print(f"Error parsing search results: {str(e)}")
+            self.events.emit(FAILED, name, stage='search',
+                             message=f"Error parsing search results: {str(e)}")
         
         return results
     
-    def extract_multiple_players(self, identifiers: List[str]) -> List[Dict]:
+    def extract_multiple_players(self, identifiers: List[str]) -> List[Player]:
         """
         Extract data for multiple players
         identifiers can be FIDE IDs or names
+        
+        Names are resolved to the best-scoring candidate (see NameResolver);
+        repeated names are only searched once, and a player listed several
+        times (by ID or by name) is only fetched once. Identifiers are fetched
+        by up to max_workers threads; results keep the input order.
+        """
+        return [player_data for _, player_data in self.iter_multiple_players(identifiers)
+                if player_data]
+    
+    def iter_multiple_players(self, identifiers: Iterable[str],
+                              control: Optional[RunControl] = None) -> Iterator[Tuple[str, Optional[Player]]]:
         """
-        all_players = []
+        Lazily extract players, yielding (identifier, player data or None)
         
-        for identifier in identifiers:
-            identifier = identifier.strip()
+        Results are yielded in input order as soon as they are ready. At most
+        2 * max_workers identifiers are in flight, so memory use does not
+        grow with the number of identifiers. Counts are reset per run and
+        available from stats.
+        
+        Args:
+            identifiers: FIDE IDs or names
+            control: Optional RunControl to pause or cancel the run from
+                     another thread; a cancelled run stops yielding
+        """
+        self.stats.reset()
+        self.coalescer.clear()
+        self.name_resolver.clear()
+        control = control or RunControl()
+        identifiers = self._with_resolutions(identifiers, control)
+        
+        if self.parse_workers:
+            yield from self._iter_pipeline(identifiers, control)
+            return
+        
+        if self.max_workers == 1:
+            for identifier, resolution in identifiers:
+                started = time.perf_counter()
+                player_data = self._extract_player(identifier, control, resolution)
+                if control.cancelled:
+                    return
+                yield identifier, self._finish(identifier, started, player_data)
+            return
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending = deque()
+            try:
+                for identifier, resolution in identifiers:
+                    if control.cancelled:
+                        return
+                    pending.append((identifier, time.perf_counter(),
+                                    executor.submit(self._extract_player, identifier, control, resolution)))
+                    if len(pending) >= 2 * self.max_workers:
+                        done_identifier, started, future = pending.popleft()
+                        player_data = future.result()
+                        if control.cancelled:
+                            return
+                        yield done_identifier, self._finish(done_identifier, started, player_data)
+                
+                while pending:
+                    done_identifier, started, future = pending.popleft()
+                    player_data = future.result()
+                    if control.cancelled:
+                        return
+                    yield done_identifier, self._finish(done_identifier, started, player_data)
+            finally:
+                # Drop queued work when cancelled or when the caller stops early
+                for _, _, future in pending:
+                    future.cancel()
+    
+    def _iter_pipeline(self, identifiers: Iterable[str],
+                       control: RunControl) -> Iterator[Tuple[str, Optional[Player]]]:
+        """
+        Two-stage variant of iter_multiple_players
+        
+        max_workers threads download pages and parse_workers processes parse
+        them. Each stage holds at most twice its worker count, so a slow
+        stage holds back the other instead of buffering pages in memory.
+        """
+        fetch_limit = 2 * self.max_workers
+        parse_limit = 2 * self.parse_workers
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers) as fetchers, \
+                ProcessPoolExecutor(max_workers=self.parse_workers) as parsers:
+            fetching = deque()  # (identifier, start time, future of (player data, page))
+            parsing = deque()   # (identifier, start time, page, future of parsed data or finished data)
             
-            # Check if it's a FIDE ID (numeric)
-            if identifier.isdigit():
-                print(f"Fetching FIDE ID: {identifier}")
-                player_data = self.get_player_by_id(identifier)
-                if player_data:
-                    all_players.append(player_data)
-            else:
-                # Search by name
-                print(f"Searching for name: {identifier}")
-                search_results = self.search_player_by_name(identifier)
+            try:
+                for identifier, resolution in identifiers:
+                    if control.cancelled:
+                        return
+                    fetching.append((identifier, time.perf_counter(),
+                                     fetchers.submit(self._fetch_identifier, identifier, control, resolution)))
+                    if len(fetching) >= fetch_limit:
+                        parsing.append(self._submit_parse(parsers, *fetching.popleft()))
+                    yield from self._drain_parsed(parsing, parse_limit, control)
+                
+                while fetching and not control.cancelled:
+                    parsing.append(self._submit_parse(parsers, *fetching.popleft()))
+                    yield from self._drain_parsed(parsing, parse_limit, control)
                 
-                if search_results:
-                    # Get detailed data for first result
-                    fide_id = search_results[0]['FIDE ID']
-                    player_data = self.get_player_by_id(fide_id)
-                    if player_data:
-                        all_players.append(player_data)
+                yield from self._drain_parsed(parsing, 0, control)
+            finally:
+                for _, _, future in fetching:
+                    future.cancel()
+                for _, _, page, result in parsing:
+                    if page is not None:
+                        result.cancel()
+    
+    def _submit_parse(self, parsers: ProcessPoolExecutor, identifier: str, started: float,
+                      fetch: Future) -> Tuple[str, float, Optional[RawProfile], object]:
+        """Wait for a download and hand its page, if any, to the parse processes"""
+        player_data, page = fetch.result()
+        if page is None:
+            return identifier, started, None, player_data
+        return identifier, started, page, parsers.submit(_timed_parse, self.parse_player_page,
+                                                         page.html, page.fide_id)
+    
+    def _drain_parsed(self, parsing: deque, limit: int,
+                      control: RunControl) -> Iterator[Tuple[str, Optional[Player]]]:
+        """Yield finished results in order, blocking while more than limit are queued"""
+        while parsing and not control.cancelled:
+            identifier, started, page, result = parsing[0]
+            if page is not None and len(parsing) <= limit and not result.done():
+                return
+            parsing.popleft()
             
-            # Be polite to the server
-            time.sleep(1)
+            if page is not None:
+                try:
+                    player_data, seconds = result.result()
+                    result = self._store_parsed(page, self._parsed(page.fide_id, seconds, player_data))
+                except Exception as e:
+                    self._parse_failed(page.fide_id, e)
+                    result = None
+                # Later repeats reuse the player; the page is not kept for the rest of the run
+                self.coalescer.replace(page.fide_id, (result, None))
+            yield identifier, self._finish(identifier, started, result)
+    
+    def _finish(self, identifier: str, started: float, player_data: Optional[Player]) -> Optional[Player]:
+        """Record whether a player was extracted and report the identifier as finished"""
+        self.stats.add('players_extracted' if player_data else 'players_failed')
+        self.events.emit(FINISHED, identifier, player=player_data,
+                         seconds=time.perf_counter() - started)
+        return player_data
+    
+    def _with_resolutions(self, identifiers: Iterable[str],
+                          control: RunControl) -> Iterator[Tuple[str, Optional[Resolution]]]:
+        """
+        Pair identifiers with the resolution of their name (None for FIDE IDs)
         
-        return all_players
+        The names of each RESOLVE_BATCH identifiers are resolved together
+        (see NameResolver.resolve), so repeated names are searched once and
+        searches run on max_workers threads, while the input is still read
+        lazily.
+        """
+        batch = []
+        for identifier in identifiers:
+            batch.append(identifier)
+            if len(batch) >= self.RESOLVE_BATCH:
+                yield from self._resolve_batch(batch, control)
+                batch = []
+        if batch:
+            yield from self._resolve_batch(batch, control)
     
-    def export_to_excel(self, players_data: List[Dict], filename: str = "fide_players.xlsx"):
-        """Export player data to Excel file"""
-        if not players_data:
-            print("No data to export!")
+    def _resolve_batch(self, batch: List[str],
+                       control: RunControl) -> Iterator[Tuple[str, Optional[Resolution]]]:
+        """Resolve the names among a batch of identifiers"""
+        if control.cancelled or not control.wait():
             return
+        names = list({identifier.strip() for identifier in batch
+                      if identifier.strip() and not identifier.strip().isdigit()})
+        resolutions = {}
+        if names:
+            resolutions = dict(zip(names, self.name_resolver.resolve(names, workers=self.max_workers)))
+        for identifier in batch:
+            yield identifier, resolutions.get(identifier.strip())
+    
+    def _resolve_identifier(self, identifier: str,
+                            resolution: Optional[Resolution] = None) -> Optional[str]:
+        """Return the FIDE ID for an identifier, searching by name unless already resolved"""
+        identifier = identifier.strip()
         
-        df = pd.DataFrame(players_data)
+        self.events.emit(STARTED, identifier)
         
-        # Replace N/A with empty strings
-        df = df.replace('N/A', '')
+        # Check if it's a FIDE ID (numeric)
+        if identifier.isdigit():
+            return identifier
         
-        # Reorder columns for better readability
-        column_order = ['FIDE ID', 'Name', 'Federation', 'Title', 'B-Year', 'Age',
-                       'Rating std', 'Rating rapid', 'Rating blitz']
+        # Search by name (optionally with hints, e.g. "Carlsen, Magnus; NOR; 1990")
+        start = time.perf_counter()
+        if resolution is None:
+            resolution = self.name_resolver.resolve_one(identifier)
         
-        # Only include columns that exist in the dataframe
-        column_order = [col for col in column_order if col in df.columns]
-        df = df[column_order]
+        if not resolution.fide_id:
+            self.events.emit(FAILED, identifier, stage='search',
+                             message=f"No player found for '{identifier}'")
+        else:
+            message = None
+            if resolution.confidence < self.LOW_CONFIDENCE:
+                message = (f"Uncertain match for '{identifier}': {resolution.name} "
+                           f"(confidence {resolution.confidence:.2f})")
+            self.events.emit(RESOLVED, identifier, fide_id=resolution.fide_id,
+                             seconds=time.perf_counter() - start, message=message)
+        return resolution.fide_id
+    
+    def _extract_player(self, identifier: str, control: Optional[RunControl] = None,
+                        resolution: Optional[Resolution] = None) -> Optional[Player]:
+        """Extract data for a single FIDE ID or name (resolution: its name's, if already resolved)"""
+        if control and not control.wait():
+            return None
+        fide_id = self._resolve_identifier(identifier, resolution)
+        if not fide_id:
+            return None
+        return self._coalesce(fide_id, self.get_player_by_id)
+    
+    def _fetch_identifier(self, identifier: str, control: Optional[RunControl] = None,
+                          resolution: Optional[Resolution] = None) -> Tuple[Optional[Player], Optional[RawProfile]]:
+        """Network stage of _extract_player (see _fetch_player)"""
+        if control and not control.wait():
+            return None, None
+        fide_id = self._resolve_identifier(identifier, resolution)
+        if not fide_id:
+            return None, None
+        # Repeats in flight share the download and each parse their own copy;
+        # once parsed, later repeats get the player (see _drain_parsed)
+        return self._coalesce(fide_id, self._fetch_player)
+    
+    def _coalesce(self, fide_id: str, fetch):
+        """Call fetch(fide_id) once per FIDE ID and run; repeats wait for or reuse that result"""
+        result, shared = self.coalescer.run(fide_id, fetch, fide_id)
+        if shared:
+            self.stats.add('coalesced')
+        return result
+    
+    def export_to_excel(self, players_data: Iterable[Union[Player, Dict]], filename: str = "fide_players.xlsx"):
+        """Export player data to Excel file, streaming rows as they arrive (see fide_export)"""
+        with self.stats.timer('export'):
+            count = export_players(players_data, filename, fmt='xlsx')
+        if not count:
+            print("No data to export!")
+            return
         
-        # Export to Excel
-        df.to_excel(filename, index=False, engine='openpyxl')
         print(f"\n✓ Data exported successfully to {filename}")
-        print(f"  Total players: {len(players_data)}")
+        print(f"  Total players: {count}")
 
 
 def main():
@@ -254,6 +607,7 @@ def main():
     
     # Create extractor instance
     extractor = FIDEDataExtractor()
+    extractor.events.subscribe(ConsoleReporter())
     
     # Get user input
     print("\nEnter FIDE IDs or player names (one per line).")
@@ -0,0 +1,108 @@
+"""
+FIDE federation codes and the country names FIDE shows for them
+
+Rating lists and name searches give a player's federation as a code
+('NOR'); profile pages and the fide-api give the country name ('Norway').
+Players are always returned with the name, while the player store keeps
+codes so federations can be queried as the lists spell them.
+"""
+
+import unicodedata
+from typing import Optional
+
+
+FEDERATIONS = {
+    'AFG': 'Afghanistan', 'AHO': 'Netherlands Antilles', 'ALB': 'Albania', 'ALG': 'Algeria',
+    'AND': 'Andorra', 'ANG': 'Angola', 'ANT': 'Antigua and Barbuda', 'ARG': 'Argentina',
+    'ARM': 'Armenia', 'ARU': 'Aruba', 'AUS': 'Australia', 'AUT': 'Austria', 'AZE': 'Azerbaijan',
+    'BAH': 'Bahamas', 'BAN': 'Bangladesh', 'BAR': 'Barbados', 'BDI': 'Burundi', 'BEL': 'Belgium',
+    'BEN': 'Benin', 'BER': 'Bermuda', 'BHU': 'Bhutan', 'BIH': 'Bosnia & Herzegovina',
+    'BIZ': 'Belize', 'BLR': 'Belarus', 'BOL': 'Bolivia', 'BOT': 'Botswana', 'BRA': 'Brazil',
+    'BRN': 'Bahrain', 'BRU': 'Brunei Darussalam', 'BUL': 'Bulgaria', 'BUR': 'Burkina Faso',
+    'CAF': 'Central African Republic', 'CAM': 'Cambodia', 'CAN': 'Canada', 'CAY': 'Cayman Islands',
+    'CGO': 'Congo', 'CHA': 'Chad', 'CHI': 'Chile', 'CHN': 'China', 'CIV': "Cote d'Ivoire",
+    'CMR': 'Cameroon', 'COD': 'Democratic Republic of the Congo', 'COL': 'Colombia',
+    'COM': 'Comoros Islands', 'CPV': 'Cape Verde', 'CRC': 'Costa Rica', 'CRO': 'Croatia',
+    'CUB': 'Cuba', 'CYP': 'Cyprus', 'CZE': 'Czech Republic', 'DEN': 'Denmark', 'DJI': 'Djibouti',
+    'DMA': 'Dominica', 'DOM': 'Dominican Republic', 'ECU': 'Ecuador', 'EGY': 'Egypt',
+    'ENG': 'England', 'ERI': 'Eritrea', 'ESA': 'El Salvador', 'ESP': 'Spain', 'EST': 'Estonia',
+    'ETH': 'Ethiopia', 'FAI': 'Faroe Islands', 'FID': 'FIDE', 'FIJ': 'Fiji', 'FIN': 'Finland',
+    'FRA': 'France', 'GAB': 'Gabon', 'GAM': 'Gambia', 'GCI': 'Guernsey', 'GEO': 'Georgia',
+    'GEQ': 'Equatorial Guinea', 'GER': 'Germany', 'GHA': 'Ghana', 'GRE': 'Greece',
+    'GRN': 'Grenada', 'GUA': 'Guatemala', 'GUM': 'Guam', 'GUY': 'Guyana', 'HAI': 'Haiti',
+    'HKG': 'Hong Kong, China', 'HON': 'Honduras', 'HUN': 'Hungary', 'INA': 'Indonesia',
+    'IND': 'India', 'IOM': 'Isle of Man', 'IRI': 'Iran', 'IRL': 'Ireland', 'IRQ': 'Iraq',
+    'ISL': 'Iceland', 'ISR': 'Israel', 'ISV': 'US Virgin Islands', 'ITA': 'Italy',
+    'IVB': 'British Virgin Islands', 'JAM': 'Jamaica', 'JCI': 'Jersey', 'JOR': 'Jordan',
+    'JPN': 'Japan', 'KAZ': 'Kazakhstan', 'KEN': 'Kenya', 'KGZ': 'Kyrgyzstan', 'KOR': 'South Korea',
+    'KOS': 'Kosovo', 'KSA': 'Saudi Arabia', 'KUW': 'Kuwait', 'LAO': 'Laos', 'LAT': 'Latvia',
+    'LBA': 'Libya', 'LBN': 'Lebanon', 'LBR': 'Liberia', 'LCA': 'Saint Lucia', 'LES': 'Lesotho',
+    'LIE': 'Liechtenstein', 'LTU': 'Lithuania', 'LUX': 'Luxembourg', 'MAC': 'Macau',
+    'MAD': 'Madagascar', 'MAR': 'Morocco', 'MAS': 'Malaysia', 'MAW': 'Malawi', 'MDA': 'Moldova',
+    'MDV': 'Maldives', 'MEX': 'Mexico', 'MGL': 'Mongolia', 'MKD': 'North Macedonia', 'MLI': 'Mali',
+    'MLT': 'Malta', 'MNC': 'Monaco', 'MNE': 'Montenegro', 'MOZ': 'Mozambique', 'MRI': 'Mauritius',
+    'MTN': 'Mauritania', 'MYA': 'Myanmar', 'NAM': 'Namibia', 'NCA': 'Nicaragua', 'NED': 'Netherlands',
+    'NEP': 'Nepal', 'NGR': 'Nigeria', 'NIG': 'Niger', 'NOR': 'Norway', 'NRU': 'Nauru',
+    'NZL': 'New Zealand', 'OMA': 'Oman', 'PAK': 'Pakistan', 'PAN': 'Panama', 'PAR': 'Paraguay',
+    'PER': 'Peru', 'PHI': 'Philippines', 'PLE': 'Palestine', 'PLW': 'Palau',
+    'PNG': 'Papua New Guinea', 'POL': 'Poland', 'POR': 'Portugal', 'PUR': 'Puerto Rico',
+    'QAT': 'Qatar', 'ROU': 'Romania', 'RSA': 'South Africa', 'RUS': 'Russia', 'RWA': 'Rwanda',
+    'SCO': 'Scotland', 'SEN': 'Senegal', 'SEY': 'Seychelles', 'SGP': 'Singapore',
+    'SKN': 'Saint Kitts and Nevis', 'SLE': 'Sierra Leone', 'SLO': 'Slovenia', 'SMR': 'San Marino',
+    'SOL': 'Solomon Islands', 'SOM': 'Somalia', 'SRB': 'Serbia', 'SRI': 'Sri Lanka',
+    'SSD': 'South Sudan', 'STP': 'Sao Tome and Principe', 'SUD': 'Sudan', 'SUI': 'Switzerland',
+    'SUR': 'Suriname', 'SVK': 'Slovakia', 'SWE': 'Sweden', 'SWZ': 'Eswatini', 'SYR': 'Syria',
+    'TAN': 'Tanzania', 'TGA': 'Tonga', 'THA': 'Thailand', 'TJK': 'Tajikistan', 'TKM': 'Turkmenistan',
+    'TLS': 'Timor-Leste', 'TOG': 'Togo', 'TPE': 'Chinese Taipei', 'TTO': 'Trinidad & Tobago',
+    'TUN': 'Tunisia', 'TUR': 'Turkiye', 'UAE': 'United Arab Emirates', 'UGA': 'Uganda',
+    'UKR': 'Ukraine', 'URU': 'Uruguay', 'USA': 'United States of America', 'UZB': 'Uzbekistan',
+    'VAN': 'Vanuatu', 'VEN': 'Venezuela', 'VIE': 'Vietnam', 'VIN': 'Saint Vincent and the Grenadines',
+    'WLS': 'Wales', 'YEM': 'Yemen', 'ZAM': 'Zambia', 'ZIM': 'Zimbabwe',
+}
+
+# Other spellings of country names seen on profile pages and in the API
+ALIASES = {
+    'Turkey': 'TUR',
+    'Bosnia and Herzegovina': 'BIH',
+    'Trinidad and Tobago': 'TTO',
+    'United States': 'USA',
+    'Korea': 'KOR',
+    'Republic of Korea': 'KOR',
+    'Hong Kong': 'HKG',
+    'Macedonia': 'MKD',
+    'FYR Macedonia': 'MKD',
+    'Swaziland': 'SWZ',
+    'Brunei': 'BRU',
+    'Czechia': 'CZE',
+    'IR Iran': 'IRI',
+    'Viet Nam': 'VIE',
+}
+
+
+def _key(name: str) -> str:
+    """Accent-, case- and '&'-insensitive form of a country name"""
+    folded = unicodedata.normalize('NFKD', name)
+    folded = ''.join(c for c in folded if not unicodedata.combining(c))
+    return ' '.join(folded.replace('&', ' and ').casefold().split())
+
+
+CODES = {_key(name): code for code, name in FEDERATIONS.items()}
+CODES.update({_key(name): code for name, code in ALIASES.items()})
+
+
+def federation_code(federation: Optional[str]) -> Optional[str]:
+    """Code for a federation given as a code or a country name; unknown names are returned as they are"""
+    if not federation:
+        return federation
+    federation = federation.strip()
+    if federation.upper() in FEDERATIONS:
+        return federation.upper()
+    return CODES.get(_key(federation), federation)
+
+
+def federation_name(federation: Optional[str]) -> Optional[str]:
+    """Country name for a federation given as a code or a name; unknown codes are returned as they are"""
+    if not federation:
+        return federation
+    federation = federation.strip()
+    return FEDERATIONS.get(federation.upper(), federation)
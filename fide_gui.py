@@ -5,11 +5,15 @@ Professional interface for extracting FIDE player data
 
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog, scrolledtext
+import os
+import queue
 import threading
-import pandas as pd
+import time
 from datetime import datetime
-import json
-from fide_extractor import FIDEDataExtractor
+
+from fide_events import FAILED, FINISHED
+from fide_export import open_writer
+from fide_player import as_player
 
 
 class ModernButton(tk.Canvas):
@@ -45,6 +49,9 @@ class ModernButton(tk.Canvas):
         if self.is_enabled and self.command:
             self.command()
     
+    def set_text(self, text):
+        self.itemconfig(self.text_id, text=text)
+    
     def set_enabled(self, enabled):
         self.is_enabled = enabled
         if enabled:
@@ -55,7 +62,340 @@ class ModernButton(tk.Canvas):
             self.itemconfig(self.text_id, fill='#888888')
 
 
+# Results table columns: heading and the player field shown under it
+RESULT_COLUMNS = [
+    ('FIDE ID', 'FIDE ID'),
+    ('Name', 'Name'),
+    ('Federation', 'Federation'),
+    ('Title', 'Title'),
+    ('B-Year', 'B-Year'),
+    ('Age', 'Age'),
+    ('Std', 'Rating std'),
+    ('Rapid', 'Rating rapid'),
+    ('Blitz', 'Rating blitz'),
+]
+NUMERIC_COLUMNS = {'FIDE ID', 'B-Year', 'Age', 'Rating std', 'Rating rapid', 'Rating blitz'}
+
+
+class ResultsIndex:
+    """
+    Sort and filter index over the extracted players
+
+    Players are never copied or reordered: the index keeps one array of
+    player positions in display order (view), and the table asks it for
+    just the rows it shows. Sort keys and lowercase search text are built
+    once per column and cached until players change. NumPy is imported on
+    first use so it does not delay the window.
+    """
+
+    def __init__(self, columns=RESULT_COLUMNS):
+        self.columns = [field for _, field in columns]
+        self.players = []
+        self.sort_column = None
+        self.descending = False
+        self.filter_text = ''
+        self.filter_column = None
+        self.view = range(0)
+        self._keys = {}
+        self._haystacks = {}
+
+    def set_players(self, players):
+        """Index a new list of players"""
+        self.players = [as_player(player) for player in players]
+        self._keys.clear()
+        self._haystacks.clear()
+        self._rebuild()
+
+    def extend(self, players):
+        """Add players to the index, extending the cached keys rather than rebuilding them"""
+        import numpy as np
+
+        players = [as_player(player) for player in players]
+        self.players.extend(players)
+        for column, keys in self._keys.items():
+            new_keys = self._column_keys(column, players)
+            self._keys[column] = (np.concatenate([keys, new_keys]) if isinstance(keys, np.ndarray)
+                                  else keys + new_keys)
+        new_text = {column: self._column_text(column, players) for column in self.columns}
+        for column, haystack in self._haystacks.items():
+            if column:
+                haystack.extend(new_text[column])
+            else:
+                haystack.extend('\x00'.join(values) for values in zip(*new_text.values()))
+        self._rebuild()
+
+    def sort(self, column, descending=False):
+        """Order the view by a column (None for extraction order); missing values go last"""
+        self.sort_column = column
+        self.descending = descending
+        self._rebuild()
+
+    def filter(self, text, column=None):
+        """Keep players containing text (case-insensitive) in a column, or in any column"""
+        self.filter_text = text.strip().lower()
+        self.filter_column = column
+        self._rebuild()
+
+    def __len__(self):
+        return len(self.view)
+
+    def row(self, position):
+        """Display values of the row at a view position"""
+        player = self.players[self.view[position]]
+        return tuple(player.get(field, 'N/A') for field in self.columns)
+
+    @staticmethod
+    def _column_keys(column, players):
+        """Float key per player (NaN when missing) for numeric columns, lowercase text otherwise"""
+        values = [player.get(column) for player in players]
+        if column in NUMERIC_COLUMNS:
+            import numpy as np
+
+            return np.array([np.nan if value is None else value for value in values], dtype=float)
+        return [value.lower() if value else None for value in values]
+
+    @staticmethod
+    def _column_text(column, players):
+        """Lowercase search text of a column"""
+        return [str(player.get(column, '')).lower() for player in players]
+
+    def _sort_keys(self, column):
+        if column not in self._keys:
+            self._keys[column] = self._column_keys(column, self.players)
+        return self._keys[column]
+
+    def _order(self):
+        """Player positions in sort order"""
+        import numpy as np
+
+        count = len(self.players)
+        if self.sort_column is None:
+            order = np.arange(count)
+            return order[::-1] if self.descending else order
+
+        keys = self._sort_keys(self.sort_column)
+        if isinstance(keys, np.ndarray):
+            missing = np.isnan(keys)
+            present = np.flatnonzero(~missing)
+            present = present[np.argsort(keys[present], kind='stable')]
+        else:
+            missing = np.array([key is None for key in keys], dtype=bool)
+            present = np.array(sorted(np.flatnonzero(~missing), key=keys.__getitem__), dtype=np.intp)
+        if self.descending:
+            present = present[::-1]
+        return np.concatenate([present, np.flatnonzero(missing)])
+
+    def _haystack(self, column):
+        """Lowercase search text per player for a column (None: all columns)"""
+        if column not in self._haystacks:
+            if column:
+                self._haystacks[column] = self._column_text(column, self.players)
+            else:
+                columns = [self._haystack(field) for field in self.columns]
+                self._haystacks[None] = ['\x00'.join(values) for values in zip(*columns)]
+        return self._haystacks[column]
+
+    def _rebuild(self):
+        order = self._order()
+        if self.filter_text:
+            import numpy as np
+
+            text = self.filter_text
+            mask = np.fromiter((text in value for value in self._haystack(self.filter_column)),
+                               dtype=bool, count=len(self.players))
+            order = order[mask[order]]
+        self.view = order
+
+
+class VirtualTable(tk.Frame):
+    """
+    Treeview that only materializes the visible rows
+
+    The tree holds one item per visible line; scrolling refills those
+    items from a ResultsIndex instead of inserting every player, so the
+    cost of showing, sorting or filtering is independent of how many
+    players there are. Click a heading to sort by it, again to reverse.
+    """
+
+    ROW_HEIGHT = 24
+
+    def __init__(self, parent, colors, widths):
+        super().__init__(parent, bg=colors['border'])
+
+        self.index = ResultsIndex()
+        self.headings = [heading for heading, _ in RESULT_COLUMNS]
+        self.top = 0
+        self.rows = 1
+        self.selected = None
+        self.on_change = None
+
+        self.vsb = ttk.Scrollbar(self, orient="vertical", command=self._yview)
+        hsb = ttk.Scrollbar(self, orient="horizontal")
+
+        self.tree = ttk.Treeview(
+            self,
+            columns=self.headings,
+            show='headings',
+            xscrollcommand=hsb.set,
+            style="Custom.Treeview",
+            height=15,
+            selectmode='browse'
+        )
+        hsb.config(command=self.tree.xview)
+
+        for heading, field in RESULT_COLUMNS:
+            self.tree.heading(heading, text=heading, command=lambda f=field: self.sort_by(f))
+            self.tree.column(heading, width=widths[heading], anchor='center' if heading != 'Name' else 'w')
+
+        self.tree.grid(row=0, column=0, sticky='nsew', padx=1, pady=1)
+        self.vsb.grid(row=0, column=1, sticky='ns')
+        hsb.grid(row=1, column=0, sticky='ew')
+
+        self.grid_rowconfigure(0, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+
+        # Row colors
+        self.tree.tag_configure('evenrow', background='#F9FAFB')
+        self.tree.tag_configure('oddrow', background=colors['card'])
+
+        self.items = []
+        self.tree.bind('<Configure>', self._on_resize)
+        self.tree.bind('<<TreeviewSelect>>', self._on_select)
+        self.tree.bind('<MouseWheel>', self._on_wheel)
+        self.tree.bind('<Button-4>', lambda e: self._scroll(-3))
+        self.tree.bind('<Button-5>', lambda e: self._scroll(3))
+        self.tree.bind('<Up>', lambda e: self._move_selection(-1))
+        self.tree.bind('<Down>', lambda e: self._move_selection(1))
+        self.tree.bind('<Prior>', lambda e: self._scroll(-self.rows))
+        self.tree.bind('<Next>', lambda e: self._scroll(self.rows))
+        self.tree.bind('<Home>', lambda e: self._scroll(-len(self.index)))
+        self.tree.bind('<End>', lambda e: self._scroll(len(self.index)))
+
+    def set_players(self, players):
+        """Show a new list of players"""
+        self.index.set_players(players)
+        self.top = 0
+        self.selected = None
+        self.refresh()
+
+    def add_players(self, players):
+        """Append players, keeping the current sort, filter and scroll position"""
+        self.index.extend(players)
+        self.refresh()
+
+    def clear(self):
+        """Remove all players"""
+        self.set_players([])
+
+    def sort_by(self, field):
+        """Sort by a column; sorting by the same column again reverses the order"""
+        descending = self.index.sort_column == field and not self.index.descending
+        self.index.sort(field, descending)
+        for heading, column in RESULT_COLUMNS:
+            arrow = (' ▼' if descending else ' ▲') if column == field else ''
+            self.tree.heading(heading, text=heading + arrow)
+        self.top = 0
+        self.selected = None
+        self.refresh()
+
+    def set_filter(self, text, field=None):
+        """Show only players matching text, in one column or any"""
+        self.index.filter(text, field)
+        self.top = 0
+        self.selected = None
+        self.refresh()
+
+    @property
+    def shown(self):
+        """Number of players after filtering"""
+        return len(self.index)
+
+    @property
+    def total(self):
+        """Number of players"""
+        return len(self.index.players)
+
+    def refresh(self):
+        """Redraw the visible rows"""
+        total = len(self.index)
+        self.top = max(0, min(self.top, total - self.rows))
+
+        count = min(self.rows, total - self.top)
+        while len(self.items) < count:
+            self.items.append(self.tree.insert('', tk.END))
+
+        selection = None
+        for line, iid in enumerate(self.items):
+            position = self.top + line
+            if line < count:
+                tag = 'evenrow' if position % 2 == 0 else 'oddrow'
+                self.tree.item(iid, values=self.index.row(position), tags=(tag,))
+                self.tree.move(iid, '', line)
+                if position == self.selected:
+                    selection = iid
+            else:
+                self.tree.detach(iid)
+        self.tree.selection_set([selection] if selection else [])
+
+        if total:
+            self.vsb.set(self.top / total, min(1.0, (self.top + self.rows) / total))
+        else:
+            self.vsb.set(0, 1)
+        if self.on_change:
+            self.on_change()
+
+    def _on_resize(self, event):
+        # Heading row plus as many rows as fit
+        rows = max(1, (event.height - self.ROW_HEIGHT) // self.ROW_HEIGHT)
+        if rows != self.rows:
+            self.rows = rows
+            self.refresh()
+
+    def _on_select(self, event):
+        selection = self.tree.selection()
+        if selection and selection[0] in self.items:
+            self.selected = self.top + self.items.index(selection[0])
+
+    def _yview(self, *args):
+        """Scrollbar command"""
+        if args[0] == 'moveto':
+            self.top = int(float(args[1]) * len(self.index))
+            self.refresh()
+        elif args[0] == 'scroll':
+            step = int(args[1]) * (self.rows if args[2] == 'pages' else 1)
+            self._scroll(step)
+
+    def _scroll(self, lines):
+        self.top += lines
+        self.refresh()
+        return 'break'
+
+    def _on_wheel(self, event):
+        # Windows reports multiples of 120 per notch, macOS small deltas
+        delta = event.delta // 120 if abs(event.delta) >= 120 else event.delta
+        return self._scroll(-3 * delta)
+
+    def _move_selection(self, step):
+        """Arrow keys: move the selection, scrolling at the edges"""
+        if not len(self.index):
+            return 'break'
+        if self.selected is None:
+            self.selected = self.top
+        else:
+            self.selected = max(0, min(len(self.index) - 1, self.selected + step))
+        if self.selected < self.top:
+            self.top = self.selected
+        elif self.selected >= self.top + self.rows:
+            self.top = self.selected - self.rows + 1
+        self.refresh()
+        return 'break'
+
+
 class FIDEExtractorGUI:
+    # How often the results queue is drained, and at most how many results per drain
+    POLL_MS = 100
+    POLL_BATCH = 2000
+    
     def __init__(self, root):
         self.root = root
         self.root.title("FIDE Player Data Extractor")
@@ -82,9 +422,13 @@ class FIDEExtractorGUI:
         
         self.root.configure(bg=self.colors['bg'])
         
-        # Initialize extractor
-        self.extractor = FIDEDataExtractor()
+        # The extractor (with requests and the parsers) is loaded in the
+        # background once the window is up, see _load_extractor
+        self.extractor = None
+        self._extractor_lock = threading.Lock()
         self.players_data = []
+        self.control = None
+        self.export_cancel = None
         
         # Placeholder state
         self.placeholder_text = "22538496\n12528374\nMagnus Carlsen\nGukesh D"
@@ -92,6 +436,22 @@ class FIDEExtractorGUI:
         
         # Create GUI components
         self.create_widgets()
+        self.root.after_idle(self._preload)
+        
+    def _preload(self):
+        """Import the extraction modules off the UI thread while the user types"""
+        def load():
+            import numpy  # noqa: F401
+            self._load_extractor()
+        threading.Thread(target=load, daemon=True).start()
+        
+    def _load_extractor(self):
+        """The extractor, created on first use"""
+        with self._extractor_lock:
+            if self.extractor is None:
+                from fide_extractor import FIDEDataExtractor
+                self.extractor = FIDEDataExtractor()
+            return self.extractor
         
     def create_widgets(self):
         """Create all GUI widgets with modern design"""
@@ -318,11 +678,31 @@ class FIDEExtractorGUI:
         
         self.progress_bar = ttk.Progressbar(
             self.progress_frame,
-            mode='indeterminate',
+            mode='determinate',
             length=300,
             style="Custom.Horizontal.TProgressbar"
         )
         
+        # Run controls, shown while extracting
+        self.cancel_btn = ModernButton(
+            self.progress_frame,
+            text="Cancel",
+            command=self.cancel_extraction,
+            bg_color=self.colors['danger'],
+            hover_color=self.colors['danger_hover'],
+            width=80,
+            height=28
+        )
+        self.pause_btn = ModernButton(
+            self.progress_frame,
+            text="Pause",
+            command=self.toggle_pause,
+            bg_color=self.colors['secondary'],
+            hover_color=self.colors['secondary_hover'],
+            width=80,
+            height=28
+        )
+        
     def create_results_section(self, parent):
         """Create results table section"""
         # Results card
@@ -350,6 +730,41 @@ class FIDEExtractorGUI:
         )
         self.results_count.pack(side=tk.LEFT, padx=(10, 0))
         
+        # Filter box (applied shortly after typing stops)
+        self.filter_column = ttk.Combobox(
+            results_header,
+            values=['All columns'] + [heading for heading, _ in RESULT_COLUMNS],
+            state='readonly',
+            width=12
+        )
+        self.filter_column.set('All columns')
+        self.filter_column.pack(side=tk.RIGHT)
+        self.filter_column.bind('<<ComboboxSelected>>', lambda e: self._apply_filter())
+        
+        self.filter_var = tk.StringVar()
+        self.filter_var.trace_add('write', lambda *args: self._schedule_filter())
+        self._filter_job = None
+        tk.Entry(
+            results_header,
+            textvariable=self.filter_var,
+            font=('SF Pro Display', 10),
+            bg=self.colors['input_bg'],
+            fg=self.colors['text'],
+            relief=tk.FLAT,
+            width=24,
+            highlightthickness=1,
+            highlightbackground=self.colors['border'],
+            highlightcolor=self.colors['primary']
+        ).pack(side=tk.RIGHT, padx=(0, 8), ipady=3)
+        
+        tk.Label(
+            results_header,
+            text="Filter:",
+            font=('SF Pro Display', 10),
+            bg=self.colors['card'],
+            fg=self.colors['text_secondary']
+        ).pack(side=tk.RIGHT, padx=(0, 8))
+        
         # Table container
         table_container = tk.Frame(results_card, bg=self.colors['card'])
         table_container.pack(fill=tk.BOTH, expand=True, padx=25, pady=(0, 20))
@@ -369,6 +784,7 @@ class FIDEExtractorGUI:
             foreground=self.colors['text'],
             fieldbackground=self.colors['card'],
             borderwidth=0,
+            rowheight=VirtualTable.ROW_HEIGHT,
             font=('SF Pro Display', 10)
         )
         
@@ -384,29 +800,6 @@ class FIDEExtractorGUI:
                  background=[('selected', self.colors['primary'])],
                  foreground=[('selected', 'white')])
         
-        # Frame for tree and scrollbars
-        tree_frame = tk.Frame(parent, bg=self.colors['border'])
-        tree_frame.pack(fill=tk.BOTH, expand=True)
-        
-        # Scrollbars
-        vsb = ttk.Scrollbar(tree_frame, orient="vertical")
-        hsb = ttk.Scrollbar(tree_frame, orient="horizontal")
-        
-        # Treeview
-        columns = ('FIDE ID', 'Name', 'Federation', 'Title', 'B-Year', 'Age', 'Std', 'Rapid', 'Blitz')
-        self.tree = ttk.Treeview(
-            tree_frame,
-            columns=columns,
-            show='headings',
-            yscrollcommand=vsb.set,
-            xscrollcommand=hsb.set,
-            style="Custom.Treeview",
-            height=15
-        )
-        
-        vsb.config(command=self.tree.yview)
-        hsb.config(command=self.tree.xview)
-        
         # Column configuration
         column_widths = {
             'FIDE ID': 90,
@@ -420,21 +813,10 @@ class FIDEExtractorGUI:
             'Blitz': 70
         }
         
-        for col in columns:
-            self.tree.heading(col, text=col)
-            self.tree.column(col, width=column_widths[col], anchor='center' if col != 'Name' else 'w')
-        
-        # Grid layout
-        self.tree.grid(row=0, column=0, sticky='nsew', padx=1, pady=1)
-        vsb.grid(row=0, column=1, sticky='ns')
-        hsb.grid(row=1, column=0, sticky='ew')
-        
-        tree_frame.grid_rowconfigure(0, weight=1)
-        tree_frame.grid_columnconfigure(0, weight=1)
-        
-        # Row colors
-        self.tree.tag_configure('evenrow', background='#F9FAFB')
-        self.tree.tag_configure('oddrow', background=self.colors['card'])
+        # Only the visible rows are drawn, so large result sets stay responsive
+        self.table = VirtualTable(parent, self.colors, column_widths)
+        self.table.pack(fill=tk.BOTH, expand=True)
+        self.table.on_change = self._update_count
         
     def create_footer(self, parent):
         """Create footer status bar"""
@@ -460,6 +842,30 @@ class FIDEExtractorGUI:
         )
         self.status_bar.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, pady=12)
         
+        # Export progress, shown while an export runs in the background
+        self.export_cancel_btn = ModernButton(
+            status_content,
+            text="Cancel",
+            command=self.cancel_export,
+            bg_color=self.colors['danger'],
+            hover_color=self.colors['danger_hover'],
+            width=70,
+            height=26
+        )
+        self.export_progress = ttk.Progressbar(
+            status_content,
+            mode='determinate',
+            length=160,
+            style="Custom.Horizontal.TProgressbar"
+        )
+        self.export_label = tk.Label(
+            status_content,
+            text="",
+            font=('SF Pro Display', 10),
+            bg=self.colors['card'],
+            fg=self.colors['text_secondary']
+        )
+        
     def on_input_focus_in(self, event):
         """Remove placeholder on focus"""
         if self.is_placeholder:
@@ -496,76 +902,171 @@ class FIDEExtractorGUI:
         # Disable buttons
         self.set_buttons_state(False)
         
+        # Results appear in the table as they arrive
+        self.players_data = []
+        self.table.clear()
+        self.set_export_state(False)
+        
         # Show progress
         self.progress_label.config(text=f"Extracting data for {len(identifiers)} player(s)...")
+        self.progress_bar.config(maximum=len(identifiers), value=0)
         self.progress_bar.pack(side=tk.LEFT, padx=(10, 0))
-        self.progress_bar.start(10)
-        
-        # Run extraction in thread
-        thread = threading.Thread(target=self._extract_thread, args=(identifiers,))
+        self.pause_btn.set_text("Pause")
+        self.pause_btn.pack(side=tk.RIGHT)
+        self.cancel_btn.pack(side=tk.RIGHT, padx=(0, 8))
+        
+        from fide_extractor import RunControl
+        
+        self.control = RunControl()
+        self.total = len(identifiers)
+        self.processed = 0
+        self.failed = 0
+        self.started = time.monotonic()
+        self.paused_at = None
+        self.paused_time = 0.0
+        
+        # Run extraction in thread; results come back through a queue
+        results = queue.Queue()
+        thread = threading.Thread(target=self._extract_thread, args=(identifiers, self.control, results))
         thread.daemon = True
         thread.start()
+        self.root.after(self.POLL_MS, self._poll_results, results)
         
-    def _extract_thread(self, identifiers):
-        """Thread function for extracting data"""
+    def _extract_thread(self, identifiers, control, results):
+        """Thread function for extracting data; progress is sent as extractor events"""
+        def on_event(event):
+            results.put(('event', event))
+        
+        extractor = self._load_extractor()
+        extractor.events.subscribe(on_event, kinds=(FINISHED, FAILED))
         try:
-            self.players_data = self.extractor.extract_multiple_players(identifiers)
-            self.root.after(0, self._update_results)
+            for _ in extractor.iter_multiple_players(identifiers, control):
+                pass
+            results.put(('done', None))
         except Exception as e:
-            self.root.after(0, lambda: self._show_error(str(e)))
+            results.put(('error', str(e)))
+        finally:
+            extractor.events.unsubscribe(on_event)
             
-    def _update_results(self):
-        """Update results table"""
-        self.progress_bar.stop()
+    def _poll_results(self, results):
+        """Move finished players from the extraction thread into the table"""
+        players = []
+        finished = None
+        for _ in range(self.POLL_BATCH):
+            try:
+                kind, value = results.get_nowait()
+            except queue.Empty:
+                break
+            if kind != 'event':
+                finished = (kind, value)
+                break
+            if value.kind == FINISHED:
+                self.processed += 1
+                if value.player:
+                    players.append(value.player)
+                else:
+                    self.failed += 1
+            elif value.message:
+                # Stage errors show up in the status bar as they happen
+                self.status_bar.config(text=value.message)
+        
+        if players:
+            self.players_data.extend(players)
+            self.table.add_players(players)
+            self.set_export_state(True)
+        self._update_progress()
+        
+        if finished is None:
+            self.root.after(self.POLL_MS, self._poll_results, results)
+        elif finished[0] == 'error':
+            self._show_error(finished[1])
+        else:
+            self._update_results()
+            
+    def _update_progress(self):
+        """Show processed count, throughput and estimated time left"""
+        self.progress_bar.config(value=self.processed)
+        elapsed = time.monotonic() - self.started - self.paused_time
+        if self.paused_at is not None:
+            elapsed -= time.monotonic() - self.paused_at
+        
+        text = f"{self.processed}/{self.total} players"
+        if self.failed:
+            text += f" · {self.failed} failed"
+        if self.processed and elapsed > 0:
+            rate = self.processed / elapsed
+            remaining = (self.total - self.processed) / rate
+            text += f" · {rate:.1f}/s · ETA {self._format_duration(remaining)}"
+        if self.paused_at is not None:
+            text += " · paused"
+        self.progress_label.config(text=text)
+        
+    @staticmethod
+    def _format_duration(seconds):
+        """e.g. 45s, 3m 05s, 2h 10m"""
+        seconds = int(seconds)
+        if seconds < 60:
+            return f"{seconds}s"
+        if seconds < 3600:
+            return f"{seconds // 60}m {seconds % 60:02d}s"
+        return f"{seconds // 3600}h {seconds % 3600 // 60:02d}m"
+        
+    def toggle_pause(self):
+        """Pause or resume the running extraction"""
+        if not self.control:
+            return
+        if self.control.paused:
+            self.control.resume()
+            self.paused_time += time.monotonic() - self.paused_at
+            self.paused_at = None
+            self.pause_btn.set_text("Pause")
+            self.status_bar.config(text="Extracting...")
+        else:
+            self.control.pause()
+            self.paused_at = time.monotonic()
+            self.pause_btn.set_text("Resume")
+            self.status_bar.config(text="Paused (requests in progress will finish)")
+        self._update_progress()
+        
+    def cancel_extraction(self):
+        """Stop the running extraction; players extracted so far are kept"""
+        if self.control:
+            self.control.cancel()
+            self.status_bar.config(text="Cancelling...")
+            
+    def _end_run(self):
+        """Hide the progress widgets once the extraction thread has finished"""
         self.progress_bar.pack_forget()
+        self.pause_btn.pack_forget()
+        self.cancel_btn.pack_forget()
         self.progress_label.config(text="")
-        
         self.set_buttons_state(True)
         
-        # Clear existing
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+    def _update_results(self):
+        """Finish an extraction run"""
+        cancelled = self.control.cancelled
+        self.control = None
+        self._end_run()
+        
+        count = len(self.players_data)
+        if cancelled:
+            self.status_bar.config(text=f"Cancelled: extracted {count} player(s) of {self.total}")
+            return
         
         if not self.players_data:
             messagebox.showwarning("No Data", "Could not extract any player data. Please check the FIDE IDs/names.")
             self.status_bar.config(text="No data extracted")
-            self.results_count.config(text="0 players")
             return
         
-        # Add data
-        for idx, player in enumerate(self.players_data):
-            tag = 'evenrow' if idx % 2 == 0 else 'oddrow'
-            # Replace N/A with empty string for display
-            self.tree.insert('', tk.END, values=(
-                player.get('FIDE ID', ''),
-                player.get('Name', ''),
-                player.get('Federation', ''),
-                player.get('Title', ''),
-                player.get('B-Year', ''),
-                player.get('Age', ''),
-                player.get('Rating std', ''),
-                player.get('Rating rapid', ''),
-                player.get('Rating blitz', '')
-            ), tags=(tag,))
-        
-        # Enable export
-        self.export_excel_btn.set_enabled(True)
-        self.export_csv_btn.set_enabled(True)
-        self.export_json_btn.set_enabled(True)
-        
         # Update status
-        count = len(self.players_data)
         self.status_bar.config(text=f"✓ Successfully extracted {count} player(s)")
-        self.results_count.config(text=f"{count} player{'s' if count != 1 else ''}")
         
         messagebox.showinfo("Success", f"Successfully extracted data for {count} player(s)!")
         
     def _show_error(self, error_msg):
         """Show error message"""
-        self.progress_bar.stop()
-        self.progress_bar.pack_forget()
-        self.progress_label.config(text="")
-        self.set_buttons_state(True)
+        self.control = None
+        self._end_run()
         
         messagebox.showerror("Error", f"An error occurred:\n{error_msg}")
         self.status_bar.config(text="Error occurred")
@@ -607,43 +1108,97 @@ class FIDEExtractorGUI:
                 
     def _export_excel(self, filename):
         """Export to Excel"""
-        try:
-            df = pd.DataFrame(self.players_data)
-            # Replace N/A with empty strings
-            df = df.replace('N/A', '')
-            df.to_excel(filename, index=False, engine='openpyxl')
-            messagebox.showinfo("Success", f"Data exported to:\n{filename}")
-            self.status_bar.config(text=f"✓ Exported to Excel: {filename}")
-        except Exception as e:
-            messagebox.showerror("Export Error", f"Failed to export to Excel:\n{str(e)}")
+        self._export_file(filename, 'xlsx', "Excel")
             
     def _export_csv(self, filename):
         """Export to CSV"""
-        try:
-            df = pd.DataFrame(self.players_data)
-            # Replace N/A with empty strings
-            df = df.replace('N/A', '')
-            df.to_csv(filename, index=False, encoding='utf-8')
-            messagebox.showinfo("Success", f"Data exported to:\n{filename}")
-            self.status_bar.config(text=f"✓ Exported to CSV: {filename}")
-        except Exception as e:
-            messagebox.showerror("Export Error", f"Failed to export to CSV:\n{str(e)}")
+        self._export_file(filename, 'csv', "CSV")
             
     def _export_json(self, filename):
         """Export to JSON"""
+        self._export_file(filename, 'json', "JSON")
+    
+    def _export_file(self, filename, fmt, label):
+        """Export the current results on a background thread"""
+        # Players are immutable, so a copy of the list is a consistent snapshot
+        # even while extraction keeps appending to players_data
+        players = list(self.players_data)
+        self.export_cancel = threading.Event()
+        self.set_export_state(False)
+        
+        self.export_progress.config(maximum=len(players), value=0)
+        self.export_cancel_btn.pack(side=tk.RIGHT)
+        self.export_progress.pack(side=tk.RIGHT, padx=(0, 10))
+        self.export_label.config(text=f"Exporting {label}...")
+        self.export_label.pack(side=tk.RIGHT, padx=(0, 10))
+        
+        messages = queue.Queue()
+        thread = threading.Thread(target=self._export_thread,
+                                  args=(players, filename, fmt, self.export_cancel, messages))
+        thread.daemon = True
+        thread.start()
+        self.root.after(self.POLL_MS, self._poll_export, messages, filename, label, len(players))
+        
+    def _export_thread(self, players, filename, fmt, cancel, messages):
+        """Thread function for exporting; writes to a .part file renamed into place when done"""
+        partial = filename + '.part'
         try:
-            # Replace N/A with empty strings
-            clean_data = []
-            for player in self.players_data:
-                clean_player = {k: ('' if v == 'N/A' else v) for k, v in player.items()}
-                clean_data.append(clean_player)
+            with open_writer(partial, fmt) as writer:
+                for count, player in enumerate(players, 1):
+                    if cancel.is_set():
+                        break
+                    writer.write(player)
+                    if count % 1000 == 0:
+                        messages.put(('progress', count))
+            if cancel.is_set():
+                if os.path.exists(partial):
+                    os.remove(partial)
+                messages.put(('cancelled', None))
+            else:
+                os.replace(partial, filename)
+                messages.put(('done', len(players)))
+        except Exception as e:
+            if os.path.exists(partial):
+                os.remove(partial)
+            messages.put(('error', str(e)))
             
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(clean_data, f, indent=2, ensure_ascii=False)
+    def _poll_export(self, messages, filename, label, total):
+        """Show export progress and report the outcome"""
+        finished = None
+        while finished is None:
+            try:
+                kind, value = messages.get_nowait()
+            except queue.Empty:
+                break
+            if kind == 'progress':
+                self.export_progress.config(value=value)
+                self.export_label.config(text=f"Exporting {label}: {value}/{total}")
+            else:
+                finished = (kind, value)
+        
+        if finished is None:
+            self.root.after(self.POLL_MS, self._poll_export, messages, filename, label, total)
+            return
+        
+        self.export_cancel = None
+        self.export_cancel_btn.pack_forget()
+        self.export_progress.pack_forget()
+        self.export_label.pack_forget()
+        self.set_export_state(bool(self.players_data))
+        
+        kind, value = finished
+        if kind == 'done':
             messagebox.showinfo("Success", f"Data exported to:\n{filename}")
-            self.status_bar.config(text=f"✓ Exported to JSON: {filename}")
-        except Exception as e:
-            messagebox.showerror("Export Error", f"Failed to export to JSON:\n{str(e)}")
+            self.status_bar.config(text=f"✓ Exported {value} player(s) to {label}: {filename}")
+        elif kind == 'cancelled':
+            self.status_bar.config(text=f"{label} export cancelled")
+        else:
+            messagebox.showerror("Export Error", f"Failed to export to {label}:\n{value}")
+            
+    def cancel_export(self):
+        """Stop the running export; the partial file is removed"""
+        if self.export_cancel:
+            self.export_cancel.set()
             
     def clear_all(self):
         """Clear all data"""
@@ -652,22 +1207,45 @@ class FIDEExtractorGUI:
         self.input_text.config(fg=self.colors['text_secondary'])
         self.is_placeholder = True
         
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        
         self.players_data = []
+        self.table.clear()
         
-        self.export_excel_btn.set_enabled(False)
-        self.export_csv_btn.set_enabled(False)
-        self.export_json_btn.set_enabled(False)
+        self.set_export_state(False)
         
         self.status_bar.config(text="Ready to extract player data")
-        self.results_count.config(text="0 players")
+        
+    def _schedule_filter(self):
+        """Filter once typing pauses rather than on every keystroke"""
+        if self._filter_job:
+            self.root.after_cancel(self._filter_job)
+        self._filter_job = self.root.after(200, self._apply_filter)
+        
+    def _apply_filter(self):
+        """Filter the results table by the filter box"""
+        self._filter_job = None
+        heading = self.filter_column.get()
+        field = dict(RESULT_COLUMNS).get(heading)
+        self.table.set_filter(self.filter_var.get(), field)
+        
+    def _update_count(self):
+        """Show how many players are in the table and how many match the filter"""
+        total = self.table.total
+        text = f"{total} player{'s' if total != 1 else ''}"
+        if self.table.shown != total:
+            text = f"{self.table.shown} of {text}"
+        self.results_count.config(text=text)
         
     def set_buttons_state(self, enabled):
         """Enable or disable buttons"""
         self.extract_btn.set_enabled(enabled)
         self.clear_btn.set_enabled(enabled)
+        
+    def set_export_state(self, enabled):
+        """Enable or disable the export buttons (kept disabled while an export runs)"""
+        enabled = enabled and self.export_cancel is None
+        self.export_excel_btn.set_enabled(enabled)
+        self.export_csv_btn.set_enabled(enabled)
+        self.export_json_btn.set_enabled(enabled)
 
 
 def main():
@@ -0,0 +1,441 @@
+"""
+Rating history time series in columnar, memory-mapped storage
+
+The monthly rating history behind a profile's rating chart is stored per
+federation as one NumPy .npy file per column (fide_id, month, std, rapid,
+blitz), sorted by month. Queries memory-map the columns and binary-search
+the month range, so only the requested slice is read from disk, e.g. all
+Indian players' standard ratings from 2020 to 2025:
+
+    store = RatingHistoryStore()
+    df = store.query('India', 2020, 2025, rating='std')
+
+Writes go to small sorted chunk files; compact() (run at the end of a
+fetch, and before a query if needed) merges them into the main columns.
+
+Usage:
+    python fide_history.py fetch <input_file> [--dir fide_history] [--workers N] [--rps R]
+    python fide_history.py query <federation> --from 2020 --to 2025 [--rating std] [--output out.csv]
+"""
+
+import argparse
+import os
+import re
+import shutil
+import sys
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from fide_federations import federation_name
+
+
+RATINGS = ('std', 'rapid', 'blitz')
+
+# Column dtypes; months are stored as YYYYMM and 0 means "not rated that month"
+COLUMNS = {
+    'fide_id': np.int32,
+    'month': np.int32,
+    'std': np.int16,
+    'rapid': np.int16,
+    'blitz': np.int16,
+}
+
+MONTHS = {name: number for number, name in enumerate(
+    ('jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec'), 1)}
+
+# Each flush writes its rows as a sorted chunk next to the main columns
+CHUNK_PATTERN = re.compile(r'chunk-(\d+)$')
+
+# Rating chart JSON keys for each rating
+CHART_KEYS = {
+    'std': 'rating',
+    'rapid': 'rapid_rtng',
+    'blitz': 'blitz_rtng',
+}
+
+
+def parse_month(text: str) -> Optional[int]:
+    """Convert "2025-Oct" or "2025-10" to 202510"""
+    match = re.match(r'(\d{4})-(\w+)', str(text).strip())
+    if not match:
+        return None
+    month = match.group(2).lower()[:3]
+    number = MONTHS.get(month) or (int(month) if month.isdigit() else None)
+    if not number or not 1 <= number <= 12:
+        return None
+    return int(match.group(1)) * 100 + number
+
+
+def parse_rating_history(payload: List[Dict]) -> List[Dict]:
+    """
+    Parse the rating chart JSON of a profile
+
+    Returns:
+        One dict per month with 'month' (YYYYMM) and std/rapid/blitz
+        ratings, 0 where the player was not rated
+    """
+    def rating(value):
+        return int(value) if str(value).strip().isdigit() else 0
+
+    history = []
+    for row in payload or []:
+        month = parse_month(row.get('date_2', ''))
+        if month:
+            history.append(dict({name: rating(row.get(key)) for name, key in CHART_KEYS.items()},
+                                month=month))
+    return history
+
+
+def _month_bound(value: Union[int, str], end: bool) -> int:
+    """Turn a year (2020), YYYYMM (202003) or "2020-03" into a YYYYMM bound"""
+    if isinstance(value, str) and not value.isdigit():
+        month = parse_month(value)
+        if month is None:
+            raise ValueError(f"Invalid month '{value}' (use YYYY, YYYY-MM or YYYYMM)")
+        return month
+    value = int(value)
+    if value < 10000:
+        return value * 100 + (12 if end else 1)
+    return value
+
+
+class RatingHistoryStore:
+    """Per-federation columnar store of monthly ratings"""
+
+    DEFAULT_DIR = "fide_history"
+
+    def __init__(self, directory: str = DEFAULT_DIR):
+        """
+        Open (or create) the history store
+
+        Args:
+            directory: Directory holding one sub-directory of columns per federation
+        """
+        self.directory = directory
+        self._pending = {}
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _federation_dir(self, federation: Optional[str]) -> str:
+        """Directory of a federation's columns"""
+        # 'IND' and 'India' file to the same place
+        name = re.sub(r'[^\w-]+', '_', federation_name(federation) or '') or 'UNKNOWN'
+        return os.path.join(self.directory, name)
+
+    def add(self, fide_id, federation: Optional[str], history: List[Dict]):
+        """Queue a player's history; call flush() to write it"""
+        rows = [(int(fide_id), row['month'], row['std'], row['rapid'], row['blitz'])
+                for row in history]
+        if rows:
+            with self._lock:
+                self._pending.setdefault(self._federation_dir(federation), []).extend(rows)
+
+    def flush(self):
+        """
+        Write queued histories to disk as one sorted chunk per federation
+
+        The stored columns are not touched, so a flush costs only the size of
+        its own rows; compact() merges the chunks into the columns.
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+
+            for path, rows in pending.items():
+                new = np.array(rows, dtype=np.int64).T
+                columns = {name: new[index] for index, name in enumerate(COLUMNS)}
+
+                # Sort by (month, fide_id); stable, so the newest duplicate comes last
+                key = columns['month'] << 32 | columns['fide_id']
+                order = np.argsort(key, kind='stable')
+                key = key[order]
+                keep = order[np.append(key[1:] != key[:-1], True)]
+
+                chunks = self._chunks(path)
+                number = int(CHUNK_PATTERN.match(chunks[-1]).group(1)) + 1 if chunks else 1
+                chunk = os.path.join(path, f"chunk-{number:06d}")
+                # Written under a temporary name so a chunk appears complete or not at all
+                self._save(chunk + '.tmp', {name: columns[name][keep].astype(dtype)
+                                            for name, dtype in COLUMNS.items()})
+                os.replace(chunk + '.tmp', chunk)
+
+    @staticmethod
+    def _chunks(path: str) -> List[str]:
+        """Chunk directories of a federation, oldest first"""
+        if not os.path.isdir(path):
+            return []
+        return sorted(name for name in os.listdir(path) if CHUNK_PATTERN.match(name))
+
+    def compact(self, federation: Optional[str] = None):
+        """
+        Merge flushed chunks into the stored columns
+
+        A player's months that are already stored are replaced by the newer
+        rows, so histories can be re-fetched to pick up new rating periods.
+        The columns and chunks are memory-mapped and merged one month at a
+        time, so memory use does not grow with the size of the federation.
+
+        Args:
+            federation: Only this federation (default: all)
+        """
+        with self._lock:
+            if federation is not None:
+                paths = [self._federation_dir(federation)]
+            else:
+                paths = [os.path.join(self.directory, name) for name in os.listdir(self.directory)]
+            for path in paths:
+                self._compact(path)
+
+    def _compact(self, path: str):
+        """Merge one federation's chunks (caller holds the lock)"""
+        chunks = self._chunks(path)
+        if not chunks:
+            return
+
+        # Oldest first, so the newest of duplicate rows wins
+        sources = [self._load(os.path.join(path, chunk)) for chunk in chunks]
+        base = self._load(path)
+        if base is not None:
+            sources.insert(0, base)
+
+        # Two streaming passes: count the merged rows, then write them in place
+        total = sum(len(block['month']) for block in _merge_months(sources))
+        tmp_dir = os.path.join(path, 'compact.tmp')
+        os.makedirs(tmp_dir, exist_ok=True)
+        outputs = {name: np.lib.format.open_memmap(os.path.join(tmp_dir, f"{name}.npy"), mode='w+',
+                                                   dtype=dtype, shape=(total,))
+                   for name, dtype in COLUMNS.items()}
+        position = 0
+        for block in _merge_months(sources):
+            end = position + len(block['month'])
+            for name, output in outputs.items():
+                output[position:end] = block[name]
+            position = end
+        for output in outputs.values():
+            output.flush()
+        del outputs, sources
+
+        for name in COLUMNS:
+            os.replace(os.path.join(tmp_dir, f"{name}.npy"), os.path.join(path, f"{name}.npy"))
+        os.rmdir(tmp_dir)
+        for chunk in chunks:
+            shutil.rmtree(os.path.join(path, chunk))
+
+    @staticmethod
+    def _save(path: str, columns: Dict[str, np.ndarray]):
+        """Write each column to a temporary file, then swap them in"""
+        os.makedirs(path, exist_ok=True)
+        for name, values in columns.items():
+            with open(os.path.join(path, f"{name}.npy.tmp"), 'wb') as f:
+                np.save(f, values)
+        for name in columns:
+            os.replace(os.path.join(path, f"{name}.npy.tmp"), os.path.join(path, f"{name}.npy"))
+
+    @staticmethod
+    def _load(path: str, mmap: bool = True) -> Optional[Dict[str, np.ndarray]]:
+        """Open a federation's columns (memory-mapped by default), or None"""
+        if not os.path.exists(os.path.join(path, "month.npy")):
+            return None
+        columns = {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode='r' if mmap else None)
+                   for name in COLUMNS}
+        if len({len(values) for values in columns.values()}) != 1:
+            raise ValueError(f"Rating history columns in '{path}' have different lengths")
+        return columns
+
+    def federations(self) -> List[str]:
+        """Federations with stored history"""
+        return sorted(name for name in os.listdir(self.directory)
+                      if os.path.exists(os.path.join(self.directory, name, "month.npy"))
+                      or self._chunks(os.path.join(self.directory, name)))
+
+    def _columns(self, federation: str) -> Optional[Dict[str, np.ndarray]]:
+        """A federation's memory-mapped columns, compacting flushed chunks first"""
+        path = self._federation_dir(federation)
+        if self._chunks(path):
+            with self._lock:
+                self._compact(path)
+        return self._load(path)
+
+    def query(self, federation: str, start: Union[int, str], end: Union[int, str],
+              rating: str = 'std', fide_ids: Optional[Iterable] = None) -> pd.DataFrame:
+        """
+        Ratings of a federation's players over a range of months
+
+        Only the rows inside the month range are read from disk.
+
+        Args:
+            federation: Federation code or country name, e.g. 'IND' or 'India'
+            start: First month: a year, YYYYMM or "YYYY-MM"
+            end: Last month (inclusive), in the same formats
+            rating: 'std', 'rapid' or 'blitz'
+            fide_ids: Only return these players
+
+        Returns:
+            DataFrame with 'FIDE ID', 'month' (YYYYMM) and 'rating' columns
+            for the rated months, ordered by month
+        """
+        if rating not in RATINGS:
+            raise ValueError(f"Unknown rating '{rating}' (choose from: {', '.join(RATINGS)})")
+
+        columns = self._columns(federation)
+        if columns is None:
+            return pd.DataFrame({'FIDE ID': [], 'month': [], 'rating': []}, dtype=np.int32)
+
+        months = columns['month']
+        lo = np.searchsorted(months, _month_bound(start, end=False), side='left')
+        hi = np.searchsorted(months, _month_bound(end, end=True), side='right')
+
+        ids = np.asarray(columns['fide_id'][lo:hi])
+        values = np.asarray(columns[rating][lo:hi])
+        mask = values > 0
+        if fide_ids is not None:
+            mask &= np.isin(ids, np.array([int(fide_id) for fide_id in fide_ids], dtype=np.int32))
+
+        return pd.DataFrame({
+            'FIDE ID': ids[mask],
+            'month': np.asarray(months[lo:hi])[mask],
+            'rating': values[mask],
+        })
+
+    def player_history(self, fide_id, federation: str) -> pd.DataFrame:
+        """Full monthly history of one player, all three ratings"""
+        columns = self._columns(federation)
+        if columns is None:
+            return pd.DataFrame(columns=['month'] + list(RATINGS))
+        mask = np.asarray(columns['fide_id']) == int(fide_id)
+        return pd.DataFrame({name: np.asarray(columns[name])[mask] for name in ('month',) + RATINGS})
+
+
+def _merge_months(sources: List[Dict[str, np.ndarray]]) -> Iterable[Dict[str, np.ndarray]]:
+    """
+    Merge month-sorted column sets one month at a time
+
+    Yields the rows of each month sorted by FIDE ID; where several sources
+    hold the same player and month, the row of the last source is kept.
+    """
+    positions = [0] * len(sources)
+    while True:
+        pending = [source['month'][position] for source, position in zip(sources, positions)
+                   if position < len(source['month'])]
+        if not pending:
+            return
+        month = min(pending)
+
+        parts = []
+        for index, source in enumerate(sources):
+            start = positions[index]
+            end = start + int(np.searchsorted(source['month'][start:], month, side='right'))
+            if end > start:
+                parts.append({name: np.asarray(source[name][start:end]) for name in COLUMNS})
+            positions[index] = end
+
+        ids = np.concatenate([part['fide_id'] for part in parts])
+        order = np.argsort(ids, kind='stable')
+        ids = ids[order]
+        keep = order[np.append(ids[1:] != ids[:-1], True)]
+        yield {name: np.concatenate([part[name] for part in parts])[keep] for name in COLUMNS}
+
+
+def fetch_histories(extractor, players: Iterable[Dict], store: RatingHistoryStore,
+                    flush_every: int = 1000) -> int:
+    """
+    Fetch and store the rating history of many players
+
+    Args:
+        extractor: FIDEDataExtractor; its max_workers threads fetch concurrently
+        players: Players; each history is filed under the player's federation
+        store: Store the histories are written to
+        flush_every: Players queued between writes to disk
+
+    Returns:
+        Number of players whose history was stored
+    """
+    def fetch(player):
+        return player, extractor.get_rating_history(player.fide_id)
+
+    stored = 0
+    with ThreadPoolExecutor(max_workers=extractor.max_workers) as executor:
+        pending = deque()
+
+        def finish():
+            nonlocal stored
+            player, history = pending.popleft().result()
+            if history:
+                store.add(player.fide_id, player.federation, history)
+                stored += 1
+                if stored % flush_every == 0:
+                    store.flush()
+
+        for player in players:
+            pending.append(executor.submit(fetch, player))
+            if len(pending) >= 2 * extractor.max_workers:
+                finish()
+        while pending:
+            finish()
+
+    store.flush()
+    store.compact()
+    return stored
+
+
+def main():
+    """Fetch or query rating histories from the command line"""
+    parser = argparse.ArgumentParser(description="Store and query FIDE rating histories")
+    parser.add_argument('--dir', default=RatingHistoryStore.DEFAULT_DIR,
+                        help=f"History store directory (default: {RatingHistoryStore.DEFAULT_DIR})")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    fetch = commands.add_parser('fetch', help="Fetch the history of every FIDE ID in a file")
+    fetch.add_argument('input_file', help="Text file with one FIDE ID per line")
+    fetch.add_argument('--workers', type=int, default=1,
+                       help="Number of players fetched concurrently (default: 1)")
+    fetch.add_argument('--rps', type=float, default=1.0,
+                       help="Maximum requests per second to FIDE (default: 1.0)")
+    fetch.add_argument('--store',
+                       help="Local player store used for federations instead of profile requests")
+
+    query = commands.add_parser('query', help="Export a federation's ratings over a range of months")
+    query.add_argument('federation', help="Federation code or country name, e.g. 'IND' or 'India'")
+    query.add_argument('--from', dest='start', required=True, help="First year or month (YYYY-MM)")
+    query.add_argument('--to', dest='end', required=True, help="Last year or month (YYYY-MM)")
+    query.add_argument('--rating', choices=RATINGS, default='std',
+                       help="Rating to export (default: std)")
+    query.add_argument('--output', help="CSV file to write (default: print a summary)")
+    args = parser.parse_args()
+
+    store = RatingHistoryStore(args.dir)
+
+    if args.command == 'query':
+        df = store.query(args.federation, args.start, args.end, rating=args.rating)
+        if args.output:
+            df.to_csv(args.output, index=False)
+            print(f"✓ {len(df)} ratings of {df['FIDE ID'].nunique()} players written to {args.output}")
+        else:
+            print(df.groupby('month')['rating'].describe()[['count', 'mean', 'max']].to_string())
+        return
+
+    from fide_events import ConsoleReporter
+    from fide_extractor import FIDEDataExtractor
+    from fide_store import PlayerStore
+
+    if not os.path.exists(args.input_file):
+        print(f"Error: File '{args.input_file}' not found!")
+        sys.exit(1)
+    with open(args.input_file, 'r') as f:
+        fide_ids = [line.strip() for line in f if line.strip().isdigit()]
+
+    extractor = FIDEDataExtractor(max_workers=args.workers, requests_per_second=args.rps,
+                                  store=PlayerStore(args.store) if args.store else None)
+    extractor.events.subscribe(ConsoleReporter())
+    # Profiles (or the store) supply the federation each history is filed under
+    players = (player for _, player in extractor.iter_multiple_players(fide_ids) if player)
+    count = fetch_histories(extractor, players, store)
+    print(f"\n✓ Rating history stored for {count} of {len(fide_ids)} players in {args.dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+"""
+Per-run metrics for extraction runs
+
+RunMetrics holds the counters of a run (requests, retries, cache hits,
+players extracted, ...) and latency histograms for each stage: connection
+setup, time to first byte, body download, parsing and export. It can be
+read from Python, written as a JSON run report, or exposed in Prometheus
+text format, optionally on a local /metrics endpoint:
+
+    extractor = FIDEDataExtractor(max_workers=8)
+    server = serve_metrics(extractor.stats, port=9108)
+    extractor.extract_multiple_players(ids)
+    print(extractor.stats.report())
+"""
+
+import json
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+
+# Histogram bucket upper bounds in seconds
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Help text for the Prometheus output
+DESCRIPTIONS = {
+    'connect': "New connection setup: DNS lookup, TCP connect and TLS handshake",
+    'ttfb': "Time from sending a request to receiving the response headers",
+    'download': "Time reading response bodies",
+    'parse': "Profile page parse time",
+    'export': "Time writing an export file",
+}
+
+
+class RunStats:
+    """Thread-safe per-run counters"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts = {}
+
+    def add(self, name: str, amount: int = 1):
+        """Increment a counter"""
+        with self._lock:
+            self.counts[name] = self.counts.get(name, 0) + amount
+
+    def reset(self):
+        """Clear every counter at the start of a run"""
+        with self._lock:
+            self.counts = {}
+
+    def as_dict(self) -> Dict[str, int]:
+        """Snapshot of the counters"""
+        with self._lock:
+            return dict(self.counts)
+
+
+class Histogram:
+    """Fixed-bucket latency histogram (not thread-safe; RunMetrics locks around it)"""
+
+    def __init__(self):
+        self.buckets = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float):
+        self.buckets[bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        self.max = max(self.max, seconds)
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile by interpolating inside its bucket, as Prometheus does"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            if count and seen + count >= rank:
+                lower = BUCKETS[index - 1] if index else 0.0
+                upper = BUCKETS[index] if index < len(BUCKETS) else self.max
+                return min(lower + (upper - lower) * (rank - seen) / count, self.max)
+            seen += count
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            'count': self.count,
+            'sum': round(self.sum, 6),
+            'mean': round(self.sum / self.count, 6) if self.count else 0.0,
+            'p50': round(self.quantile(0.5), 6),
+            'p90': round(self.quantile(0.9), 6),
+            'p99': round(self.quantile(0.99), 6),
+            'max': round(self.max, 6),
+        }
+
+
+class RunMetrics(RunStats):
+    """RunStats plus latency histograms per stage"""
+
+    def __init__(self):
+        super().__init__()
+        self.histograms = {}
+        self.started = time.time()
+
+    def observe(self, name: str, seconds: float):
+        """Record one duration in a histogram"""
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram()
+            histogram.observe(seconds)
+
+    @contextmanager
+    def timer(self, name: str):
+        """Record the duration of a with block"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def reset(self):
+        """Clear every counter and histogram at the start of a run"""
+        with self._lock:
+            self.counts = {}
+            self.histograms = {}
+            self.started = time.time()
+
+    def cache_hit_ratio(self) -> Optional[float]:
+        """Share of cache lookups answered from the cache (fresh or revalidated), None without lookups"""
+        counts = self.as_dict()
+        hits = counts.get('cache_hits', 0) + counts.get('cache_revalidated', 0)
+        lookups = hits + counts.get('cache_misses', 0)
+        return round(hits / lookups, 4) if lookups else None
+
+    def report(self) -> Dict:
+        """JSON-ready run report: counters, histogram summaries and derived ratios"""
+        with self._lock:
+            histograms = {name: histogram.summary() for name, histogram in self.histograms.items()}
+        return {
+            'started': self.started,
+            'duration': round(time.time() - self.started, 3),
+            'counters': self.as_dict(),
+            'cache_hit_ratio': self.cache_hit_ratio(),
+            'histograms': histograms,
+        }
+
+    def write_report(self, filename: str):
+        """Write the run report as JSON"""
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, indent=2)
+
+    def to_prometheus(self, prefix: str = 'fide_') -> str:
+        """The metrics in Prometheus text exposition format"""
+        lines = []
+        for name, value in sorted(self.as_dict().items()):
+            lines.append(f"# TYPE {prefix}{name}_total counter")
+            lines.append(f"{prefix}{name}_total {value}")
+
+        with self._lock:
+            histograms = sorted(self.histograms.items())
+            for name, histogram in histograms:
+                metric = f"{prefix}{name}_seconds"
+                if name in DESCRIPTIONS:
+                    lines.append(f"# HELP {metric} {DESCRIPTIONS[name]}")
+                lines.append(f"# TYPE {metric} histogram")
+                cumulative = 0
+                for bound, count in zip(BUCKETS, histogram.buckets):
+                    cumulative += count
+                    lines.append(f'{metric}_bucket{{le="{bound}"}} {cumulative}')
+                lines.append(f'{metric}_bucket{{le="+Inf"}} {histogram.count}')
+                lines.append(f"{metric}_sum {histogram.sum:.6f}")
+                lines.append(f"{metric}_count {histogram.count}")
+        return '\n'.join(lines) + '\n'
+
+
+def serve_metrics(metrics: RunMetrics, port: int = 9108, host: str = '127.0.0.1') -> ThreadingHTTPServer:
+    """
+    Serve metrics at http://host:port/metrics for Prometheus to scrape
+
+    The server runs on a daemon thread; call shutdown() on the returned
+    server to stop it.
+    """
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def do_GET(self):
+            if self.path.split('?')[0] != '/metrics':
+                self.send_error(404)
+                return
+            body = metrics.to_prometheus().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """
+    requests adapter that records new-connection setup time as 'connect'
+
+    urllib3 resolves the host inside connect(), so the DNS lookup is part
+    of this time; reused keep-alive connections record nothing.
+    """
+
+    def __init__(self, metrics: RunMetrics, *args, **kwargs):
+        self.metrics = metrics
+        super().__init__(*args, **kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _timed_pool(HTTPConnectionPool, self.metrics),
+            'https': _timed_pool(HTTPSConnectionPool, self.metrics),
+        }
+
+    def __setstate__(self, state):
+        # Unpickled adapters rebuild their pools before metrics could be restored
+        self.metrics = RunMetrics()
+        super().__setstate__(state)
+
+
+def _timed_pool(pool_class, metrics: RunMetrics):
+    """Connection pool class whose connections time connect()"""
+    class TimedConnection(pool_class.ConnectionCls):
+        def connect(self):
+            with metrics.timer('connect'):
+                super().connect()
+            metrics.add('connections_opened')
+
+    return type(f"Timed{pool_class.__name__}", (pool_class,), {'ConnectionCls': TimedConnection})
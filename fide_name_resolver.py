@@ -0,0 +1,229 @@
+"""
+Batch resolution of roster names to FIDE IDs
+
+Tournament entry forms contain misspelled and transliterated names,
+"Last, First" and "First Last" orders, and optional hints such as
+federation, birth year or rating. NameResolver deduplicates a roster,
+looks up candidates once per unique name (local player store first, then
+FIDE's search when the store has no good match) and scores them,
+returning the best match with a confidence between 0 and 1.
+"""
+
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+from fide_coalesce import Coalescer
+from fide_store import PlayerStore, name_similarity, normalize_name
+
+
+# Relative weight of each signal; hints only count when the roster gives them
+WEIGHTS = {
+    'name': 0.7,
+    'federation': 0.1,
+    'birth_year': 0.1,
+    'rating': 0.1,
+}
+
+# Score gap between the two best candidates needed for full confidence
+AMBIGUITY_MARGIN = 0.1
+
+# Best store score below which FIDE's search is asked as well
+ACCEPT_SCORE = 0.85
+
+
+class Resolution(NamedTuple):
+    """Outcome of resolving one roster entry"""
+    query: str
+    fide_id: Optional[str]
+    name: Optional[str]
+    confidence: float
+    candidates: List[Dict]
+
+
+def parse_roster_entry(entry: str) -> Dict:
+    """
+    Split a roster line into a name and hints
+
+    Hints follow the name, separated by ';' or tabs, and are recognized by
+    shape: a 3-letter code is the federation, a year is the birth year and
+    any other number is a rating, e.g. "Carlsen, Magnus; NOR; 1990; 2830".
+    """
+    parts = [part.strip() for part in re.split(r'[;\t]', entry) if part.strip()]
+    if not parts:
+        return {'name': ''}
+
+    parsed = {'name': parts[0]}
+    for hint in parts[1:]:
+        if re.fullmatch(r'[A-Za-z]{3}', hint):
+            parsed['federation'] = hint.upper()
+        elif re.fullmatch(r'(19|20)\d\d', hint):
+            parsed['birth_year'] = int(hint)
+        elif hint.isdigit():
+            parsed['rating'] = int(hint)
+    return parsed
+
+
+def _hint_score(hint, value, kind: str) -> float:
+    """Score one hint against a candidate value; 0.5 when the candidate lacks it"""
+    if value in (None, '', 'N/A'):
+        return 0.5
+    if kind == 'federation':
+        return 1.0 if str(value).upper() == hint else 0.0
+    try:
+        diff = abs(int(value) - hint)
+    except (TypeError, ValueError):
+        return 0.5
+    if kind == 'birth_year':
+        return {0: 1.0, 1: 0.5}.get(diff, 0.0)
+    return max(0.0, 1.0 - diff / 200)  # rating within 200 points
+
+
+class NameResolver:
+    """Resolve roster names to FIDE IDs in batches"""
+
+    def __init__(self, store: Optional[PlayerStore] = None, extractor=None,
+                 candidates_per_name: int = 20, accept_score: float = ACCEPT_SCORE):
+        """
+        Initialize the resolver
+
+        Args:
+            store: Local player store searched first (see fide_rating_lists)
+            extractor: FIDEDataExtractor whose search_player_by_name is used
+                       for names the store cannot match
+            candidates_per_name: Store candidates scored per unique name
+            accept_score: Best store candidate score accepted without also
+                          asking FIDE's search
+        """
+        self.store = store
+        self.extractor = extractor
+        self.candidates_per_name = candidates_per_name
+        self.accept_score = accept_score
+        # Matches by key; concurrent lookups of one name share a search.
+        # Misses are not kept, so a failed search is retried later.
+        self._resolved = Coalescer()
+
+    def clear(self):
+        """Forget earlier matches, e.g. at the start of a run"""
+        self._resolved.clear()
+
+    def resolve(self, entries: Iterable[Union[str, Dict]], workers: int = 1) -> List[Resolution]:
+        """
+        Resolve a whole roster
+
+        Entries are roster lines (see parse_roster_entry) or dicts with a
+        'name' and optional 'federation', 'birth_year' and 'rating'. Each
+        unique normalized name and hint combination is looked up only once.
+
+        Args:
+            entries: Roster entries
+            workers: Unique names looked up concurrently
+
+        Returns:
+            One Resolution per entry, in input order
+        """
+        parsed = [parse_roster_entry(entry) if isinstance(entry, str) else entry
+                  for entry in entries]
+        keys = [self._key(entry) for entry in parsed]
+
+        unique = {}
+        for key, entry in zip(keys, parsed):
+            unique.setdefault(key, entry)
+        if workers > 1 and len(unique) > 1:
+            with ThreadPoolExecutor(max_workers=min(workers, len(unique))) as executor:
+                resolutions = dict(zip(unique, executor.map(self._lookup, unique, unique.values())))
+        else:
+            resolutions = {key: self._lookup(key, entry) for key, entry in unique.items()}
+
+        return [resolutions[key]._replace(query=entry['name'])
+                for key, entry in zip(keys, parsed)]
+
+    def resolve_one(self, entry: Union[str, Dict]) -> Resolution:
+        """Resolve a single entry, reusing earlier matches for the same name"""
+        parsed = parse_roster_entry(entry) if isinstance(entry, str) else entry
+        return self._lookup(self._key(parsed), parsed)._replace(query=parsed['name'])
+
+    def _lookup(self, key: Tuple, entry: Dict) -> Resolution:
+        """Resolve an entry once per key, remembering only matches"""
+        resolution, _ = self._resolved.run(key, self._resolve_entry, entry)
+        if not resolution.fide_id:
+            # Possibly a network error turned into an empty search
+            self._resolved.forget(key)
+        return resolution
+
+    @staticmethod
+    def _key(entry: Dict) -> Tuple:
+        """Deduplication key: sorted name tokens plus hints"""
+        tokens = tuple(sorted(normalize_name(entry.get('name')).split()))
+        return (tokens, entry.get('federation'), entry.get('birth_year'), entry.get('rating'))
+
+    def _store_candidates(self, name: str) -> List[Dict]:
+        """Candidate records from the local store"""
+        if not self.store:
+            return []
+        return self.store.search_by_name(name, limit=self.candidates_per_name)
+
+    def _search_candidates(self, name: str) -> List[Dict]:
+        """Candidate records from FIDE's search"""
+        if not self.extractor:
+            return []
+        return [{
+            'fide_id': result['FIDE ID'],
+            'name': result['Name'],
+            'search_name': normalize_name(result['Name']),
+            'federation': result.get('Federation'),
+        } for result in self.extractor.search_player_by_name(name, local=False)]
+
+    def _scored(self, entry: Dict, tokens: List[str], candidates: List[Dict]) -> List[Dict]:
+        """Candidates with their score set, best first"""
+        for candidate in candidates:
+            candidate['score'] = round(self._score(entry, tokens, candidate), 3)
+        return sorted(candidates, key=lambda candidate: -candidate['score'])
+
+    def _resolve_entry(self, entry: Dict) -> Resolution:
+        """Score every candidate for one unique entry"""
+        name = entry.get('name', '')
+        tokens = normalize_name(name).split()
+        if not tokens:
+            return Resolution(name, None, None, 0.0, [])
+
+        candidates = self._scored(entry, tokens, self._store_candidates(name))
+        if not candidates or candidates[0]['score'] < self.accept_score:
+            # The player may be missing from the store: let FIDE's search compete.
+            # Store records win duplicates, as they carry more fields to score.
+            known = {str(candidate['fide_id']) for candidate in candidates}
+            searched = [candidate for candidate in self._search_candidates(name)
+                        if str(candidate['fide_id']) not in known]
+            candidates = self._scored(entry, tokens, candidates + searched)
+
+        if not candidates:
+            return Resolution(name, None, None, 0.0, [])
+
+        best = candidates[0]
+        confidence = best['score']
+        if len(candidates) > 1:
+            # Two near-equal candidates halve the confidence
+            margin = best['score'] - candidates[1]['score']
+            confidence *= min(1.0, 0.5 + 0.5 * margin / AMBIGUITY_MARGIN)
+
+        return Resolution(name, str(best['fide_id']), best['name'], round(confidence, 3), candidates)
+
+    @staticmethod
+    def _score(entry: Dict, tokens: List[str], candidate: Dict) -> float:
+        """Weighted name and hint score of one candidate"""
+        candidate_name = candidate.get('search_name') or normalize_name(candidate.get('name'))
+
+        # Penalize extra or missing words by scoring in both directions
+        forward = name_similarity(tokens, candidate_name)
+        backward = name_similarity(candidate_name.split(), ' '.join(tokens))
+        scores = {'name': 0.8 * forward + 0.2 * backward}
+
+        if entry.get('federation'):
+            scores['federation'] = _hint_score(entry['federation'], candidate.get('federation'), 'federation')
+        if entry.get('birth_year'):
+            scores['birth_year'] = _hint_score(entry['birth_year'], candidate.get('birth_year'), 'birth_year')
+        if entry.get('rating'):
+            scores['rating'] = _hint_score(entry['rating'], candidate.get('rating_std'), 'rating')
+
+        total_weight = sum(WEIGHTS[signal] for signal in scores)
+        return sum(WEIGHTS[signal] * score for signal, score in scores.items()) / total_weight
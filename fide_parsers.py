@@ -0,0 +1,209 @@
+"""
+Parser backends for FIDE profile pages
+
+Every backend takes the profile HTML and FIDE ID and returns the same
+Player. 'bs4' uses BeautifulSoup with the built-in html.parser;
+'lxml' selects only the title and profile-* nodes with a single XPath
+query and is several times faster (requires: pip install lxml).
+"""
+
+import re
+from typing import Callable, Dict
+
+from fide_player import Player
+
+
+TITLE_MAP = {
+    'Grandmaster': 'GM',
+    'International Master': 'IM',
+    'FIDE Master': 'FM',
+    'Candidate Master': 'CM',
+    'Woman Grandmaster': 'WGM',
+    'Women Grandmaster': 'WGM',
+    'Woman International Master': 'WIM',
+    'Women International Master': 'WIM',
+    'Women Intl. Master': 'WIM',
+    'Woman FIDE Master': 'WFM',
+    'Women FIDE Master': 'WFM',
+    'Woman Candidate Master': 'WCM',
+    'Women Candidate Master': 'WCM',
+}
+
+RATING_CLASSES = {
+    'profile-standart': 'Rating std',
+    'profile-rapid': 'Rating rapid',
+    'profile-blitz': 'Rating blitz',
+}
+
+
+def abbreviate_title(title: str) -> str:
+    """Abbreviate chess titles"""
+    return TITLE_MAP.get(title, title)
+
+
+def _new_player(fide_id: str, name: str) -> Dict:
+    """Create a player dict with every field set to N/A"""
+    return {
+        'FIDE ID': fide_id,
+        'Name': name,
+        'Federation': 'N/A',
+        'B-Year': 'N/A',
+        'Age': 'N/A',
+        'Rating std': 'N/A',
+        'Rating rapid': 'N/A',
+        'Rating blitz': 'N/A',
+        'Title': 'N/A'
+    }
+
+
+def _apply_rating(data: Dict, field: str, text: str):
+    """Store the first number of a rating block, e.g. "1525STANDARD inactive\""""
+    rating_match = re.search(r'(\d+)', text.strip())
+    if rating_match:
+        data[field] = rating_match.group(1)
+
+
+def _apply_birth_year(data: Dict, text: str):
+    """Store the birth year from a B-Year info row and derive the age"""
+    year_match = re.search(r'(\d{4})', text)
+    if year_match:
+        data['B-Year'] = year_match.group(1)
+        data['Age'] = str(2025 - int(data['B-Year']))
+
+
+def _apply_title(data: Dict, text: str):
+    """Store the abbreviated FIDE title unless it is 'None'"""
+    title = text.strip()
+    if title and title.lower() != 'none':
+        data['Title'] = abbreviate_title(title)
+
+
+def _name_from_title(text: str) -> str:
+    """Title format: "Last, First FIDE Profile\""""
+    return text.replace(' FIDE Profile', '').strip()
+
+
+def parse_player_page_bs4(html: str, fide_id: str) -> Player:
+    """Parse a profile page with BeautifulSoup"""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, 'html.parser')
+
+    # Extract player name from title or profile-title-container
+    name = "N/A"
+    title_tag = soup.find('title')
+    if title_tag:
+        name = _name_from_title(title_tag.text) or name
+
+    if name == "N/A":
+        name_elem = soup.find('div', class_='profile-title-container')
+        if name_elem:
+            name = name_elem.text.strip()
+
+    data = _new_player(fide_id, name)
+
+    for css_class, field in RATING_CLASSES.items():
+        game = soup.find('div', class_=css_class)
+        if game:
+            _apply_rating(data, field, game.text)
+
+    country_elem = soup.find('div', class_='profile-info-country')
+    if country_elem:
+        country = country_elem.text.strip()
+        if country:
+            data['Federation'] = country
+
+    # Extract birth year and title from profile-info-row divs
+    for row in soup.find_all('div', class_='profile-info-row'):
+        text = row.text.strip()
+        if 'B-Year' in text:
+            _apply_birth_year(data, text)
+        elif 'FIDE title' in text:
+            title_div = row.find('div', class_='profile-info-title')
+            if title_div:
+                _apply_title(data, title_div.text)
+
+    return Player.from_dict(data)
+
+
+def parse_player_page_lxml(html: str, fide_id: str) -> Player:
+    """Parse a profile page with lxml, visiting only the nodes the dict needs"""
+    from lxml import html as lxml_html
+
+    # lxml refuses empty documents; html.parser yields an all-N/A record
+    if not html.strip():
+        return Player.from_dict(_new_player(fide_id, "N/A"))
+
+    parser = lxml_html.HTMLParser(encoding='utf-8')
+    root = lxml_html.fromstring(html.encode('utf-8'), parser=parser)
+
+    title_text = None
+    title_container = None
+    games = {}
+    country_elem = None
+    info_rows = []
+
+    # One document-order pass over <title> and the profile-* divs
+    for node in root.xpath("//title | //div[contains(@class, 'profile-')]"):
+        if node.tag == 'title':
+            if title_text is None:
+                title_text = node.text_content()
+            continue
+
+        classes = node.get('class').split()
+        for css_class in classes:
+            if css_class in RATING_CLASSES:
+                games.setdefault(css_class, node)
+        if 'profile-title-container' in classes and title_container is None:
+            title_container = node
+        if 'profile-info-country' in classes and country_elem is None:
+            country_elem = node
+        if 'profile-info-row' in classes:
+            info_rows.append(node)
+
+    name = "N/A"
+    if title_text is not None:
+        name = _name_from_title(title_text) or name
+    if name == "N/A" and title_container is not None:
+        name = title_container.text_content().strip()
+
+    data = _new_player(fide_id, name)
+
+    for css_class, field in RATING_CLASSES.items():
+        if css_class in games:
+            _apply_rating(data, field, games[css_class].text_content())
+
+    if country_elem is not None:
+        country = country_elem.text_content().strip()
+        if country:
+            data['Federation'] = country
+
+    for row in info_rows:
+        text = row.text_content().strip()
+        if 'B-Year' in text:
+            _apply_birth_year(data, text)
+        elif 'FIDE title' in text:
+            for title_div in row.iterdescendants('div'):
+                if 'profile-info-title' in (title_div.get('class') or '').split():
+                    _apply_title(data, title_div.text_content())
+                    break
+
+    return Player.from_dict(data)
+
+
+PARSERS = {
+    'bs4': parse_player_page_bs4,
+    'lxml': parse_player_page_lxml,
+}
+
+
+def get_parser(name: str) -> Callable[[str, str], Player]:
+    """Look up a parser backend by name"""
+    if name not in PARSERS:
+        raise ValueError(f"Unknown parser '{name}' (choose from: {', '.join(PARSERS)})")
+    if name == 'lxml':
+        try:
+            import lxml  # noqa: F401
+        except ImportError:
+            raise ImportError("The 'lxml' parser requires lxml: pip install lxml")
+    return PARSERS[name]
@@ -0,0 +1,198 @@
+"""
+Typed player records
+
+Player is the one record type every extractor returns: ratings, years and
+ranks are ints and missing values are None rather than 'N/A' strings.
+get() and to_dict() still speak the original column-name format
+('Rating std', 'N/A', ...) for display code, and PlayerTable holds many
+players as typed arrays for analytics.
+"""
+
+from array import array
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, NamedTuple, Optional, Union
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+# Ages are given relative to this year, as on the FIDE profile pages
+AGE_YEAR = 2025
+
+# Column names of the original player dict format and the Player field of each
+COLUMN_FIELDS = {
+    'FIDE ID': 'fide_id',
+    'Name': 'name',
+    'Federation': 'federation',
+    'Title': 'title',
+    'B-Year': 'birth_year',
+    'Age': 'age',
+    'Rating std': 'rating_std',
+    'Rating rapid': 'rating_rapid',
+    'Rating blitz': 'rating_blitz',
+    'World Rank': 'world_rank',
+}
+
+INTEGER_FIELDS = ('fide_id', 'birth_year', 'rating_std', 'rating_rapid', 'rating_blitz', 'world_rank')
+TEXT_FIELDS = ('name', 'federation', 'title')
+
+
+def _integer(value) -> Optional[int]:
+    """An int field value, None for 'N/A', empty or non-numeric values"""
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    text = str(value).strip()
+    return int(text) if text.isdigit() else None
+
+
+def _text(value) -> Optional[str]:
+    """A text field value, None for 'N/A' or empty values"""
+    if value is None:
+        return None
+    text = str(value).strip()
+    return text if text and text != 'N/A' else None
+
+
+class Player(NamedTuple):
+    """One player's data; missing values are None"""
+    fide_id: int
+    name: Optional[str] = None
+    federation: Optional[str] = None
+    title: Optional[str] = None
+    birth_year: Optional[int] = None
+    rating_std: Optional[int] = None
+    rating_rapid: Optional[int] = None
+    rating_blitz: Optional[int] = None
+    world_rank: Optional[int] = None
+
+    @property
+    def age(self) -> Optional[int]:
+        """Age derived from the birth year"""
+        return AGE_YEAR - self.birth_year if self.birth_year else None
+
+    def get(self, column: str, default=None):
+        """Value of a column of the original dict format ('Rating std', ...), or default if missing"""
+        field = COLUMN_FIELDS.get(column)
+        value = getattr(self, field) if field else None
+        return default if value is None else value
+
+    def to_record(self) -> Dict:
+        """Typed dict keyed by column name, for JSON and exports ('World Rank' only when known)"""
+        record = {column: getattr(self, field) for column, field in COLUMN_FIELDS.items()}
+        if self.world_rank is None:
+            del record['World Rank']
+        return record
+
+    def to_dict(self) -> Dict:
+        """The original all-string player dict, with 'N/A' for missing values"""
+        return {column: 'N/A' if value is None else str(value)
+                for column, value in self.to_record().items()}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Player':
+        """Build a Player from a player dict, either typed or with 'N/A' strings"""
+        values = {}
+        for column, field in COLUMN_FIELDS.items():
+            if field in INTEGER_FIELDS:
+                values[field] = _integer(data.get(column))
+            elif field in TEXT_FIELDS:
+                values[field] = _text(data.get(column))
+        return cls(**values)
+
+
+def as_player(player: Union[Player, Dict]) -> Player:
+    """Accept a Player or a player dict"""
+    return player if isinstance(player, Player) else Player.from_dict(player)
+
+
+class PlayerTable:
+    """
+    Column-oriented collection of players
+
+    Integer fields are kept in compact int32 arrays (0 meaning missing,
+    which no FIDE ID, year, rating or rank uses) and text fields in lists,
+    so large rosters take a fraction of the memory of player dicts and
+    columns can be analysed with NumPy directly.
+    """
+
+    def __init__(self):
+        self._ints = {field: array('i') for field in INTEGER_FIELDS}
+        self._texts = {field: [] for field in TEXT_FIELDS}
+
+    @classmethod
+    def from_players(cls, players: Iterable[Union[Player, Dict]]) -> 'PlayerTable':
+        """Build a table from Players or player dicts"""
+        table = cls()
+        table.extend(players)
+        return table
+
+    def append(self, player: Union[Player, Dict]):
+        """Add one player"""
+        player = as_player(player)
+        for field, values in self._ints.items():
+            values.append(getattr(player, field) or 0)
+        for field, values in self._texts.items():
+            values.append(getattr(player, field))
+
+    def extend(self, players: Iterable[Union[Player, Dict]]):
+        """Add many players"""
+        for player in players:
+            self.append(player)
+
+    def __len__(self) -> int:
+        return len(self._ints['fide_id'])
+
+    def __getitem__(self, index: int) -> Player:
+        fields = {field: values[index] or None for field, values in self._ints.items()}
+        fields.update({field: values[index] for field, values in self._texts.items()})
+        return Player(**fields)
+
+    def __iter__(self) -> Iterator[Player]:
+        return (self[index] for index in range(len(self)))
+
+    def column(self, field: str) -> Union['np.ma.MaskedArray', List[Optional[str]]]:
+        """
+        One field for every player
+
+        Integer fields come back as NumPy masked arrays (missing values
+        masked, so e.g. column('rating_std').mean() skips unrated players);
+        text fields as lists.
+        """
+        if field in self._texts:
+            return self._texts[field]
+        if field == 'age':
+            years = self.column('birth_year')
+            return AGE_YEAR - years
+        if field not in self._ints:
+            raise KeyError(f"Unknown player field '{field}'")
+        import numpy as np
+
+        # Copied: a NumPy view would lock the array against further appends
+        return np.ma.masked_equal(np.array(self._ints[field], dtype=np.int32), 0)
+
+    def filter(self, mask) -> 'PlayerTable':
+        """Players where a boolean mask (one entry per player) is true"""
+        import numpy as np
+
+        mask = np.asarray(np.ma.filled(mask, False), dtype=bool)
+        table = PlayerTable()
+        for field, values in self._ints.items():
+            table._ints[field] = array('i', np.array(values, dtype=np.int32)[mask].tobytes())
+        for field, values in self._texts.items():
+            table._texts[field] = [value for value, keep in zip(values, mask) if keep]
+        return table
+
+    def to_frame(self):
+        """pandas DataFrame with nullable integer columns"""
+        import numpy as np
+        import pandas as pd
+
+        data = {}
+        for field in Player._fields:
+            if field in self._ints:
+                values = self.column(field)
+                data[field] = pd.arrays.IntegerArray(values.data, np.ma.getmaskarray(values))
+            else:
+                data[field] = self._texts[field]
+        return pd.DataFrame(data)
@@ -0,0 +1,350 @@
+"""
+Request rate control shared by the FIDE extractors
+
+RateLimiter spaces requests to a fixed budget. RateController adds what a
+long batch run needs on top: an AIMD rate that backs off on 429/503,
+Retry-After and rising latency, retries with jittered exponential
+backoff, a circuit breaker, and per-run failure counts.
+"""
+
+import asyncio
+import email.utils
+import random
+import threading
+import time
+from typing import Optional
+
+import requests
+
+from fide_metrics import RunMetrics
+
+
+class RateLimiter:
+    """Thread-safe limiter that spaces requests to a global requests-per-second budget"""
+
+    def __init__(self, requests_per_second: Optional[float] = 1.0):
+        """
+        Initialize the rate limiter
+
+        Args:
+            requests_per_second: Maximum request rate shared by all threads
+                                 (None or 0 disables limiting)
+        """
+        self.interval = 1.0 / requests_per_second if requests_per_second else 0.0
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until the caller may send its next request"""
+        if not self.interval:
+            return
+
+        # Reserve the next free slot under the lock, then sleep outside it
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+
+        wait = slot - now
+        if wait > 0:
+            time.sleep(wait)
+
+    def pause(self, seconds: float):
+        """Hold back every request for the given number of seconds"""
+        with self._lock:
+            self._next_slot = max(self._next_slot, time.monotonic() + seconds)
+
+
+class AdaptiveRateLimiter(RateLimiter):
+    """
+    RateLimiter whose rate adapts AIMD-style to server feedback
+
+    Each success adds increase_step requests/second up to max_rate; a
+    throttling response or a latency spike multiplies the rate by
+    decrease_factor, never going below min_rate.
+    """
+
+    def __init__(self, requests_per_second: Optional[float] = 1.0,
+                 min_rate: float = 0.1, max_rate: Optional[float] = None,
+                 increase_step: float = 0.05, decrease_factor: float = 0.5,
+                 latency_factor: float = 3.0):
+        """
+        Initialize the adaptive limiter
+
+        Args:
+            requests_per_second: Starting rate (None or 0 disables limiting;
+                                 only Retry-After pauses then apply)
+            min_rate: Lowest rate backed off to
+            max_rate: Highest rate recovered to (default: the starting rate,
+                      so the configured politeness budget is never exceeded)
+            increase_step: Requests/second added per successful request
+            decrease_factor: Rate multiplier applied when throttled
+            latency_factor: A response slower than this multiple of the
+                            average latency counts as a congestion signal
+        """
+        super().__init__(requests_per_second)
+        self.rate = requests_per_second or 0.0
+        self.min_rate = min_rate
+        self.max_rate = max_rate or self.rate
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        self.latency_factor = latency_factor
+        self._avg_latency = None
+
+    def _set_rate(self, rate: float):
+        """Apply a new rate (caller holds the lock)"""
+        self.rate = min(self.max_rate, max(self.min_rate, rate))
+        self.interval = 1.0 / self.rate
+
+    def on_success(self, latency: float):
+        """Additive increase, or a mild decrease if latency spiked"""
+        if not self.rate:
+            return
+        with self._lock:
+            if self._avg_latency is None:
+                self._avg_latency = latency
+            spiked = latency > self.latency_factor * self._avg_latency
+            self._avg_latency = 0.9 * self._avg_latency + 0.1 * latency
+            if spiked:
+                self._set_rate(self.rate * (1 + self.decrease_factor) / 2)
+            else:
+                self._set_rate(self.rate + self.increase_step)
+
+    def on_throttle(self, retry_after: Optional[float] = None):
+        """Multiplicative decrease, honouring the server's Retry-After"""
+        if retry_after:
+            self.pause(retry_after)
+        if not self.rate:
+            return
+        with self._lock:
+            self._set_rate(self.rate * self.decrease_factor)
+
+
+class CircuitOpenError(Exception):
+    """Raised by CircuitBreaker.allow(wait=False) while the circuit is open"""
+
+
+class CircuitBreaker:
+    """
+    Stop sending requests after repeated failures, then probe again after a cooldown
+
+    While the circuit is open, callers wait instead of failing, so queued
+    work is delayed through an outage rather than dropped. After the
+    cooldown a single trial request goes through; the other callers wait
+    for its outcome and either proceed or wait out another cooldown.
+    """
+
+    def __init__(self, failure_threshold: int = 5, cooldown: float = 30.0):
+        """
+        Initialize the circuit breaker
+
+        Args:
+            failure_threshold: Consecutive failed requests that open the circuit
+            cooldown: Seconds the circuit stays open before a trial request
+        """
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._failures = 0
+        self._opened_at = None
+        # When the half-open trial request was let through, None when there is none
+        self._trial_started = None
+        self._changed = threading.Condition(threading.Lock())
+
+    def allow(self, wait: bool = True) -> float:
+        """
+        Wait until a request may be sent
+
+        Args:
+            wait: Block while the circuit is open (False raises CircuitOpenError instead)
+
+        Returns:
+            Seconds spent waiting
+        """
+        start = None
+        with self._changed:
+            while True:
+                now = time.monotonic()
+                start = start or now
+                if self._opened_at is not None:
+                    remaining = self._opened_at + self.cooldown - now
+                    if remaining <= 0:
+                        # Half-open: let this request through as a trial
+                        self._opened_at = None
+                        self._trial_started = now
+                        self._failures = self.failure_threshold - 1
+                        return now - start
+                elif self._trial_started is not None:
+                    # A trial that never reported back no longer blocks anyone
+                    remaining = self._trial_started + self.cooldown - now
+                    if remaining <= 0:
+                        self._trial_started = now
+                        return now - start
+                else:
+                    return now - start
+
+                if not wait:
+                    raise CircuitOpenError(f"Too many failures; pausing requests for {remaining:.0f}s")
+                self._changed.wait(remaining)
+
+    def record_success(self):
+        """Close the circuit"""
+        with self._changed:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_started = None
+            self._changed.notify_all()
+
+    def record_failure(self):
+        """Count a failure and open the circuit at the threshold"""
+        with self._changed:
+            self._failures += 1
+            if self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+                self._trial_started = None
+                self._changed.notify_all()
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)"""
+    if not value:
+        return None
+    if value.strip().isdigit():
+        return float(value)
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+class RateController:
+    """Adaptive rate limiting, retries with backoff and a circuit breaker for one extractor"""
+
+    # Status codes worth retrying; 429 and 503 also slow the request rate
+    RETRY_STATUSES = {429, 500, 502, 503, 504}
+    THROTTLE_STATUSES = {429, 503}
+
+    def __init__(self, requests_per_second: Optional[float] = 1.0, max_retries: int = 3,
+                 backoff_base: float = 1.0, backoff_cap: float = 30.0,
+                 limiter: Optional[AdaptiveRateLimiter] = None,
+                 breaker: Optional[CircuitBreaker] = None, max_retry_after: float = 120.0):
+        """
+        Initialize the rate controller
+
+        Args:
+            requests_per_second: Starting (and maximum) request rate
+            max_retries: Retries per request after the first attempt
+            backoff_base: Base delay in seconds for exponential backoff
+            backoff_cap: Maximum backoff delay in seconds
+            limiter: Custom adaptive limiter (default: built from requests_per_second)
+            breaker: Custom circuit breaker
+            max_retry_after: Longest Retry-After honoured, in seconds; longer
+                             (or far-future) values are cut to this
+        """
+        self.limiter = limiter or AdaptiveRateLimiter(requests_per_second)
+        self.breaker = breaker or CircuitBreaker()
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.max_retry_after = max_retry_after
+        self.stats = RunMetrics()
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff delay for a retry attempt"""
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+
+    def request(self, session: requests.Session, url: str, **kwargs) -> requests.Response:
+        """
+        Send a GET request within the rate limit, retrying transient failures
+
+        Returns the first non-retryable response (including 4xx, which the
+        caller handles). Raises the last error once retries are exhausted.
+        While the circuit breaker is open the request waits for it to close
+        instead of failing.
+        """
+        kwargs.setdefault('timeout', 10)
+
+        for attempt in range(self.max_retries + 1):
+            waited = self.breaker.allow()
+            if waited:
+                self.stats.add('circuit_waits')
+                self.stats.observe('circuit_wait', waited)
+
+            self.limiter.acquire()
+            self.stats.add('requests')
+            start = time.monotonic()
+            retry_after = None
+
+            try:
+                response = session.get(url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                self.stats.add('network_errors')
+                error = e
+            else:
+                # elapsed stops at the response headers; the rest is the body download
+                total = time.monotonic() - start
+                ttfb = response.elapsed.total_seconds()
+                self.stats.observe('ttfb', ttfb)
+                self.stats.observe('download', max(0.0, total - ttfb))
+
+                if response.status_code not in self.RETRY_STATUSES:
+                    self.limiter.on_success(time.monotonic() - start)
+                    self.breaker.record_success()
+                    return response
+
+                if response.status_code in self.THROTTLE_STATUSES:
+                    self.stats.add('throttled')
+                    retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                    if retry_after is not None:
+                        # One bad header must not stall every worker indefinitely
+                        retry_after = min(retry_after, self.max_retry_after)
+                    self.limiter.on_throttle(retry_after)
+                else:
+                    self.stats.add('server_errors')
+                error = requests.HTTPError(f"{response.status_code} Error for url: {url}",
+                                           response=response)
+
+            self.breaker.record_failure()
+            if attempt == self.max_retries:
+                raise error
+
+            self.stats.add('retries')
+            time.sleep(retry_after if retry_after is not None else self.backoff(attempt))
+
+
+class AsyncTokenBucket:
+    """Token-bucket rate limiter for asyncio tasks"""
+
+    def __init__(self, rate: Optional[float], burst: Optional[float] = None):
+        """
+        Initialize the token bucket
+
+        Args:
+            rate: Tokens (requests) added per second (None or 0 disables limiting)
+            burst: Bucket capacity, i.e. requests allowed back to back
+                   (default: one second's worth)
+        """
+        self.rate = rate
+        self.capacity = burst or max(1.0, rate or 0.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = None
+
+    async def acquire(self):
+        """Wait until a token is available and take it"""
+        if not self.rate:
+            return
+
+        # Created lazily so the bucket binds to the running event loop
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
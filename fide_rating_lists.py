@@ -0,0 +1,245 @@
+"""
+Import the official FIDE rating-list downloads into the local player store
+
+FIDE publishes monthly standard, rapid and blitz lists (and a combined
+list) at https://ratings.fide.com/download_lists.phtml as zipped TXT and
+XML files. The files are stream-parsed from a local path, so a full list
+of over a million players is imported in one pass without network access.
+
+Usage: python fide_rating_lists.py <list_file> [<list_file> ...] [--db fide_players.sqlite]
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+import xml.etree.ElementTree as ET
+import zipfile
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from fide_store import PlayerStore
+
+
+LIST_TYPES = ('standard', 'rapid', 'blitz')
+
+RATING_COLUMNS = {
+    'standard': 'rating_std',
+    'rapid': 'rating_rapid',
+    'blitz': 'rating_blitz',
+}
+
+# Fixed-width TXT header labels and the store column each one fills
+TXT_COLUMNS = {
+    'ID Number': 'fide_id',
+    'Name': 'name',
+    'Fed': 'federation',
+    'Sex': 'sex',
+    'Tit': 'title',
+    'WTit': 'w_title',
+    'SRtng': 'rating_std',
+    'RRtng': 'rating_rapid',
+    'BRtng': 'rating_blitz',
+    'B-day': 'birth_year',
+    'Flag': 'flag',
+}
+
+# XML element names and the store column each one fills
+XML_FIELDS = {
+    'fideid': 'fide_id',
+    'name': 'name',
+    'country': 'federation',
+    'sex': 'sex',
+    'title': 'title',
+    'w_title': 'w_title',
+    'rapid_rating': 'rating_rapid',
+    'blitz_rating': 'rating_blitz',
+    'birthday': 'birth_year',
+    'flag': 'flag',
+}
+
+# Single-list TXT files label the rating column with the list month, e.g. "Oct25" or "OCT25"
+MONTH_COLUMN = re.compile(r'^[a-z]{3}\d{2}$', re.IGNORECASE)
+
+INTEGER_COLUMNS = ('fide_id', 'birth_year', 'rating_std', 'rating_rapid', 'rating_blitz')
+
+
+def detect_list_type(filename: str) -> Optional[str]:
+    """Guess standard/rapid/blitz from a file name; None for the combined list"""
+    lower = os.path.basename(filename).lower()
+    for list_type in LIST_TYPES:
+        if list_type in lower:
+            return list_type
+    return None
+
+
+def _decode(line: bytes) -> str:
+    """Decode a list line; older files are Latin-1 rather than UTF-8"""
+    try:
+        return line.decode('utf-8')
+    except UnicodeDecodeError:
+        return line.decode('latin-1')
+
+
+def _normalize(raw: Dict) -> Optional[Dict]:
+    """Convert raw string fields to a store record, or None if unusable"""
+    record = {}
+    for column, value in raw.items():
+        value = value.strip() if value else ''
+        if column in INTEGER_COLUMNS:
+            record[column] = int(value) if value.isdigit() and int(value) else None
+        else:
+            record[column] = value or None
+
+    if not record.get('fide_id'):
+        return None
+
+    # The profile shows the open title if any, otherwise the women's title
+    w_title = record.pop('w_title', None)
+    record['title'] = record.get('title') or w_title
+    return record
+
+
+def _txt_columns(header: str, list_type: Optional[str]) -> List[Tuple[str, int, int]]:
+    """
+    Derive (column, start, end) slices from the header line positions
+
+    Raises ValueError when the header has no ID or no rating column, rather
+    than importing players without ratings.
+    """
+    labels = [(match.start(), match.group()) for match in re.finditer(r'ID Number|\S+', header)]
+    columns = []
+    for index, (start, label) in enumerate(labels):
+        end = labels[index + 1][0] if index + 1 < len(labels) else None
+        if label in TXT_COLUMNS:
+            column = TXT_COLUMNS[label]
+        elif MONTH_COLUMN.match(label):
+            column = RATING_COLUMNS[list_type or 'standard']
+        else:
+            continue
+        columns.append((column, start, end))
+
+    found = {column for column, _, _ in columns}
+    if 'fide_id' not in found:
+        raise ValueError(f"No 'ID Number' column in the rating list header: {header.strip()!r}")
+    if not found & set(RATING_COLUMNS.values()):
+        raise ValueError(f"No rating column in the rating list header: {header.strip()!r}")
+    return columns
+
+
+def iter_txt_records(stream, list_type: Optional[str] = None) -> Iterator[Dict]:
+    """Stream-parse a fixed-width TXT rating list from a binary file object"""
+    columns = None
+    for raw_line in stream:
+        line = _decode(raw_line).rstrip('\r\n')
+        if not line.strip():
+            continue
+        if columns is None:
+            columns = _txt_columns(line, list_type)
+            continue
+
+        record = _normalize({column: line[start:end] for column, start, end in columns})
+        if record:
+            yield record
+
+
+def iter_xml_records(stream, list_type: Optional[str] = None) -> Iterator[Dict]:
+    """
+    Stream-parse an XML rating list, discarding each <player> once read
+
+    Raises ValueError when the first player has no rating element.
+    """
+    fields = dict(XML_FIELDS, rating=RATING_COLUMNS[list_type or 'standard'])
+    rating_columns = set(RATING_COLUMNS.values())
+    root = None
+    checked = False
+
+    for event, elem in ET.iterparse(stream, events=('start', 'end')):
+        if root is None:
+            root = elem
+        if event != 'end' or elem.tag != 'player':
+            continue
+        raw = {fields[child.tag]: child.text for child in elem if child.tag in fields}
+        if not checked:
+            if not rating_columns & set(raw):
+                raise ValueError(f"No rating element in the rating list's <player> records: "
+                                 f"{', '.join(child.tag for child in elem)}")
+            checked = True
+        # Drop parsed players so memory stays flat on million-row lists
+        root.clear()
+        record = _normalize(raw)
+        if record:
+            yield record
+
+
+def iter_rating_list(path: str, list_type: Optional[str] = None) -> Iterator[Dict]:
+    """
+    Stream player records from a rating-list download
+
+    Args:
+        path: Local .zip, .txt or .xml file
+        list_type: 'standard', 'rapid' or 'blitz' for single lists
+                   (default: guessed from the file name)
+    """
+    list_type = list_type or detect_list_type(path)
+
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            for member in archive.namelist():
+                member_type = list_type or detect_list_type(member)
+                with archive.open(member) as stream:
+                    if member.lower().endswith('.xml'):
+                        yield from iter_xml_records(stream, member_type)
+                    elif member.lower().endswith('.txt'):
+                        yield from iter_txt_records(stream, member_type)
+        return
+
+    with open(path, 'rb') as stream:
+        if path.lower().endswith('.xml'):
+            yield from iter_xml_records(stream, list_type)
+        else:
+            yield from iter_txt_records(stream, list_type)
+
+
+def import_rating_list(path: str, store: PlayerStore, list_type: Optional[str] = None) -> int:
+    """Import one rating-list file into the store; returns the number of players"""
+    count = store.upsert_many(iter_rating_list(path, list_type), update_index=False)
+    store.rebuild_name_index()
+    return count
+
+
+def main():
+    """Import rating-list files given on the command line"""
+    parser = argparse.ArgumentParser(description="Import FIDE rating-list downloads into the local player store")
+    parser.add_argument('files', nargs='+', help="Rating-list files (.zip, .txt or .xml)")
+    parser.add_argument('--db', default=PlayerStore.DEFAULT_PATH,
+                        help=f"Player store database (default: {PlayerStore.DEFAULT_PATH})")
+    parser.add_argument('--list', choices=LIST_TYPES,
+                        help="List type for single lists (default: guessed from the file name)")
+    args = parser.parse_args()
+
+    store = PlayerStore(args.db)
+    print("=" * 60)
+    print("FIDE Rating List Import")
+    print("=" * 60)
+
+    for path in args.files:
+        if not os.path.exists(path):
+            print(f"Error: File '{path}' not found!")
+            sys.exit(1)
+
+        start = time.time()
+        try:
+            count = import_rating_list(path, store, args.list)
+        except ValueError as e:
+            print(f"Error: {path}: {e}")
+            sys.exit(1)
+        print(f"✓ {path}: {count} players in {time.time() - start:.1f}s")
+
+    print(f"\nPlayers in store: {store.count()}")
+    print("=" * 60)
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,327 @@
+"""
+Local indexed store of FIDE players
+"""
+
+import difflib
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+
+from fide_federations import federation_code, federation_name
+from fide_player import Player, as_player
+
+
+def normalize_name(name: Optional[str]) -> str:
+    """Lowercase a name and strip diacritics and punctuation ("Müller, Anna" -> "muller anna")"""
+    if not name:
+        return ''
+    decomposed = unicodedata.normalize('NFKD', name)
+    ascii_name = ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return ' '.join(re.sub(r'[^\w]+', ' ', ascii_name.lower()).split())
+
+
+def name_similarity(query_tokens: List[str], name: str) -> float:
+    """
+    Score how well query tokens match a normalized name, ignoring word order
+
+    Each query token scores 1.0 if it equals a name token, 0.9-1.0 if it is
+    a prefix of one, otherwise its best difflib ratio against any name token;
+    the result is the mean.
+    """
+    name_tokens = name.split()
+    if not query_tokens or not name_tokens:
+        return 0.0
+
+    total = 0.0
+    for token in query_tokens:
+        best = 0.0
+        for candidate in name_tokens:
+            if candidate.startswith(token):
+                best = max(best, 0.9 + 0.1 * len(token) / len(candidate))
+            else:
+                best = max(best, difflib.SequenceMatcher(None, token, candidate).ratio())
+        total += best
+    return total / len(query_tokens)
+
+
+class PlayerStore:
+    """
+    SQLite store of player records, filled from the official FIDE rating lists
+
+    Names are indexed twice with FTS5: a word index for exact and prefix
+    matches and a trigram index for fuzzy matches on misspelled names.
+    """
+
+    DEFAULT_PATH = "fide_players.sqlite"
+    SCHEMA_VERSION = 1
+
+    # Columns that can be set from a record; fide_id is the primary key
+    COLUMNS = ('name', 'federation', 'sex', 'title', 'birth_year',
+               'rating_std', 'rating_rapid', 'rating_blitz', 'flag')
+
+    def __init__(self, path: str = DEFAULT_PATH):
+        """
+        Open (or create) the player store
+
+        Args:
+            path: SQLite database file
+        """
+        self.path = path
+        self._lock = threading.Lock()
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.create_function('normalize_name', 1, normalize_name, deterministic=True)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS players (
+                fide_id INTEGER PRIMARY KEY,
+                name TEXT,
+                search_name TEXT,
+                federation TEXT,
+                sex TEXT,
+                title TEXT,
+                birth_year INTEGER,
+                rating_std INTEGER,
+                rating_rapid INTEGER,
+                rating_blitz INTEGER,
+                flag TEXT,
+                updated_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_players_federation ON players (federation)")
+        self._conn.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS players_name_fts USING fts5(search_name)"
+        )
+        self._conn.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS players_name_trigram "
+            "USING fts5(search_name, tokenize='trigram', detail='none')"
+        )
+        self._conn.commit()
+        self._migrate()
+
+    def _migrate(self):
+        """Upgrade stores created before the name index existed"""
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version >= self.SCHEMA_VERSION:
+            return
+
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(players)")}
+        if 'search_name' not in columns:
+            self._conn.execute("ALTER TABLE players ADD COLUMN search_name TEXT")
+        self._conn.execute("UPDATE players SET search_name = normalize_name(name)")
+        self._conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+        self._conn.commit()
+        self.rebuild_name_index()
+
+    def upsert_many(self, records: Iterable[Dict], batch_size: int = 10_000,
+                    update_index: bool = True) -> int:
+        """
+        Insert or update player records in batches
+
+        Records are dicts with a 'fide_id' key and any of COLUMNS. Missing or
+        None values keep what is already stored, so the standard, rapid and
+        blitz lists can be imported one after another.
+
+        Args:
+            records: Player records to write
+            batch_size: Records written per transaction
+            update_index: Keep the name index in sync batch by batch; bulk
+                          imports pass False and call rebuild_name_index() once
+
+        Returns:
+            Number of records written
+        """
+        assignments = ", ".join(f"{col} = COALESCE(excluded.{col}, {col})" for col in self.COLUMNS)
+        sql = (
+            f"INSERT INTO players (fide_id, {', '.join(self.COLUMNS)}, updated_at, search_name) "
+            f"VALUES ({', '.join('?' * (len(self.COLUMNS) + 2))}, normalize_name(?)) "
+            f"ON CONFLICT (fide_id) DO UPDATE SET {assignments}, updated_at = excluded.updated_at, "
+            f"search_name = COALESCE(excluded.search_name, search_name)"
+        )
+
+        written = 0
+        batch = []
+        for record in records:
+            batch.append((record['fide_id'],) + tuple(record.get(col) for col in self.COLUMNS)
+                         + (time.time(), record.get('name') or None))
+            if len(batch) >= batch_size:
+                written += self._write_batch(sql, batch, update_index)
+                batch = []
+        if batch:
+            written += self._write_batch(sql, batch, update_index)
+        return written
+
+    def _write_batch(self, sql: str, batch: list, update_index: bool) -> int:
+        """Write one batch, and optionally its name index rows, in a single transaction"""
+        with self._lock:
+            with self._conn:
+                self._conn.executemany(sql, batch)
+                if update_index:
+                    ids = [(row[0],) for row in batch]
+                    for table in ('players_name_fts', 'players_name_trigram'):
+                        self._conn.executemany(f"DELETE FROM {table} WHERE rowid = ?", ids)
+                        self._conn.executemany(
+                            f"INSERT INTO {table} (rowid, search_name) "
+                            f"SELECT fide_id, search_name FROM players WHERE fide_id = ?", ids
+                        )
+        return len(batch)
+
+    def rebuild_name_index(self):
+        """Rebuild both name indexes from the players table"""
+        with self._lock:
+            with self._conn:
+                for table in ('players_name_fts', 'players_name_trigram'):
+                    self._conn.execute(f"DELETE FROM {table}")
+                    self._conn.execute(
+                        f"INSERT INTO {table} (rowid, search_name) "
+                        f"SELECT fide_id, search_name FROM players WHERE search_name IS NOT NULL"
+                    )
+
+    def search_by_name(self, name: str, federation: Optional[str] = None,
+                       birth_year: Optional[int] = None, limit: int = 10,
+                       fuzzy: bool = True) -> List[Dict]:
+        """
+        Find players by name without touching the network
+
+        Word order, case, punctuation and diacritics are ignored, and each
+        word may be a prefix ("carls magn" finds "Carlsen, Magnus"). When
+        fuzzy is set, trigram matching also finds misspelled names.
+
+        Args:
+            name: Full or partial player name
+            federation: Only return players of this federation
+            birth_year: Only return players born in this year
+            limit: Maximum number of results
+            fuzzy: Fall back to trigram matching when words do not match
+
+        Returns:
+            Store records with an added 'score' (0-1), best match first
+        """
+        tokens = normalize_name(name).split()
+        if not tokens:
+            return []
+
+        filters = ""
+        params = []
+        if federation:
+            filters += " AND p.federation = ?"
+            params.append(federation)
+        if birth_year:
+            filters += " AND p.birth_year = ?"
+            params.append(int(birth_year))
+
+        # Cheapest queries first: whole words, word prefixes, then (fuzzy)
+        # 3-letter word prefixes and finally any shared trigram
+        stages = [('players_name_fts', " AND ".join(f'"{token}"' for token in tokens)),
+                  ('players_name_fts', " AND ".join(f'"{token}"*' for token in tokens))]
+        if fuzzy:
+            stages.append(('players_name_fts', " AND ".join(f'"{token[:3]}"*' for token in tokens)))
+            trigrams = {token[i:i + 3] for token in tokens for i in range(len(token) - 2)}
+            if trigrams:
+                stages.append(('players_name_trigram',
+                               " OR ".join(f'"{gram}"' for gram in sorted(trigrams))))
+
+        candidates = {}
+        for table, query in stages:
+            for record in self._match(table, query, filters, params, limit * 20):
+                candidates.setdefault(record['fide_id'], record)
+            if len(candidates) >= limit:
+                break
+        candidates = list(candidates.values())
+
+        for record in candidates:
+            record['score'] = round(name_similarity(tokens, record['search_name'] or ''), 3)
+        candidates.sort(key=lambda record: (-record['score'], -(record['rating_std'] or 0)))
+        return candidates[:limit]
+
+    def _match(self, table: str, query: str, filters: str, params: list, limit: int) -> List[Dict]:
+        """Run an FTS5 match against one name index, joined back to the player rows"""
+        # Trigram hits are only useful best-first; word matches are re-scored anyway
+        order = " ORDER BY f.rank" if table == 'players_name_trigram' else ""
+        # CROSS JOIN keeps SQLite from scanning players by a filter index first
+        sql = (
+            f"SELECT p.* FROM {table} f CROSS JOIN players p ON p.fide_id = f.rowid "
+            f"WHERE {table} MATCH ?{filters}{order} LIMIT ?"
+        )
+        with self._lock:
+            rows = self._conn.execute(sql, [query] + params + [limit]).fetchall()
+        return [dict(row) for row in rows]
+
+    def get(self, fide_id) -> Optional[Dict]:
+        """Return the stored record for a FIDE ID, or None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM players WHERE fide_id = ?", (int(fide_id),)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def get_player(self, fide_id) -> Optional[Player]:
+        """Return a stored player as a Player, or None"""
+        record = self.get(fide_id)
+        return self.to_player(record) if record else None
+
+    def index_players(self, players: Iterable[Union[Player, Dict]]) -> int:
+        """Add players fetched by an extractor to the store (federations are stored as codes)"""
+        players = (as_player(player) for player in players)
+        return self.upsert_many({
+            'fide_id': player.fide_id,
+            'name': player.name,
+            'federation': federation_code(player.federation),
+            'title': player.title,
+            'birth_year': player.birth_year,
+            'rating_std': player.rating_std,
+            'rating_rapid': player.rating_rapid,
+            'rating_blitz': player.rating_blitz,
+        } for player in players if player.fide_id)
+
+    def count(self, federation: Optional[str] = None) -> int:
+        """Number of players in the store, or in one federation"""
+        with self._lock:
+            if federation:
+                return self._conn.execute(
+                    "SELECT COUNT(*) FROM players WHERE federation = ?", (federation,)
+                ).fetchone()[0]
+            return self._conn.execute("SELECT COUNT(*) FROM players").fetchone()[0]
+
+    def iter_fide_ids(self, federation: Optional[str] = None, after: int = 0,
+                      batch_size: int = 10_000) -> Iterator[int]:
+        """
+        Yield stored FIDE IDs in ascending order, optionally of one federation
+
+        IDs are read in batches starting after the last one seen, so the
+        store can be written to while a large federation is iterated.
+
+        Args:
+            federation: Only IDs of this federation (as stored, e.g. 'IND')
+            after: Start after this FIDE ID (a resume cursor)
+            batch_size: IDs read per query
+        """
+        filters = " AND federation = ?" if federation else ""
+        while True:
+            params = [after] + ([federation] if federation else []) + [batch_size]
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT fide_id FROM players WHERE fide_id > ?{filters} ORDER BY fide_id LIMIT ?",
+                    params
+                ).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield row[0]
+            after = rows[-1][0]
+
+    @staticmethod
+    def to_player(record: Dict) -> Player:
+        """Convert a store record to a Player, with the federation's country name as profiles give it"""
+        player = Player(**{field: record.get(field) for field in Player._fields if field in record})
+        return player._replace(federation=federation_name(player.federation))
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
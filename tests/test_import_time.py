@@ -0,0 +1,43 @@
+"""
+Start-up import budget of the entry points
+
+Runs benchmarks/import_time.py's measurement for every entry point in its
+BUDGETS table: each is imported in fresh interpreters with -X importtime,
+the fastest run must stay within the budget and none may import the
+dependencies that are deferred until an export, parse or snapshot needs
+them. Slower machines can scale the budgets:
+
+    FIDE_IMPORT_BUDGET_SCALE=2 python -m pytest tests/test_import_time.py
+"""
+
+import os
+import sys
+import unittest
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(TESTS_DIR), 'benchmarks'))
+
+from import_time import BUDGETS, measure  # noqa: E402
+
+BUDGET_SCALE = float(os.environ.get('FIDE_IMPORT_BUDGET_SCALE', 1.0))
+
+# Fresh interpreters per entry point; the fastest counts, as in the script
+RUNS = 3
+
+
+class ImportTimeTest(unittest.TestCase):
+
+    def test_entry_points(self):
+        for module, (budget, deferred) in BUDGETS.items():
+            with self.subTest(module=module):
+                runs = [measure(module) for _ in range(RUNS)]
+                best = min(total for total, _ in runs)
+                loaded = sorted(set(deferred) & runs[0][1])
+
+                self.assertEqual(loaded, [], f"{module} imports {', '.join(loaded)} at start-up")
+                self.assertLessEqual(best, budget * BUDGET_SCALE,
+                                     f"{module} imports in {best:.0f} ms, budget {budget * BUDGET_SCALE:.0f} ms")
+
+
+if __name__ == "__main__":
+    unittest.main()
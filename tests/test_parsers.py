@@ -0,0 +1,85 @@
+"""
+Parity of the profile parser backends on saved profile pages
+
+Every fixture in fixtures/profiles must give the same Player with the
+bs4 and the lxml backend, and the expected values below:
+
+    python -m pytest tests
+    python -m unittest discover tests
+"""
+
+import os
+import sys
+import unittest
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(TESTS_DIR))
+
+from fide_parsers import PARSERS, get_parser  # noqa: E402
+from fide_player import Player  # noqa: E402
+
+try:
+    import lxml  # noqa: F401
+    HAVE_LXML = True
+except ImportError:
+    HAVE_LXML = False
+
+PROFILES_DIR = os.path.join(TESTS_DIR, 'fixtures', 'profiles')
+
+FIDE_ID = '1503014'
+
+# Fixture -> fields of the expected Player (the rest are None)
+EXPECTED = {
+    'titled.html': dict(name='Carlsen, Magnus', federation='Norway', title='GM', birth_year=1990,
+                        rating_std=2839, rating_rapid=2821, rating_blitz=2887),
+    'untitled.html': dict(name='Okafor, Chidi', federation='Nigeria', birth_year=2004,
+                          rating_std=1525, rating_blitz=1490),
+    # Empty <title>, no B-Year or title rows, no rapid/blitz blocks, empty country
+    'missing_fields.html': dict(name='Lindqvist, Anna', rating_std=1834),
+    'entities.html': dict(name='Koné, Maïmouna & Co', federation="Côte d'Ivoire", title='WIM',
+                          birth_year=1998, rating_std=2101, rating_rapid=2056, rating_blitz=2011),
+    'empty.html': dict(),
+    # A block page has no profile fields; only the page title is picked up as the name
+    'blocked.html': dict(name='Access denied'),
+}
+
+
+def load_profile(name: str) -> str:
+    with open(os.path.join(PROFILES_DIR, name), encoding='utf-8') as f:
+        return f.read()
+
+
+class ParserFixturesTest(unittest.TestCase):
+    """Expected records from the default bs4 backend"""
+
+    def test_every_fixture_has_expectations(self):
+        fixtures = {name for name in os.listdir(PROFILES_DIR) if name.endswith('.html')}
+        self.assertEqual(fixtures, set(EXPECTED))
+
+    def test_bs4_expected(self):
+        parse = get_parser('bs4')
+        for name, fields in EXPECTED.items():
+            with self.subTest(fixture=name):
+                self.assertEqual(parse(load_profile(name), FIDE_ID),
+                                 Player(fide_id=int(FIDE_ID), **fields))
+
+
+@unittest.skipUnless(HAVE_LXML, "lxml is not installed")
+class ParserParityTest(unittest.TestCase):
+    """The lxml backend must produce exactly what bs4 produces"""
+
+    def test_backends_agree(self):
+        for name in EXPECTED:
+            html = load_profile(name)
+            with self.subTest(fixture=name):
+                results = {backend: parse(html, FIDE_ID) for backend, parse in PARSERS.items()}
+                self.assertEqual(results['lxml'], results['bs4'])
+
+    def test_whitespace_only_page(self):
+        for backend, parse in PARSERS.items():
+            with self.subTest(backend=backend):
+                self.assertEqual(parse(" \n\t", FIDE_ID), Player(fide_id=int(FIDE_ID)))
+
+
+if __name__ == "__main__":
+    unittest.main()
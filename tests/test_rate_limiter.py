@@ -0,0 +1,183 @@
+"""
+Rate control: AIMD limiter, circuit breaker, Retry-After handling
+
+    python -m pytest tests/test_rate_limiter.py
+"""
+
+import email.utils
+import os
+import sys
+import threading
+import time
+import unittest
+from datetime import timedelta
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests  # noqa: E402
+
+from fide_rate_limiter import (AdaptiveRateLimiter, CircuitBreaker, CircuitOpenError,  # noqa: E402
+                               RateController, parse_retry_after)
+
+
+class FakeResponse:
+    """The parts of a requests.Response that RateController reads"""
+
+    def __init__(self, status_code=200, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.elapsed = timedelta(0)
+
+
+class FakeSession:
+    """Returns queued responses, or raises queued exceptions, in order"""
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    def get(self, url, **kwargs):
+        self.calls += 1
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+class AdaptiveRateLimiterTest(unittest.TestCase):
+
+    def test_additive_increase_up_to_max_rate(self):
+        limiter = AdaptiveRateLimiter(2.0, max_rate=2.2, increase_step=0.1)
+        limiter.rate = 2.0
+        limiter.on_success(0.1)
+        self.assertAlmostEqual(limiter.rate, 2.1)
+        for _ in range(5):
+            limiter.on_success(0.1)
+        self.assertAlmostEqual(limiter.rate, 2.2)
+        self.assertAlmostEqual(limiter.interval, 1 / 2.2)
+
+    def test_multiplicative_decrease_down_to_min_rate(self):
+        limiter = AdaptiveRateLimiter(4.0, min_rate=0.5, decrease_factor=0.5)
+        limiter.on_throttle()
+        self.assertAlmostEqual(limiter.rate, 2.0)
+        for _ in range(10):
+            limiter.on_throttle()
+        self.assertAlmostEqual(limiter.rate, 0.5)
+
+    def test_latency_spike_decreases_mildly(self):
+        limiter = AdaptiveRateLimiter(4.0, decrease_factor=0.5, latency_factor=3.0)
+        limiter.on_success(0.1)  # sets the average latency; rate already at max
+        limiter.on_success(1.0)
+        self.assertAlmostEqual(limiter.rate, 3.0)  # 4 * (1 + 0.5) / 2
+
+    def test_retry_after_pauses_every_caller(self):
+        limiter = AdaptiveRateLimiter(None)
+        limiter.on_throttle(retry_after=5)
+        self.assertGreater(limiter._next_slot - time.monotonic(), 4)
+
+    def test_unlimited_rate_is_not_adapted(self):
+        limiter = AdaptiveRateLimiter(None)
+        limiter.on_success(0.1)
+        limiter.on_throttle()
+        self.assertEqual(limiter.rate, 0.0)
+        self.assertEqual(limiter.interval, 0.0)
+
+
+class CircuitBreakerTest(unittest.TestCase):
+
+    def open_breaker(self, cooldown=0.2):
+        breaker = CircuitBreaker(failure_threshold=3, cooldown=cooldown)
+        for _ in range(3):
+            breaker.record_failure()
+        return breaker
+
+    def test_closed_breaker_does_not_wait(self):
+        breaker = CircuitBreaker(failure_threshold=3)
+        breaker.record_failure()
+        breaker.record_failure()
+        self.assertEqual(breaker.allow(), 0)
+
+    def test_open_breaker_raises_without_waiting(self):
+        breaker = self.open_breaker(cooldown=60)
+        with self.assertRaises(CircuitOpenError):
+            breaker.allow(wait=False)
+
+    def test_open_breaker_waits_out_the_cooldown(self):
+        breaker = self.open_breaker(cooldown=0.2)
+        start = time.monotonic()
+        waited = breaker.allow()
+        self.assertGreaterEqual(time.monotonic() - start, 0.15)
+        self.assertGreater(waited, 0)
+
+    def test_half_open_lets_one_trial_through(self):
+        breaker = self.open_breaker(cooldown=0.1)
+        breaker.allow()  # the trial
+        # Others wait for the trial's outcome...
+        with self.assertRaises(CircuitOpenError):
+            breaker.allow(wait=False)
+
+        released = threading.Event()
+
+        def waiter():
+            breaker.allow()
+            released.set()
+
+        thread = threading.Thread(target=waiter)
+        thread.start()
+        self.assertFalse(released.wait(0.05))
+        # ...and go ahead once it succeeds
+        breaker.record_success()
+        self.assertTrue(released.wait(1))
+        thread.join()
+
+    def test_failed_trial_reopens_the_circuit(self):
+        breaker = self.open_breaker(cooldown=0.1)
+        breaker.allow()
+        breaker.record_failure()
+        with self.assertRaises(CircuitOpenError):
+            breaker.allow(wait=False)
+
+    def test_queued_requests_survive_an_outage(self):
+        controller = RateController(None, max_retries=0,
+                                    breaker=CircuitBreaker(failure_threshold=1, cooldown=0.1))
+        outage = requests.ConnectionError("down")
+        with self.assertRaises(requests.ConnectionError):
+            controller.request(FakeSession(outage), 'http://fide.test/')
+        # The next request waits for the cooldown instead of failing
+        response = controller.request(FakeSession(FakeResponse()), 'http://fide.test/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(controller.stats.as_dict().get('circuit_waits'), 1)
+
+
+class RetryAfterTest(unittest.TestCase):
+
+    def test_delta_seconds(self):
+        self.assertEqual(parse_retry_after('120'), 120.0)
+        self.assertEqual(parse_retry_after(' 7 '), 7.0)
+
+    def test_http_date(self):
+        value = email.utils.formatdate(time.time() + 30, usegmt=True)
+        self.assertAlmostEqual(parse_retry_after(value), 30, delta=2)
+
+    def test_past_http_date_is_zero(self):
+        self.assertEqual(parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT'), 0.0)
+
+    def test_missing_or_invalid(self):
+        self.assertIsNone(parse_retry_after(None))
+        self.assertIsNone(parse_retry_after(''))
+        self.assertIsNone(parse_retry_after('soon'))
+
+    def test_far_future_retry_after_is_capped(self):
+        far_future = email.utils.formatdate(time.time() + 10 * 365 * 86400, usegmt=True)
+        session = FakeSession(FakeResponse(429, {'Retry-After': far_future}), FakeResponse())
+        controller = RateController(None, max_retries=1, max_retry_after=5)
+        with mock.patch('fide_rate_limiter.time.sleep') as sleep:
+            response = controller.request(session, 'http://fide.test/')
+        self.assertEqual(response.status_code, 200)
+        self.assertLessEqual(sleep.call_args_list[0].args[0], 5)
+        self.assertLessEqual(controller.limiter._next_slot - time.monotonic(), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()